@@ -0,0 +1,82 @@
+"""Convert notification data to JSONB
+
+Revision ID: 067243029bc5
+Revises: 673ee1b265df
+Create Date: 2026-10-17 09:00:00.000000
+
+Description:
+    Changes notifications.data from TEXT holding serialized JSON to a native
+    JSONB column on PostgreSQL. The driver now handles (de)serialization and
+    the payload can be filtered and indexed in SQL.
+
+Safety Notes:
+    - Existing rows are cast with data::jsonb; rows holding invalid JSON will
+      make the migration fail and must be cleaned up first
+    - Other dialects keep their existing column type
+
+Rollback Plan:
+    - Run downgrade to cast the column back to TEXT
+    - No data loss, payloads are re-rendered as JSON text
+"""
+
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "067243029bc5"
+down_revision: Union[str, None] = "673ee1b265df"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    """
+    Apply the migration - store notification data as JSONB.
+    """
+    logger.info(f"Applying migration {revision}")
+
+    connection = op.get_bind()
+    if connection.dialect.name != "postgresql":
+        logger.info("Not running on PostgreSQL, skipping JSONB conversion")
+        return
+
+    op.alter_column(
+        "notifications",
+        "data",
+        existing_type=sa.Text(),
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_nullable=True,
+        postgresql_using="data::jsonb",
+    )
+
+    logger.info(f"Successfully applied migration {revision}")
+
+
+def downgrade() -> None:
+    """
+    Rollback the migration - store notification data as TEXT.
+    """
+    logger.info(f"Rolling back migration {revision}")
+
+    connection = op.get_bind()
+    if connection.dialect.name != "postgresql":
+        logger.info("Not running on PostgreSQL, nothing to roll back")
+        return
+
+    op.alter_column(
+        "notifications",
+        "data",
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        type_=sa.Text(),
+        existing_nullable=True,
+        postgresql_using="data::text",
+    )
+
+    logger.info(f"Successfully rolled back migration {revision}")
@@ -0,0 +1,76 @@
+"""Store refresh token hash as bytes
+
+Revision ID: e9c703a94463
+Revises: 067243029bc5
+Create Date: 2026-10-17 10:00:00.000000
+
+Description:
+    Refresh tokens are now hashed with keyed BLAKE2b and stored as the raw
+    32-byte digest instead of a 64-character SHA-256 hex string. This changes
+    refresh_tokens.token_hash from VARCHAR(255) to a binary column.
+
+Safety Notes:
+    - Existing hashes cannot be converted to the new scheme, so all stored
+      refresh tokens are deleted; every user has to log in again
+    - Access tokens are unaffected and stay valid until they expire
+
+Rollback Plan:
+    - Run downgrade to restore the VARCHAR column
+    - Refresh tokens issued after the upgrade are deleted again
+"""
+
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e9c703a94463"
+down_revision: Union[str, None] = "067243029bc5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    """
+    Apply the migration - switch token_hash to a binary column.
+    """
+    logger.info(f"Applying migration {revision}")
+
+    # Old SHA-256 hex hashes can never match a BLAKE2b digest
+    op.execute("DELETE FROM refresh_tokens")
+
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.alter_column(
+            "token_hash",
+            existing_type=sa.String(length=255),
+            type_=sa.LargeBinary(length=32),
+            existing_nullable=False,
+            postgresql_using="decode(token_hash, 'hex')",
+        )
+
+    logger.info(f"Successfully applied migration {revision}")
+
+
+def downgrade() -> None:
+    """
+    Rollback the migration - switch token_hash back to VARCHAR.
+    """
+    logger.info(f"Rolling back migration {revision}")
+
+    op.execute("DELETE FROM refresh_tokens")
+
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.alter_column(
+            "token_hash",
+            existing_type=sa.LargeBinary(length=32),
+            type_=sa.String(length=255),
+            existing_nullable=False,
+            postgresql_using="encode(token_hash, 'hex')",
+        )
+
+    logger.info(f"Successfully rolled back migration {revision}")
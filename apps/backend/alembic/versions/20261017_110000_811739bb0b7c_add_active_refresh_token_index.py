@@ -0,0 +1,63 @@
+"""Add partial index for active refresh tokens
+
+Revision ID: 811739bb0b7c
+Revises: e9c703a94463
+Create Date: 2026-10-17 11:00:00.000000
+
+Description:
+    Adds ix_refresh_tokens_active_user on refresh_tokens(user_id, last_used_at)
+    restricted to non-revoked rows. get_user_sessions filters on exactly this
+    predicate and orders by last_used_at, so the listing only touches a
+    user's live sessions instead of every token ever rotated.
+
+Safety Notes:
+    - Index creation only, no data changes
+    - expires_at > now() is not immutable and cannot be part of the predicate;
+      expired rows are still pruned by the query itself
+
+Rollback Plan:
+    - Run downgrade to drop the index
+"""
+
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "811739bb0b7c"
+down_revision: Union[str, None] = "e9c703a94463"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    """
+    Apply the migration - create the partial index.
+    """
+    logger.info(f"Applying migration {revision}")
+
+    op.create_index(
+        "ix_refresh_tokens_active_user",
+        "refresh_tokens",
+        ["user_id", "last_used_at"],
+        postgresql_where=sa.text("is_revoked = false"),
+        sqlite_where=sa.text("is_revoked = 0"),
+    )
+
+    logger.info(f"Successfully applied migration {revision}")
+
+
+def downgrade() -> None:
+    """
+    Rollback the migration - drop the partial index.
+    """
+    logger.info(f"Rolling back migration {revision}")
+
+    op.drop_index("ix_refresh_tokens_active_user", table_name="refresh_tokens")
+
+    logger.info(f"Successfully rolled back migration {revision}")
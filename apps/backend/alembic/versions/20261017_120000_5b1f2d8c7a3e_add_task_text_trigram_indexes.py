@@ -0,0 +1,79 @@
+"""Add trigram indexes for task text search
+
+Revision ID: 5b1f2d8c7a3e
+Revises: 811739bb0b7c
+Create Date: 2026-10-17 12:00:00.000000
+
+Description:
+    Enables the pg_trgm extension and adds GIN trigram indexes on
+    tasks.title and tasks.description. Task search filters with
+    ILIKE '%term%', which cannot use a btree index and used to scan the
+    whole tasks table; the planner can answer it from these indexes.
+
+Safety Notes:
+    - Index creation only, no data changes
+    - PostgreSQL only; the migration is a no-op on other databases
+    - Creating the extension requires a role allowed to do so
+
+Rollback Plan:
+    - Run downgrade to drop the indexes; the extension is left installed
+"""
+
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1f2d8c7a3e"
+down_revision: Union[str, None] = "811739bb0b7c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    """
+    Apply the migration - create the trigram indexes.
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        logger.info(f"Skipping migration {revision} on non-PostgreSQL database")
+        return
+
+    logger.info(f"Applying migration {revision}")
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "tasks_title_trgm",
+        "tasks",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "tasks_desc_trgm",
+        "tasks",
+        ["description"],
+        postgresql_using="gin",
+        postgresql_ops={"description": "gin_trgm_ops"},
+    )
+
+    logger.info(f"Successfully applied migration {revision}")
+
+
+def downgrade() -> None:
+    """
+    Rollback the migration - drop the trigram indexes.
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    logger.info(f"Rolling back migration {revision}")
+
+    op.drop_index("tasks_desc_trgm", table_name="tasks")
+    op.drop_index("tasks_title_trgm", table_name="tasks")
+
+    logger.info(f"Successfully rolled back migration {revision}")
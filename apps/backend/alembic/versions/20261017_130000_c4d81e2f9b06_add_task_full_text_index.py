@@ -0,0 +1,68 @@
+"""Add full-text index for task search
+
+Revision ID: c4d81e2f9b06
+Revises: 5b1f2d8c7a3e
+Create Date: 2026-10-17 13:00:00.000000
+
+Description:
+    Adds tasks_search_tsv, a GIN index on the english tsvector of a task's
+    title and description. Multi-word task searches match against this
+    document with plainto_tsquery instead of tokenizing every row.
+
+Safety Notes:
+    - Index creation only, no data changes
+    - PostgreSQL only; the migration is a no-op on other databases
+    - The expression must stay identical to app.db.models.task_search_vector,
+      otherwise the planner will not use the index
+
+Rollback Plan:
+    - Run downgrade to drop the index
+"""
+
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d81e2f9b06"
+down_revision: Union[str, None] = "5b1f2d8c7a3e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    """
+    Apply the migration - create the full-text index.
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        logger.info(f"Skipping migration {revision} on non-PostgreSQL database")
+        return
+
+    logger.info(f"Applying migration {revision}")
+
+    op.execute(
+        "CREATE INDEX tasks_search_tsv ON tasks USING gin "
+        "(to_tsvector('english', coalesce(title, '') || ' ' || "
+        "coalesce(description, '')))"
+    )
+
+    logger.info(f"Successfully applied migration {revision}")
+
+
+def downgrade() -> None:
+    """
+    Rollback the migration - drop the full-text index.
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    logger.info(f"Rolling back migration {revision}")
+
+    op.drop_index("tasks_search_tsv", table_name="tasks")
+
+    logger.info(f"Successfully rolled back migration {revision}")
@@ -0,0 +1,62 @@
+"""Add partial index for open tasks by due date
+
+Revision ID: 7e2a9c5d41f8
+Revises: c4d81e2f9b06
+Create Date: 2026-10-17 14:00:00.000000
+
+Description:
+    Adds tasks_user_due_active on tasks(user_id, due_date) restricted to
+    tasks that are not done. The overdue and upcoming task lists filter on
+    user_id, a due_date range and status <> 'DONE' and order by due_date,
+    so both become a single index range scan.
+
+Safety Notes:
+    - Index creation only, no data changes
+    - Task status is stored as the enum name, hence 'DONE'
+
+Rollback Plan:
+    - Run downgrade to drop the index
+"""
+
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7e2a9c5d41f8"
+down_revision: Union[str, None] = "c4d81e2f9b06"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    """
+    Apply the migration - create the partial index.
+    """
+    logger.info(f"Applying migration {revision}")
+
+    op.create_index(
+        "tasks_user_due_active",
+        "tasks",
+        ["user_id", "due_date"],
+        postgresql_where=sa.text("status <> 'DONE'"),
+        sqlite_where=sa.text("status <> 'DONE'"),
+    )
+
+    logger.info(f"Successfully applied migration {revision}")
+
+
+def downgrade() -> None:
+    """
+    Rollback the migration - drop the partial index.
+    """
+    logger.info(f"Rolling back migration {revision}")
+
+    op.drop_index("tasks_user_due_active", table_name="tasks")
+
+    logger.info(f"Successfully rolled back migration {revision}")
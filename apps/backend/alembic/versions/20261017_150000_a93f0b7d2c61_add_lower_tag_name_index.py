@@ -0,0 +1,54 @@
+"""Add case-insensitive tag name index
+
+Revision ID: a93f0b7d2c61
+Revises: 7e2a9c5d41f8
+Create Date: 2026-10-17 15:00:00.000000
+
+Description:
+    Adds tags_name_lower, an expression index on lower(tags.name).
+    Searching tasks by tag names now compares lower(name) so that tags
+    stored with mixed case match, and this index keeps that lookup indexed.
+
+Safety Notes:
+    - Index creation only, no data changes
+
+Rollback Plan:
+    - Run downgrade to drop the index
+"""
+
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "a93f0b7d2c61"
+down_revision: Union[str, None] = "7e2a9c5d41f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    """
+    Apply the migration - create the expression index.
+    """
+    logger.info(f"Applying migration {revision}")
+
+    op.create_index("tags_name_lower", "tags", [sa.text("lower(name)")])
+
+    logger.info(f"Successfully applied migration {revision}")
+
+
+def downgrade() -> None:
+    """
+    Rollback the migration - drop the expression index.
+    """
+    logger.info(f"Rolling back migration {revision}")
+
+    op.drop_index("tags_name_lower", table_name="tags")
+
+    logger.info(f"Successfully rolled back migration {revision}")
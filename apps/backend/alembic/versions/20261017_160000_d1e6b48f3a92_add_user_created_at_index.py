@@ -0,0 +1,53 @@
+"""Add index on users.created_at
+
+Revision ID: d1e6b48f3a92
+Revises: a93f0b7d2c61
+Create Date: 2026-10-17 16:00:00.000000
+
+Description:
+    Adds ix_users_created_at so that recent-user lookups, which filter on
+    created_at >= cutoff, scan only the newest rows of the users table.
+
+Safety Notes:
+    - Index creation only, no data changes
+
+Rollback Plan:
+    - Run downgrade to drop the index
+"""
+
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d1e6b48f3a92"
+down_revision: Union[str, None] = "a93f0b7d2c61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    """
+    Apply the migration - create the index.
+    """
+    logger.info(f"Applying migration {revision}")
+
+    op.create_index("ix_users_created_at", "users", ["created_at"])
+
+    logger.info(f"Successfully applied migration {revision}")
+
+
+def downgrade() -> None:
+    """
+    Rollback the migration - drop the index.
+    """
+    logger.info(f"Rolling back migration {revision}")
+
+    op.drop_index("ix_users_created_at", table_name="users")
+
+    logger.info(f"Successfully rolled back migration {revision}")
@@ -0,0 +1,59 @@
+"""Add reverse indexes on task category and tag links
+
+Revision ID: f58c2a71d0b4
+Revises: d1e6b48f3a92
+Create Date: 2026-10-17 17:00:00.000000
+
+Description:
+    task_categories and task_tags are keyed by (task_id, other_id), which
+    only helps lookups starting from a task. Adds task_categories_cat_task
+    (category_id, task_id) and task_tags_tag_task (tag_id, task_id) so
+    searching tasks by category or tag can start from the category/tag.
+
+Safety Notes:
+    - Index creation only, no data changes
+
+Rollback Plan:
+    - Run downgrade to drop the indexes
+"""
+
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "f58c2a71d0b4"
+down_revision: Union[str, None] = "d1e6b48f3a92"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    """
+    Apply the migration - create the indexes.
+    """
+    logger.info(f"Applying migration {revision}")
+
+    op.create_index(
+        "task_categories_cat_task", "task_categories", ["category_id", "task_id"]
+    )
+    op.create_index("task_tags_tag_task", "task_tags", ["tag_id", "task_id"])
+
+    logger.info(f"Successfully applied migration {revision}")
+
+
+def downgrade() -> None:
+    """
+    Rollback the migration - drop the indexes.
+    """
+    logger.info(f"Rolling back migration {revision}")
+
+    op.drop_index("task_tags_tag_task", table_name="task_tags")
+    op.drop_index("task_categories_cat_task", table_name="task_categories")
+
+    logger.info(f"Successfully rolled back migration {revision}")
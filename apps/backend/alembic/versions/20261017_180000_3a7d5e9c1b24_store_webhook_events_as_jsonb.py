@@ -0,0 +1,94 @@
+"""Store webhook subscription events as JSONB
+
+Revision ID: 3a7d5e9c1b24
+Revises: f58c2a71d0b4
+Create Date: 2026-10-17 18:00:00.000000
+
+Description:
+    Changes webhook_subscriptions.events from TEXT holding a serialized JSON
+    array to a native JSONB column on PostgreSQL, and adds
+    webhook_subscriptions_events_gin, a GIN index on it. Triggering a webhook
+    now matches the event in SQL (events ?| ARRAY[event, '*']) instead of
+    loading every subscription and decoding its events in Python.
+
+Safety Notes:
+    - Existing rows are cast with events::jsonb; rows holding invalid JSON
+      will make the migration fail and must be cleaned up first
+    - Other dialects keep their existing column type, which already stores
+      the same JSON text
+
+Rollback Plan:
+    - Run downgrade to drop the index and cast the column back to TEXT
+    - No data loss, event lists are re-rendered as JSON text
+"""
+
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "3a7d5e9c1b24"
+down_revision: Union[str, None] = "f58c2a71d0b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    """
+    Apply the migration - store subscription events as indexed JSONB.
+    """
+    logger.info(f"Applying migration {revision}")
+
+    connection = op.get_bind()
+    if connection.dialect.name != "postgresql":
+        logger.info("Not running on PostgreSQL, skipping JSONB conversion")
+        return
+
+    op.alter_column(
+        "webhook_subscriptions",
+        "events",
+        existing_type=sa.Text(),
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        existing_nullable=False,
+        postgresql_using="events::jsonb",
+    )
+    op.create_index(
+        "webhook_subscriptions_events_gin",
+        "webhook_subscriptions",
+        ["events"],
+        postgresql_using="gin",
+    )
+
+    logger.info(f"Successfully applied migration {revision}")
+
+
+def downgrade() -> None:
+    """
+    Rollback the migration - store subscription events as TEXT.
+    """
+    logger.info(f"Rolling back migration {revision}")
+
+    connection = op.get_bind()
+    if connection.dialect.name != "postgresql":
+        logger.info("Not running on PostgreSQL, nothing to roll back")
+        return
+
+    op.drop_index(
+        "webhook_subscriptions_events_gin", table_name="webhook_subscriptions"
+    )
+    op.alter_column(
+        "webhook_subscriptions",
+        "events",
+        existing_type=postgresql.JSONB(astext_type=sa.Text()),
+        type_=sa.Text(),
+        existing_nullable=False,
+        postgresql_using="events::text",
+    )
+
+    logger.info(f"Successfully rolled back migration {revision}")
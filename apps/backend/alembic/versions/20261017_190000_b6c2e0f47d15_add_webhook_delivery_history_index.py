@@ -0,0 +1,60 @@
+"""Add webhook delivery history index
+
+Revision ID: b6c2e0f47d15
+Revises: 3a7d5e9c1b24
+Create Date: 2026-10-17 19:00:00.000000
+
+Description:
+    Adds webhook_deliveries_sub_delivered on (subscription_id,
+    delivered_at DESC). Listing a subscription's delivery history becomes an
+    index range scan already in the requested order, with no sort step.
+
+Safety Notes:
+    - Index creation only, no data changes
+
+Rollback Plan:
+    - Run downgrade to drop the index
+"""
+
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b6c2e0f47d15"
+down_revision: Union[str, None] = "3a7d5e9c1b24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    """
+    Apply the migration - create the delivery history index.
+    """
+    logger.info(f"Applying migration {revision}")
+
+    op.create_index(
+        "webhook_deliveries_sub_delivered",
+        "webhook_deliveries",
+        ["subscription_id", sa.text("delivered_at DESC")],
+    )
+
+    logger.info(f"Successfully applied migration {revision}")
+
+
+def downgrade() -> None:
+    """
+    Rollback the migration - drop the delivery history index.
+    """
+    logger.info(f"Rolling back migration {revision}")
+
+    op.drop_index(
+        "webhook_deliveries_sub_delivered", table_name="webhook_deliveries"
+    )
+
+    logger.info(f"Successfully rolled back migration {revision}")
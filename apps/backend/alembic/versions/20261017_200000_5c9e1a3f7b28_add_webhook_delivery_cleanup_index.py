@@ -0,0 +1,60 @@
+"""Add webhook delivery cleanup index
+
+Revision ID: 5c9e1a3f7b28
+Revises: b6c2e0f47d15
+Create Date: 2026-10-17 20:00:00.000000
+
+Description:
+    Adds webhook_deliveries_delivered_at on delivered_at, partial on
+    delivered_at IS NOT NULL. Retention cleanup finds each batch of old
+    deliveries with an index range scan instead of scanning the table.
+
+Safety Notes:
+    - Index creation only, no data changes
+
+Rollback Plan:
+    - Run downgrade to drop the index
+"""
+
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5c9e1a3f7b28"
+down_revision: Union[str, None] = "b6c2e0f47d15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    """
+    Apply the migration - create the delivery cleanup index.
+    """
+    logger.info(f"Applying migration {revision}")
+
+    op.create_index(
+        "webhook_deliveries_delivered_at",
+        "webhook_deliveries",
+        ["delivered_at"],
+        postgresql_where=sa.text("delivered_at IS NOT NULL"),
+        sqlite_where=sa.text("delivered_at IS NOT NULL"),
+    )
+
+    logger.info(f"Successfully applied migration {revision}")
+
+
+def downgrade() -> None:
+    """
+    Rollback the migration - drop the delivery cleanup index.
+    """
+    logger.info(f"Rolling back migration {revision}")
+
+    op.drop_index("webhook_deliveries_delivered_at", table_name="webhook_deliveries")
+
+    logger.info(f"Successfully rolled back migration {revision}")
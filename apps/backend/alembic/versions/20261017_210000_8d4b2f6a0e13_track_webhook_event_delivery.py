@@ -0,0 +1,78 @@
+"""Track webhook event delivery per subscription
+
+Revision ID: 8d4b2f6a0e13
+Revises: 5c9e1a3f7b28
+Create Date: 2026-10-17 21:00:00.000000
+
+Description:
+    Adds webhook_subscriptions.activated_at, backfilled from created_at.
+    Events published before a subscription was activated are not
+    delivered to it. Adds webhook_deliveries.event_id with a unique
+    constraint on (subscription_id, event_id), so the database rejects a
+    second delivery of the same event to a subscription.
+
+Safety Notes:
+    - Existing deliveries keep a NULL event_id, which the constraint ignores
+    - activated_at is backfilled before it is made NOT NULL
+
+Rollback Plan:
+    - Run downgrade to drop the constraint and both columns
+"""
+
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8d4b2f6a0e13"
+down_revision: Union[str, None] = "5c9e1a3f7b28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    """
+    Apply the migration - add activation and event tracking columns.
+    """
+    logger.info(f"Applying migration {revision}")
+
+    op.add_column(
+        "webhook_subscriptions",
+        sa.Column("activated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute("UPDATE webhook_subscriptions SET activated_at = created_at")
+    with op.batch_alter_table("webhook_subscriptions") as batch_op:
+        batch_op.alter_column(
+            "activated_at",
+            existing_type=sa.DateTime(timezone=True),
+            nullable=False,
+        )
+
+    with op.batch_alter_table("webhook_deliveries") as batch_op:
+        batch_op.add_column(sa.Column("event_id", sa.String(length=36), nullable=True))
+        batch_op.create_unique_constraint(
+            "webhook_deliveries_sub_event", ["subscription_id", "event_id"]
+        )
+
+    logger.info(f"Successfully applied migration {revision}")
+
+
+def downgrade() -> None:
+    """
+    Rollback the migration - drop activation and event tracking columns.
+    """
+    logger.info(f"Rolling back migration {revision}")
+
+    with op.batch_alter_table("webhook_deliveries") as batch_op:
+        batch_op.drop_constraint("webhook_deliveries_sub_event", type_="unique")
+        batch_op.drop_column("event_id")
+
+    with op.batch_alter_table("webhook_subscriptions") as batch_op:
+        batch_op.drop_column("activated_at")
+
+    logger.info(f"Successfully rolled back migration {revision}")
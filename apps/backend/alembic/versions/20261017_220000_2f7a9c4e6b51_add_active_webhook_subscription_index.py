@@ -0,0 +1,64 @@
+"""Add active webhook subscription index
+
+Revision ID: 2f7a9c4e6b51
+Revises: 8d4b2f6a0e13
+Create Date: 2026-10-17 22:00:00.000000
+
+Description:
+    Adds webhook_subscriptions_user_project_active on (user_id, project_id),
+    partial on is_active. Resolving the subscriptions of an event reads
+    only active rows of the user, so the index scales with the active set
+    rather than with every subscription ever created.
+
+Safety Notes:
+    - Index creation only, no data changes
+
+Rollback Plan:
+    - Run downgrade to drop the index
+"""
+
+from typing import Sequence, Union
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "2f7a9c4e6b51"
+down_revision: Union[str, None] = "8d4b2f6a0e13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def upgrade() -> None:
+    """
+    Apply the migration - create the active subscription index.
+    """
+    logger.info(f"Applying migration {revision}")
+
+    op.create_index(
+        "webhook_subscriptions_user_project_active",
+        "webhook_subscriptions",
+        ["user_id", "project_id"],
+        postgresql_where=sa.text("is_active = true"),
+        sqlite_where=sa.text("is_active = 1"),
+    )
+
+    logger.info(f"Successfully applied migration {revision}")
+
+
+def downgrade() -> None:
+    """
+    Rollback the migration - drop the active subscription index.
+    """
+    logger.info(f"Rolling back migration {revision}")
+
+    op.drop_index(
+        "webhook_subscriptions_user_project_active",
+        table_name="webhook_subscriptions",
+    )
+
+    logger.info(f"Successfully rolled back migration {revision}")
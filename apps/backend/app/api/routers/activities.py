@@ -12,7 +12,7 @@ from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.core.middleware.jwt_auth_backend import get_current_active_user
 from app.db.database import get_db
-from app.db.models import ActivityType
+from app.db.models import ActivityType, ProjectRole
 from app.db.models import Task as TaskModel
 from app.db.models import TaskActivity
 from app.db.models import User as UserModel
@@ -203,7 +203,9 @@ def create_activity(
     This is mainly for admin/system use or manual activity logging.
     """
     # Check if task exists and user has access
-    task = TaskService.get_task_by_id(db, activity_data.task_id, current_user.id)
+    task = TaskService.get_task_by_id(
+        db, activity_data.task_id, current_user.id, required_role=ProjectRole.MEMBER
+    )
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -246,7 +248,10 @@ def create_bulk_activities(
         try:
             # Check if task exists and user has access
             task = TaskService.get_task_by_id(
-                db, activity_data.task_id, current_user.id
+                db,
+                activity_data.task_id,
+                current_user.id,
+                required_role=ProjectRole.MEMBER,
             )
             if not task:
                 logger.warning(
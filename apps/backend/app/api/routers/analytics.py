@@ -10,7 +10,7 @@ from sqlalchemy.orm import Session
 
 from app.core.middleware.jwt_auth_backend import get_current_user
 from app.db.database import get_db
-from app.db.models import User
+from app.db.models import ProjectRole, User
 from app.models.analytics import (CategoryDistribution, ExportRequest,
                                   ProductivityTrendsResponse, TagDistribution,
                                   TaskStatistics, TeamPerformanceReport,
@@ -32,7 +32,9 @@ async def log_time_to_task(
 ):
     """Log time to a specific task."""
     # Verify task exists and user has access
-    task = TaskService.get_task_by_id(db, task_id, current_user.id)
+    task = TaskService.get_task_by_id(
+        db, task_id, current_user.id, required_role=ProjectRole.MEMBER
+    )
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
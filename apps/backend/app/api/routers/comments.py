@@ -11,7 +11,7 @@ from app.db.models import User as UserModel
 from app.models.comment import CommentCreate, CommentResponse, CommentUpdate
 from app.services.comment_service import CommentService
 from app.services.notification_service import NotificationService
-from app.tasks.activities import log_comment_added_async
+from app.tasks.activities import queue_comment_added_log
 
 router = APIRouter()
 
@@ -111,7 +111,7 @@ async def create_comment(
     db.refresh(comment)
 
     # Log comment creation activity
-    log_comment_added_async.delay(
+    queue_comment_added_log(
         task_id=task_id,
         user_id=current_user.id,
         comment_id=comment.id,
@@ -19,7 +19,7 @@ from app.models.file_attachment import (FileAttachmentList,
                                         FileAttachmentResponse,
                                         FileUploadLimits)
 from app.services.file_service import FileService
-from app.tasks.activities import log_attachment_added_async
+from app.tasks.activities import queue_attachment_added_log
 
 router = APIRouter()
 
@@ -77,7 +77,7 @@ async def upload_file_attachment(
         db.refresh(attachment)
 
         # Log file attachment activity
-        log_attachment_added_async.delay(
+        queue_attachment_added_log(
             task_id=task_id,
             user_id=current_user.id,
             attachment_id=attachment.id,
@@ -2,7 +2,6 @@
 Notification and reminder API endpoints.
 """
 
-import json
 from datetime import datetime, timezone
 from typing import List, Optional
 
@@ -48,14 +47,6 @@ async def get_notifications(
         offset=skip,
     )
 
-    # Parse JSON data if present
-    for notification in notifications:
-        if notification.data:
-            try:
-                notification.data = json.loads(notification.data)
-            except:
-                notification.data = None
-
     return notifications
 
 
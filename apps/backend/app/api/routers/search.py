@@ -55,17 +55,13 @@ async def search_tasks(
     search_query.set_sort(search_request.sort_by, search_request.sort_order)
     search_query.include_shared = search_request.include_shared
     search_query.include_assigned = search_request.include_assigned
+    search_query.set_pagination(search_request.skip, search_request.limit)
 
     # Perform search
     tasks, total_count = SearchService.search_tasks(db, current_user.id, search_query)
 
-    # Apply pagination
-    start = search_request.skip
-    end = start + search_request.limit
-    paginated_tasks = tasks[start:end]
-
     # Convert to response model
-    task_responses = [TaskResponse.model_validate(task) for task in paginated_tasks]
+    task_responses = [TaskResponse.model_validate(task) for task in tasks]
 
     return {
         "tasks": task_responses,
@@ -33,16 +33,11 @@ from app.services.tag_service import TagService
 from app.services.task_dependency_service import TaskDependencyService
 from app.services.task_service import TaskService
 from app.services.webhook_service import WebhookEvent, WebhookService
-from app.tasks.activities import (log_assignment_change_async,
-                                  log_description_change_async,
-                                  log_due_date_change_async,
-                                  log_priority_change_async,
-                                  log_subtask_added_async,
-                                  log_task_completed_async,
-                                  log_time_logged_async,
-                                  log_title_change_async, queue_activity_log,
-                                  queue_status_change_log,
-                                  queue_task_creation_log)
+from app.tasks.activities import (queue_activity_log,
+                                  queue_subtask_added_log,
+                                  queue_task_creation_log,
+                                  queue_task_update_log,
+                                  queue_time_logged_log)
 
 router = APIRouter()
 
@@ -330,7 +325,7 @@ async def create_task(
 
     # If this is a subtask, also log subtask addition to parent task
     if db_task.parent_task_id:
-        log_subtask_added_async.delay(
+        queue_subtask_added_log(
             task_id=db_task.parent_task_id,  # Log on parent task
             user_id=current_user.id,
             subtask_id=db_task.id,
@@ -595,90 +590,98 @@ async def update_task(
         if parent_task:
             TaskDependencyService.update_parent_task_status(db, parent_task)
 
-    # Log activity for each changed field
+    # Log activity for each changed field, queued together as one entry
+    changes = []
     for field, new_value in update_data.items():
         old_value = old_values.get(field)
 
         if field == "status" and old_value != new_value.value:
-            # Log status change
-            queue_status_change_log(
-                task_id=task.id,
-                user_id=current_user.id,
-                old_status=old_value,
-                new_status=new_value.value,
+            changes.append(
+                {
+                    "kind": "status_change",
+                    "payload": {"old_status": old_value, "new_status": new_value.value},
+                }
             )
 
             # Log completion activity if task was completed
             if new_value == TaskStatus.DONE:
-                log_task_completed_async.delay(task_id=task.id, user_id=current_user.id)
+                changes.append({"kind": "task_completed", "payload": {}})
 
         elif field == "priority" and old_value != new_value.value:
-            # Log priority change
-            log_priority_change_async.delay(
-                task_id=task.id,
-                user_id=current_user.id,
-                old_priority=old_value,
-                new_priority=new_value.value,
+            changes.append(
+                {
+                    "kind": "priority_change",
+                    "payload": {
+                        "old_priority": old_value,
+                        "new_priority": new_value.value,
+                    },
+                }
             )
 
         elif field == "title" and old_value != new_value:
-            # Log title change
-            log_title_change_async.delay(
-                task_id=task.id,
-                user_id=current_user.id,
-                old_title=old_value,
-                new_title=new_value,
+            changes.append(
+                {
+                    "kind": "title_change",
+                    "payload": {"old_title": old_value, "new_title": new_value},
+                }
             )
 
         elif field == "description" and old_value != new_value:
-            # Log description change
-            log_description_change_async.delay(
-                task_id=task.id,
-                user_id=current_user.id,
-                old_description=old_value,
-                new_description=new_value,
+            changes.append(
+                {
+                    "kind": "description_change",
+                    "payload": {
+                        "old_description": old_value,
+                        "new_description": new_value,
+                    },
+                }
             )
 
         elif field == "due_date":
             # Convert to ISO string for comparison
             new_due_date_str = new_value.isoformat() if new_value else None
             if old_value != new_due_date_str:
-                log_due_date_change_async.delay(
-                    task_id=task.id,
-                    user_id=current_user.id,
-                    old_due_date=old_value,
-                    new_due_date=new_due_date_str,
+                changes.append(
+                    {
+                        "kind": "due_date_change",
+                        "payload": {
+                            "old_due_date": old_value,
+                            "new_due_date": new_due_date_str,
+                        },
+                    }
                 )
 
         elif field == "assigned_to_id" and old_value != new_value:
-            # Log assignment change
-            log_assignment_change_async.delay(
-                task_id=task.id,
-                user_id=current_user.id,
-                old_assignee_id=old_value,
-                new_assignee_id=new_value,
+            changes.append(
+                {
+                    "kind": "assignment_change",
+                    "payload": {
+                        "old_assignee_id": old_value,
+                        "new_assignee_id": new_value,
+                    },
+                }
             )
 
-    # Trigger webhook for task update
+    queue_task_update_log(task_id=task.id, user_id=current_user.id, changes=changes)
+
+    # Trigger webhooks for task update, and completion if the task was completed
     task_data_for_webhook = format_task_response(task)
-    WebhookService.trigger_webhook(
+    webhook_events = [WebhookEvent.TASK_UPDATED]
+    if "status" in update_data and update_data["status"] == TaskStatus.DONE:
+        webhook_events.append(WebhookEvent.TASK_COMPLETED)
+    WebhookService.trigger_many(
         db,
-        WebhookEvent.TASK_UPDATED,
-        task_data_for_webhook,
-        user_id=current_user.id,
-        project_id=task.project_id,
+        [
+            {
+                "event_type": event_type,
+                "payload": task_data_for_webhook,
+                "user_id": current_user.id,
+                "project_id": task.project_id,
+            }
+            for event_type in webhook_events
+        ],
     )
 
-    # Check if task was completed
-    if "status" in update_data and update_data["status"] == TaskStatus.DONE:
-        WebhookService.trigger_webhook(
-            db,
-            WebhookEvent.TASK_COMPLETED,
-            task_data_for_webhook,
-            user_id=current_user.id,
-            project_id=task.project_id,
-        )
-
     # Send notification if task was assigned
     if (
         "assigned_to_id" in update_data
@@ -889,8 +892,11 @@ async def add_task_time(
     db.commit()
     db.refresh(task)
 
+    # Actual hours feed the cached task statistics
+    invalidate_user_cache(current_user.id)
+
     # Log time tracking activity
-    log_time_logged_async.delay(
+    queue_time_logged_log(
         task_id=task.id,
         user_id=current_user.id,
         hours=time_update.hours_to_add,
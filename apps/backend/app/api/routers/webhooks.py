@@ -2,13 +2,12 @@
 Webhook management API endpoints.
 """
 
-import hashlib
 import hmac
-import json
 from datetime import datetime, timezone
 from typing import List
 
 import httpx
+import orjson
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.orm import Session
 
@@ -43,8 +42,6 @@ async def create_webhook_subscription(
             subscription.project_id,
         )
 
-        # Convert events from JSON string to list for response
-        webhook.events = json.loads(webhook.events)
         return webhook
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -61,10 +58,6 @@ async def get_webhook_subscriptions(
         db, current_user.id, project_id
     )
 
-    # Convert events from JSON string to list for response
-    for sub in subscriptions:
-        sub.events = json.loads(sub.events)
-
     return subscriptions
 
 
@@ -83,7 +76,6 @@ async def get_webhook_subscription(
     if not subscription:
         raise HTTPException(status_code=404, detail="Webhook subscription not found")
 
-    subscription.events = json.loads(subscription.events)
     return subscription
 
 
@@ -113,7 +105,6 @@ async def update_webhook_subscription(
                 status_code=404, detail="Webhook subscription not found"
             )
 
-        subscription.events = json.loads(subscription.events)
         return subscription
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -187,18 +178,19 @@ async def test_webhook(
             "User-Agent": "TaskManager-Webhook/1.0",
         }
 
+        payload_bytes = orjson.dumps(webhook_payload)
+
         # Add HMAC signature if secret is provided
         if test_request.secret:
-            payload_bytes = json.dumps(webhook_payload).encode("utf-8")
-            signature = hmac.new(
-                test_request.secret.encode("utf-8"), payload_bytes, hashlib.sha256
-            ).hexdigest()
+            signature = hmac.digest(
+                test_request.secret.encode("utf-8"), payload_bytes, "sha256"
+            ).hex()
             headers["X-Webhook-Signature"] = f"sha256={signature}"
 
         try:
             async with httpx.AsyncClient(timeout=30.0) as client:
                 response = await client.post(
-                    str(test_request.url), json=webhook_payload, headers=headers
+                    str(test_request.url), content=payload_bytes, headers=headers
                 )
 
             logger.info(
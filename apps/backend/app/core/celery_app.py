@@ -5,9 +5,11 @@ Celery application configuration for background task processing.
 import os
 
 from celery import Celery
+from celery.signals import worker_process_init
 from kombu import Exchange, Queue
 
 from app.core.config import settings
+from app.db.database import engine
 
 # Create Celery instance
 celery_app = Celery(
@@ -30,9 +32,16 @@ celery_app.conf.update(
     task_routes={
         "app.tasks.notifications.*": {"queue": "notifications"},
         "app.tasks.recurring.*": {"queue": "recurring"},
+        # Outbound HTTP deliveries get their own I/O-bound worker pool
+        "app.tasks.webhooks.deliver_webhook": {"queue": "webhooks_io"},
+        "app.tasks.webhooks.deliver_webhook_event": {"queue": "webhooks_io"},
         "app.tasks.webhooks.*": {"queue": "webhooks"},
         "app.tasks.analytics.*": {"queue": "analytics"},
         "app.tasks.reminders.*": {"queue": "reminders"},
+        # Activity inserts are short DB round trips, run on a threads pool
+        "app.tasks.activities.log_activity_async": {"queue": "activities"},
+        "app.tasks.activities.log_activity_dispatch": {"queue": "activities"},
+        "app.tasks.activities.log_bulk_activities_async": {"queue": "activities"},
     },
     # Task serialization
     task_serializer="json",
@@ -71,8 +80,10 @@ celery_app.conf.update(
         Queue("notifications", Exchange("notifications"), routing_key="notifications"),
         Queue("recurring", Exchange("recurring"), routing_key="recurring"),
         Queue("webhooks", Exchange("webhooks"), routing_key="webhooks"),
+        Queue("webhooks_io", Exchange("webhooks_io"), routing_key="webhooks_io"),
         Queue("analytics", Exchange("analytics"), routing_key="analytics"),
         Queue("reminders", Exchange("reminders"), routing_key="reminders"),
+        Queue("activities", Exchange("activities"), routing_key="activities"),
     ],
     # Monitoring
     worker_send_task_events=True,
@@ -114,6 +125,18 @@ if not settings.is_testing:
     )
 
 
+@worker_process_init.connect
+def reset_db_pool(**kwargs):
+    """
+    Give each forked worker process its own database connections.
+
+    The pool is inherited from the parent process; dropping it without
+    closing leaves the parent's sockets alone, and the child then keeps
+    its own pooled connections for every task it runs.
+    """
+    engine.dispose(close=False)
+
+
 @celery_app.task(bind=True)
 def debug_task(self):
     """Debug task to test Celery setup."""
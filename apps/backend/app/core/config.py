@@ -98,6 +98,7 @@ class Settings:
     CACHE_PREFIX_SEARCH: str = "search:"
     CACHE_PREFIX_ANALYTICS: str = "analytics:"
     CACHE_PREFIX_SESSION: str = "session:"
+    CACHE_PREFIX_WEBHOOKS: str = "webhooks:"
 
     # Celery Configuration
     CELERY_BROKER_URL: str = os.getenv(
@@ -137,6 +138,9 @@ class Settings:
     ANALYTICS_CACHE_INTERVAL: int = int(
         os.getenv("ANALYTICS_CACHE_INTERVAL", "1800")
     )  # 30 minutes
+    ACTIVITY_DEDUP_WINDOW_MS: int = int(
+        os.getenv("ACTIVITY_DEDUP_WINDOW_MS", "500")
+    )  # 0 disables dropping repeated activities
 
     @property
     def database_settings(self) -> Dict[str, Any]:
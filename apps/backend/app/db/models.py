@@ -1,11 +1,13 @@
 import enum
 import uuid
 
-from sqlalchemy import Boolean, Column, DateTime
+from sqlalchemy import DDL, JSON, Boolean, Column, DateTime
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import (Float, ForeignKey, Index, Integer, String, Table, Text,
-                        UniqueConstraint)
-from sqlalchemy.orm import relationship
+from sqlalchemy import (Float, ForeignKey, Index, Integer, LargeBinary, String,
+                        Table, Text, UniqueConstraint, event, literal_column,
+                        select, text)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import attribute_keyed_dict, column_property, relationship
 from sqlalchemy.sql import func
 
 from app.db.database import Base
@@ -52,6 +54,8 @@ task_categories = Table(
         ForeignKey("categories.id", ondelete="CASCADE"),
         primary_key=True,
     ),
+    # The primary key covers lookups by task; this one covers lookups by category
+    Index("task_categories_cat_task", "category_id", "task_id"),
 )
 
 task_tags = Table(
@@ -63,6 +67,8 @@ task_tags = Table(
     Column(
         "tag_id", String, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True
     ),
+    # The primary key covers lookups by task; this one covers lookups by tag
+    Index("task_tags_tag_task", "tag_id", "task_id"),
 )
 
 
@@ -80,7 +86,7 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
     )
 
     # Relationships
@@ -141,6 +147,19 @@ class User(Base):
     )
 
 
+def task_search_vector(title, description):
+    """
+    Build the full-text document indexed by tasks_search_tsv.
+    Queries must use this exact expression for PostgreSQL to use the index.
+    """
+    return func.to_tsvector(
+        literal_column("'english'"),
+        func.coalesce(title, literal_column("''"))
+        .concat(literal_column("' '"))
+        .concat(func.coalesce(description, literal_column("''"))),
+    )
+
+
 class Task(Base):
     """
     SQLAlchemy model for Task table.
@@ -275,6 +294,44 @@ class Task(Base):
         "TaskActivity", back_populates="task", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # Trigram indexes serving the ILIKE '%term%' text search (PostgreSQL only)
+        Index(
+            "tasks_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "tasks_desc_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Open tasks by due date for the overdue and upcoming task lists
+        Index(
+            "tasks_user_due_active",
+            "user_id",
+            "due_date",
+            postgresql_where=text("status <> 'DONE'"),
+            sqlite_where=text("status <> 'DONE'"),
+        ),
+        # Full-text index serving multi-word text search (PostgreSQL only)
+        Index(
+            "tasks_search_tsv",
+            task_search_vector(title, description),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+# gin_trgm_ops needs pg_trgm when the schema is created without migrations
+event.listen(
+    Task.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
 
 class Category(Base):
     """
@@ -321,6 +378,11 @@ class Tag(Base):
     user = relationship("User", back_populates="tags")
     tasks = relationship("Task", secondary=task_tags, back_populates="tags")
 
+    __table_args__ = (
+        # Case-insensitive tag lookups in search_by_tags
+        Index("tags_name_lower", func.lower(name)),
+    )
+
 
 class TaskDependency(Base):
     """
@@ -380,21 +442,36 @@ class Project(Base):
     owner = relationship(
         "User", back_populates="owned_projects", foreign_keys=[owner_id]
     )
+    # Keyed by user_id so role lookups are a dict access, not a scan
     members = relationship(
-        "ProjectMember", back_populates="project", cascade="all, delete-orphan"
+        "ProjectMember",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        collection_class=attribute_keyed_dict("user_id"),
     )
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
     webhook_subscriptions = relationship(
         "WebhookSubscription", back_populates="project", cascade="all, delete-orphan"
     )
 
+    # Aggregated in SQL so callers can count tasks without loading them;
+    # deferred so it is only computed where undefer() asks for it
+    task_count = column_property(
+        select(func.count(Task.id))
+        .where(Task.project_id == id)
+        .correlate_except(Task)
+        .scalar_subquery(),
+        deferred=True,
+    )
+
     def get_member_role(self, user_id: str) -> ProjectRole:
         """Get the role of a user in this project"""
-        member = next((m for m in self.members if m.user_id == user_id), None)
-        if member:
-            return member.role
+        # Owners are resolved without touching (or lazy loading) members
         if self.owner_id == user_id:
             return ProjectRole.OWNER
+        member = self.members.get(user_id)
+        if member:
+            return member.role
         return None
 
     def has_permission(self, user_id: str, required_role: ProjectRole) -> bool:
@@ -630,11 +707,15 @@ class WebhookSubscription(Base):
     name = Column(String(100), nullable=False)
     url = Column(String(500), nullable=False)
     secret = Column(String(255), nullable=True)  # For HMAC signature verification
-    events = Column(Text, nullable=False)  # JSON array of event types
+    events = Column(
+        JSON().with_variant(JSONB, "postgresql"), nullable=False
+    )  # List of event types
     is_active = Column(Boolean, default=True, nullable=False)
     project_id = Column(
         String, ForeignKey("projects.id", ondelete="CASCADE"), nullable=True
     )
+    # Events published before this are not delivered to the subscription
+    activated_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
     created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
     updated_at = Column(
         DateTime(timezone=True), default=func.now(), onupdate=func.now(), nullable=False
@@ -647,6 +728,21 @@ class WebhookSubscription(Base):
         "WebhookDelivery", back_populates="subscription", cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        # Serves the event match when triggering webhooks (PostgreSQL only)
+        Index(
+            "webhook_subscriptions_events_gin", "events", postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+        # Active subscriptions of a user and project when triggering webhooks
+        Index(
+            "webhook_subscriptions_user_project_active",
+            "user_id",
+            "project_id",
+            postgresql_where=text("is_active = true"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
+
 
 class WebhookDelivery(Base):
     """Model for tracking webhook deliveries"""
@@ -660,6 +756,7 @@ class WebhookDelivery(Base):
         nullable=False,
     )
     event_type = Column(String(50), nullable=False)
+    event_id = Column(String(36), nullable=True)  # Published event, if any
     payload = Column(Text, nullable=False)  # JSON payload as string
     status = Column(
         SQLEnum(WebhookDeliveryStatus),
@@ -677,6 +774,26 @@ class WebhookDelivery(Base):
     # Relationships
     subscription = relationship("WebhookSubscription", back_populates="deliveries")
 
+    __table_args__ = (
+        # A subscription's delivery history, newest first
+        Index(
+            "webhook_deliveries_sub_delivered",
+            subscription_id,
+            delivered_at.desc(),
+        ),
+        # An event is delivered to a subscription at most once
+        UniqueConstraint(
+            subscription_id, event_id, name="webhook_deliveries_sub_event"
+        ),
+        # Retention cleanup of delivered rows
+        Index(
+            "webhook_deliveries_delivered_at",
+            delivered_at,
+            postgresql_where=text("delivered_at IS NOT NULL"),
+            sqlite_where=text("delivered_at IS NOT NULL"),
+        ),
+    )
+
 
 class CalendarIntegration(Base):
     """Model for calendar integrations"""
@@ -782,7 +899,9 @@ class Notification(Base):
     )  # task_due, task_assigned, comment_mention, etc.
     title = Column(String(200), nullable=False)
     message = Column(Text, nullable=False)
-    data = Column(Text, nullable=True)  # JSON data for notification context
+    data = Column(
+        JSON().with_variant(JSONB, "postgresql"), nullable=True
+    )  # JSON data for notification context
     read = Column(Boolean, default=False, nullable=False)
     read_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
@@ -911,15 +1030,15 @@ class RefreshToken(Base):
 
     __tablename__ = "refresh_tokens"
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
+    id = Column(String, primary_key=True, default=lambda: uuid.uuid4().hex, index=True)
 
     # User association
     user_id = Column(
         String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
 
-    # Token data - store hash, not plain text
-    token_hash = Column(String(255), unique=True, nullable=False, index=True)
+    # Token data - store raw keyed BLAKE2b digest, not plain text
+    token_hash = Column(LargeBinary(32), unique=True, nullable=False, index=True)
 
     # Token family for rotation detection
     family = Column(String, nullable=False, index=True)
@@ -948,4 +1067,12 @@ class RefreshToken(Base):
         Index("ix_refresh_tokens_user_not_revoked", "user_id", "is_revoked"),
         Index("ix_refresh_tokens_family_not_revoked", "family", "is_revoked"),
         Index("ix_refresh_tokens_expires_not_revoked", "expires_at", "is_revoked"),
+        # Active sessions per user, already ordered for get_user_sessions
+        Index(
+            "ix_refresh_tokens_active_user",
+            "user_id",
+            "last_used_at",
+            postgresql_where=text("is_revoked = false"),
+            sqlite_where=text("is_revoked = 0"),
+        ),
     )
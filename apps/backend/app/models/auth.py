@@ -38,7 +38,7 @@ class RefreshTokenRecord(BaseModel):
 
     id: str
     user_id: str
-    token_hash: str
+    token_hash: bytes
     family: str
     device_name: Optional[str] = None
     device_type: Optional[str] = None
@@ -5,7 +5,7 @@ Service layer for task activity tracking and audit logging.
 import json
 import uuid
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from sqlalchemy import desc
 from sqlalchemy.orm import Session
@@ -32,6 +32,10 @@ class ActivityService:
         """
         Log a task activity.
 
+        When the session carries an info["activity_batch"] list the activity
+        is appended to it instead of being committed, and the owner of the
+        batch inserts every row at once.
+
         Args:
             db: Database session
             task_id: ID of the task
@@ -46,14 +50,14 @@ class ActivityService:
         Returns:
             Created TaskActivity instance
         """
-        # Verify task exists
-        task = db.query(Task).filter(Task.id == task_id).first()
+        # Verify task exists (identity map first, so prefetched rows are free)
+        task = db.get(Task, task_id)
         if not task:
             raise ValueError(f"Task {task_id} not found")
 
         # Verify user exists if user_id provided
         if user_id:
-            user = db.query(User).filter(User.id == user_id).first()
+            user = db.get(User, user_id)
             if not user:
                 raise ValueError(f"User {user_id} not found")
 
@@ -70,12 +74,19 @@ class ActivityService:
             created_at=datetime.now(timezone.utc),
         )
 
-        db.add(activity)
-        db.commit()
-        db.refresh(activity)
+        batch = db.info.get("activity_batch")
+        if batch is not None:
+            batch.append(activity)
+        else:
+            db.add(activity)
+            db.commit()
+            db.refresh(activity)
 
         logger.info(
-            f"Logged activity {activity_type.value} for task {task_id} by user {user_id}"
+            "Logged activity %s for task %s by user %s",
+            activity_type.value,
+            task_id,
+            user_id,
         )
         return activity
 
@@ -272,14 +283,27 @@ class ActivityService:
         db: Session,
         task_id: str,
         user_id: str,
-        old_due_date: Optional[datetime],
-        new_due_date: Optional[datetime],
+        old_due_date: Union[datetime, str, None],
+        new_due_date: Union[datetime, str, None],
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
     ) -> TaskActivity:
-        """Log task due date change activity."""
-        old_value = old_due_date.isoformat() if old_due_date else None
-        new_value = new_due_date.isoformat() if new_due_date else None
+        """
+        Log task due date change activity.
+
+        Dates may also be given as the ISO strings they are stored as, which
+        is how queued activities carry them, and are then kept verbatim.
+        """
+        old_value = (
+            old_due_date.isoformat()
+            if isinstance(old_due_date, datetime)
+            else old_due_date
+        )
+        new_value = (
+            new_due_date.isoformat()
+            if isinstance(new_due_date, datetime)
+            else new_due_date
+        )
 
         return ActivityService.log_activity(
             db=db,
@@ -483,13 +507,19 @@ class ActivityService:
         )
 
     @staticmethod
-    def cleanup_old_activities(db: Session, days: int = 365) -> int:
+    def cleanup_old_activities(
+        db: Session, days: int = 365, batch_size: int = 10000
+    ) -> int:
         """
         Clean up old activity records to manage database size.
 
+        Rows are deleted in batches of batch_size, each committed on its own,
+        so a large backlog never holds locks or WAL for one giant DELETE.
+
         Args:
             db: Database session
             days: Number of days to keep (default 1 year)
+            batch_size: Maximum number of records deleted per transaction
 
         Returns:
             Number of deleted records
@@ -498,15 +528,26 @@ class ActivityService:
 
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
 
-        deleted_count = (
-            db.query(TaskActivity)
-            .filter(TaskActivity.created_at < cutoff_date)
-            .delete()
-        )
-
-        db.commit()
+        deleted_count = 0
+        while True:
+            activity_ids = [
+                activity_id
+                for (activity_id,) in db.query(TaskActivity.id)
+                .filter(TaskActivity.created_at < cutoff_date)
+                .limit(batch_size)
+                .all()
+            ]
+            if not activity_ids:
+                break
+
+            deleted_count += (
+                db.query(TaskActivity)
+                .filter(TaskActivity.id.in_(activity_ids))
+                .delete(synchronize_session=False)
+            )
+            db.commit()
 
         logger.info(
-            f"Cleaned up {deleted_count} old activity records older than {days} days"
+            "Cleaned up %d old activity records older than %d days", deleted_count, days
         )
         return deleted_count
@@ -5,18 +5,22 @@ Service layer for analytics and reporting functionality.
 import csv
 import io
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, TextIO
 
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, Font, PatternFill
 from sqlalchemy import func, or_
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.core.config import settings
 from app.db.models import (Category, Project, ProjectRole, Tag, Task,
                            TaskPriority, TaskStatus, TimeLog)
 from app.services.cache_service import cache_service, cached
 
+# Rows fetched per round trip while exporting, and task ids per IN list
+EXPORT_YIELD_SIZE = 1000
+EXPORT_ID_CHUNK_SIZE = 500
+
 
 class AnalyticsService:
     """Service for generating analytics and reports."""
@@ -383,20 +387,48 @@ class AnalyticsService:
         ]
 
     @staticmethod
-    def export_tasks_csv(
+    def _iter_export_tasks(
         db: Session, user_id: str, task_ids: Optional[List[str]] = None
-    ) -> str:
-        """Export tasks to CSV format."""
-        query = db.query(Task).filter(
-            or_(Task.user_id == user_id, Task.assigned_to_id == user_id)
+    ) -> Iterator[Task]:
+        """Yield the tasks to export, streamed from the database in batches."""
+        base_query = (
+            db.query(Task)
+            .filter(or_(Task.user_id == user_id, Task.assigned_to_id == user_id))
+            .options(
+                selectinload(Task.assigned_to),
+                selectinload(Task.project),
+                selectinload(Task.categories),
+                selectinload(Task.tags),
+            )
+            .yield_per(EXPORT_YIELD_SIZE)
         )
 
-        if task_ids:
-            query = query.filter(Task.id.in_(task_ids))
+        if not task_ids:
+            yield from base_query
+            return
 
-        tasks = query.all()
+        # Bounded IN lists keep each statement cheap to parse and plan
+        unique_ids = list(dict.fromkeys(task_ids))
+        for start in range(0, len(unique_ids), EXPORT_ID_CHUNK_SIZE):
+            chunk = unique_ids[start : start + EXPORT_ID_CHUNK_SIZE]
+            yield from base_query.filter(Task.id.in_(chunk))
 
+    @staticmethod
+    def export_tasks_csv(
+        db: Session, user_id: str, task_ids: Optional[List[str]] = None
+    ) -> str:
+        """Export tasks to CSV format."""
         output = io.StringIO()
+        AnalyticsService.write_tasks_csv(db, user_id, output, task_ids)
+        return output.getvalue()
+
+    @staticmethod
+    def write_tasks_csv(
+        db: Session, user_id: str, output: TextIO, task_ids: Optional[List[str]] = None
+    ) -> None:
+        """Write tasks in CSV format to a text file, one row at a time."""
+        tasks = AnalyticsService._iter_export_tasks(db, user_id, task_ids)
+
         writer = csv.writer(output)
 
         # Write header
@@ -419,8 +451,8 @@ class AnalyticsService:
             ]
         )
 
-        # Write task data
-        for task in tasks:
+        # Write task data, flushing periodically so large exports stream out
+        for count, task in enumerate(tasks, 1):
             writer.writerow(
                 [
                     task.id,
@@ -439,22 +471,27 @@ class AnalyticsService:
                     task.project.name if task.project else "",
                 ]
             )
-
-        return output.getvalue()
+            if count % EXPORT_YIELD_SIZE == 0:
+                output.flush()
 
     @staticmethod
     def export_tasks_excel(
         db: Session, user_id: str, task_ids: Optional[List[str]] = None
     ) -> bytes:
         """Export tasks to Excel format."""
-        query = db.query(Task).filter(
-            or_(Task.user_id == user_id, Task.assigned_to_id == user_id)
-        )
-
-        if task_ids:
-            query = query.filter(Task.id.in_(task_ids))
+        output = io.BytesIO()
+        AnalyticsService.write_tasks_excel(db, user_id, output, task_ids)
+        return output.getvalue()
 
-        tasks = query.all()
+    @staticmethod
+    def write_tasks_excel(
+        db: Session,
+        user_id: str,
+        output: BinaryIO,
+        task_ids: Optional[List[str]] = None,
+    ) -> None:
+        """Write tasks in Excel format to a binary file."""
+        tasks = AnalyticsService._iter_export_tasks(db, user_id, task_ids)
 
         # Create workbook and worksheet
         wb = Workbook()
@@ -544,12 +581,7 @@ class AnalyticsService:
             adjusted_width = min(max_length + 2, 50)
             ws.column_dimensions[column_letter].width = adjusted_width
 
-        # Save to bytes
-        output = io.BytesIO()
         wb.save(output)
-        output.seek(0)
-
-        return output.getvalue()
 
     @staticmethod
     def get_team_performance(
@@ -606,7 +638,7 @@ class AnalyticsService:
         team_members.append(owner_stats)
 
         # Add other members
-        for member in project.members:
+        for member in project.members.values():
             member_stats = {
                 "user_id": member.user_id,
                 "username": member.user.username,
@@ -3,10 +3,14 @@ Redis caching service for the task management application.
 Provides centralized caching functionality with automatic serialization.
 """
 
+import fnmatch
 import hashlib
 import json
 import logging
 import pickle
+import random
+import re
+import uuid
 from datetime import datetime, timedelta
 from functools import wraps
 from typing import Any, Callable, Dict, List, Optional, Union
@@ -181,16 +185,51 @@ class CacheService:
         Returns:
             Number of keys deleted
         """
-        if not self._is_available():
+        return self.delete_patterns([pattern])
+
+    def delete_patterns(self, patterns: List[str], batch_size: int = 500) -> int:
+        """
+        Delete all keys matching any of several patterns in one keyspace pass.
+
+        Keys are found with an incremental SCAN rather than KEYS, so Redis is
+        never blocked for the whole keyspace, and removed with pipelined
+        UNLINKs that free the memory in the background.
+
+        Args:
+            patterns: Patterns to match (Redis glob patterns)
+            batch_size: Maximum number of keys unlinked per round trip
+
+        Returns:
+            Number of keys deleted
+        """
+        if not self._is_available() or not patterns:
             return 0
 
+        # A single pattern is matched by Redis itself; several are matched
+        # locally so that the keyspace is still only scanned once
+        if len(patterns) == 1:
+            keys = self._redis_client.scan_iter(match=patterns[0], count=1000)
+        else:
+            matchers = [re.compile(fnmatch.translate(p)) for p in patterns]
+            keys = (
+                key
+                for key in self._redis_client.scan_iter(count=1000)
+                if any(matcher.match(key) for matcher in matchers)
+            )
+
         try:
-            keys = self._redis_client.keys(pattern)
-            if keys:
-                return self._redis_client.delete(*keys)
-            return 0
+            deleted = 0
+            batch = []
+            for key in keys:
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    deleted += self._redis_client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += self._redis_client.unlink(*batch)
+            return deleted
         except RedisError as e:
-            logger.warning(f"Failed to delete pattern {pattern}: {e}")
+            logger.warning(f"Failed to delete patterns {patterns}: {e}")
             return 0
 
     def exists(self, key: str) -> bool:
@@ -212,6 +251,84 @@ class CacheService:
             logger.warning(f"Failed to check if key {key} exists: {e}")
             return False
 
+    def exists_multi(self, keys: List[str]) -> Dict[str, bool]:
+        """
+        Check which of several keys exist in cache, in one round trip.
+
+        Args:
+            keys: List of cache keys
+
+        Returns:
+            Dictionary of key to whether it exists
+        """
+        if not self._is_available() or not keys:
+            return {}
+
+        try:
+            pipeline = self._redis_client.pipeline(transaction=False)
+            for key in keys:
+                pipeline.exists(key)
+            return {key: bool(found) for key, found in zip(keys, pipeline.execute())}
+        except RedisError as e:
+            logger.warning(f"Failed to check if multiple keys exist: {e}")
+            return {}
+
+    # Deletes the lock only while it still holds the caller's token
+    _RELEASE_LOCK_SCRIPT = """
+    if redis.call("get", KEYS[1]) == ARGV[1] then
+        return redis.call("del", KEYS[1])
+    end
+    return 0
+    """
+
+    def acquire_lock(self, name: str, ttl_ms: int = 30000) -> Optional[str]:
+        """
+        Take a short-lived lock so only one worker computes a value.
+
+        Args:
+            name: Lock name, stored under "lock:{name}"
+            ttl_ms: Expiry in milliseconds, in case the holder dies
+
+        Returns:
+            Token for release_lock, or None if someone else holds the lock.
+            Without Redis the lock is always granted.
+        """
+        token = uuid.uuid4().hex
+        if not self._is_available():
+            return token
+
+        try:
+            if self._redis_client.set(f"lock:{name}", token, nx=True, px=ttl_ms):
+                return token
+            return None
+        except RedisError as e:
+            logger.warning(f"Failed to acquire lock {name}: {e}")
+            return token
+
+    def release_lock(self, name: str, token: str) -> bool:
+        """
+        Release a lock taken with acquire_lock.
+
+        Args:
+            name: Lock name
+            token: Token returned by acquire_lock
+
+        Returns:
+            True if the lock was released, False if it had already expired
+        """
+        if not self._is_available():
+            return False
+
+        try:
+            return bool(
+                self._redis_client.eval(
+                    self._RELEASE_LOCK_SCRIPT, 1, f"lock:{name}", token
+                )
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to release lock {name}: {e}")
+            return False
+
     def expire(self, key: str, ttl: int) -> bool:
         """
         Set expiration for a key.
@@ -276,13 +393,17 @@ class CacheService:
             logger.warning(f"Failed to get multiple keys: {e}")
             return {}
 
-    def set_multi(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+    def set_multi(
+        self, mapping: Dict[str, Any], ttl: Optional[int] = None, jitter: bool = False
+    ) -> bool:
         """
         Set multiple values in cache.
 
         Args:
             mapping: Dictionary of key-value pairs to set
             ttl: Time to live in seconds
+            jitter: Give each key its own jittered_ttl(ttl), so keys written
+                together do not all expire at the same moment
 
         Returns:
             True if all values were set, False otherwise
@@ -303,7 +424,7 @@ class CacheService:
             # Set expiration for all keys if TTL is specified
             if ttl:
                 for key in mapping.keys():
-                    pipeline.expire(key, ttl)
+                    pipeline.expire(key, jittered_ttl(ttl) if jitter else ttl)
 
             results = pipeline.execute()
             return all(results)
@@ -334,6 +455,16 @@ class CacheService:
 cache_service = CacheService()
 
 
+def jittered_ttl(ttl: int, spread: float = 0.1) -> int:
+    """
+    Randomize a TTL by up to +/- spread of its value.
+
+    Keys cached together with a fixed TTL all expire, and are recomputed,
+    together; the jitter spreads those expiries out.
+    """
+    return max(1, round(ttl * (1 + spread * (2 * random.random() - 1))))
+
+
 def cache_key(*args, **kwargs) -> str:
     """
     Generate a cache key from function arguments.
@@ -425,8 +556,7 @@ def invalidate_user_cache(user_id: str):
         f"*{settings.CACHE_PREFIX_SEARCH}*user:{user_id}*",
     ]
 
-    for pattern in patterns:
-        cache_service.delete_pattern(pattern)
+    cache_service.delete_patterns(patterns)
 
 
 def invalidate_task_cache(task_id: str, user_id: str = None):
@@ -439,8 +569,7 @@ def invalidate_task_cache(task_id: str, user_id: str = None):
     if user_id:
         patterns.append(f"*{settings.CACHE_PREFIX_TASKS}*user:{user_id}*")
 
-    for pattern in patterns:
-        cache_service.delete_pattern(pattern)
+    cache_service.delete_patterns(patterns)
 
 
 def invalidate_project_cache(project_id: str):
@@ -450,5 +579,17 @@ def invalidate_project_cache(project_id: str):
         f"*{settings.CACHE_PREFIX_SEARCH}*",  # Search results might include project tasks
     ]
 
-    for pattern in patterns:
-        cache_service.delete_pattern(pattern)
+    cache_service.delete_patterns(patterns)
+
+
+def invalidate_webhook_cache(user_id: str = None):
+    """Invalidate cached webhook subscriptions for a user, or for everyone."""
+    if user_id:
+        patterns = [
+            f"*{settings.CACHE_PREFIX_WEBHOOKS}user:{user_id}:*",
+            f"*{settings.CACHE_PREFIX_WEBHOOKS}user:any:*",
+        ]
+    else:
+        patterns = [f"*{settings.CACHE_PREFIX_WEBHOOKS}*"]
+
+    cache_service.delete_patterns(patterns)
@@ -2,7 +2,6 @@
 Notification service for managing notifications and reminders.
 """
 
-import json
 from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Any, Dict, List, Optional
@@ -64,7 +63,7 @@ class NotificationService:
             type=notification_type,
             title=title,
             message=message,
-            data=json.dumps(data) if data else None,
+            data=data or None,
             created_at=datetime.now(timezone.utc),
         )
 
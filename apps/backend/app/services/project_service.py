@@ -6,14 +6,16 @@ import uuid
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
+from sqlalchemy import insert, literal, or_, select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, noload, selectinload, undefer
 
 from app.db.models import (Project, ProjectInvitation, ProjectMember,
                            ProjectRole, User)
 from app.models.project import (ProjectCreate, ProjectDetailResponse,
                                 ProjectInvitationCreate, ProjectMemberResponse,
                                 ProjectResponse, ProjectUpdate)
+from app.services.cache_service import invalidate_webhook_cache
 
 
 class ProjectService:
@@ -25,7 +27,7 @@ class ProjectService:
     ) -> Project:
         """Create a new project"""
         project = Project(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             name=project_data.name,
             description=project_data.description,
             color=project_data.color,
@@ -47,10 +49,19 @@ class ProjectService:
         db: Session, user_id: str, include_inactive: bool = False
     ) -> List[Project]:
         """Get all projects where user is owner or member"""
+        # Eager load everything to_response touches so listing N projects costs
+        # a fixed number of queries instead of one lazy load per relationship.
         query = (
             db.query(Project)
-            .outerjoin(ProjectMember)
+            .outerjoin(ProjectMember, ProjectMember.project_id == Project.id)
             .filter((Project.owner_id == user_id) | (ProjectMember.user_id == user_id))
+            .options(
+                joinedload(Project.owner),
+                selectinload(Project.members).joinedload(ProjectMember.user),
+                undefer(Project.task_count),
+                # Listing is read-only and counts tasks in SQL, never load them
+                noload(Project.tasks),
+            )
             .distinct()
         )
 
@@ -69,6 +80,7 @@ class ProjectService:
             .options(
                 joinedload(Project.members).joinedload(ProjectMember.user),
                 joinedload(Project.owner),
+                undefer(Project.task_count),
             )
             .filter(Project.id == project_id)
             .first()
@@ -77,18 +89,9 @@ class ProjectService:
         if not project:
             return None
 
-        # Check if user has access
-        if project.owner_id != user_id:
-            member = (
-                db.query(ProjectMember)
-                .filter(
-                    ProjectMember.project_id == project_id,
-                    ProjectMember.user_id == user_id,
-                )
-                .first()
-            )
-            if not member:
-                return None
+        # Check if user has access; members are already eager loaded above
+        if project.owner_id != user_id and user_id not in project.members:
+            return None
 
         return project
 
@@ -117,6 +120,8 @@ class ProjectService:
         """Delete a project (hard delete)"""
         db.delete(project)
         db.commit()
+        # Its webhook subscriptions were cascaded away
+        invalidate_webhook_cache()
 
     @staticmethod
     def soft_delete_project(db: Session, project: Project) -> Project:
@@ -132,30 +137,42 @@ class ProjectService:
         db: Session, project_id: str, user_id: str, role: ProjectRole
     ) -> ProjectMember:
         """Add a member to a project"""
-        # Check if user exists
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            raise ValueError("User not found")
-
-        # Check if already a member
-        existing = (
-            db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
+        # Insert only if the user exists and is not a member yet, in a single
+        # statement. The unique constraint still guards concurrent inserts.
+        already_member = (
+            select(ProjectMember.id)
+            .where(
+                ProjectMember.project_id == project_id,
+                ProjectMember.user_id == User.id,
             )
-            .first()
+            .exists()
+        )
+        stmt = (
+            insert(ProjectMember)
+            .from_select(
+                ["id", "project_id", "user_id", "role"],
+                select(
+                    literal(uuid.uuid4().hex),
+                    literal(project_id),
+                    User.id,
+                    literal(role, ProjectMember.role.type),
+                ).where(User.id == user_id, ~already_member),
+            )
+            .returning(ProjectMember)
         )
 
-        if existing:
+        try:
+            member = db.scalars(stmt).first()
+            if member is None:
+                # Nothing inserted: work out which precondition failed
+                if not db.query(User.id).filter(User.id == user_id).first():
+                    raise ValueError("User not found")
+                raise ValueError("User is already a project member")
+            db.commit()
+        except IntegrityError:
+            db.rollback()
             raise ValueError("User is already a project member")
 
-        member = ProjectMember(
-            id=str(uuid.uuid4()), project_id=project_id, user_id=user_id, role=role
-        )
-
-        db.add(member)
-        db.commit()
-        db.refresh(member)
         return member
 
     @staticmethod
@@ -182,45 +199,45 @@ class ProjectService:
         invitation_data: ProjectInvitationCreate,
     ) -> ProjectInvitation:
         """Create a project invitation"""
-        # Check if user with email already exists and is a member
-        existing_user = (
-            db.query(User).filter(User.email == invitation_data.invitee_email).first()
+        email = invitation_data.invitee_email
+        now = datetime.now(timezone.utc)
+
+        # Check membership and pending invitations in a single round trip
+        is_member = (
+            select(ProjectMember.id)
+            .join(User, User.id == ProjectMember.user_id)
+            .where(ProjectMember.project_id == project_id, User.email == email)
+            .exists()
         )
-        if existing_user:
-            existing_member = (
-                db.query(ProjectMember)
-                .filter(
-                    ProjectMember.project_id == project_id,
-                    ProjectMember.user_id == existing_user.id,
-                )
-                .first()
-            )
-            if existing_member:
-                raise ValueError("User is already a project member")
-
-        # Check for existing pending invitation
-        existing_invitation = (
-            db.query(ProjectInvitation)
-            .filter(
+        has_pending_invitation = (
+            select(ProjectInvitation.id)
+            .where(
                 ProjectInvitation.project_id == project_id,
-                ProjectInvitation.invitee_email == invitation_data.invitee_email,
+                ProjectInvitation.invitee_email == email,
                 ProjectInvitation.accepted_at == None,
-                ProjectInvitation.expires_at > datetime.now(timezone.utc),
+                ProjectInvitation.expires_at > now,
             )
-            .first()
+            .exists()
         )
+        already_member, already_invited = db.query(
+            is_member.label("is_member"),
+            has_pending_invitation.label("has_pending_invitation"),
+        ).one()
+
+        if already_member:
+            raise ValueError("User is already a project member")
 
-        if existing_invitation:
+        if already_invited:
             raise ValueError("An invitation for this email already exists")
 
         invitation = ProjectInvitation(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             project_id=project_id,
             inviter_id=inviter_id,
-            invitee_email=invitation_data.invitee_email,
+            invitee_email=email,
             role=invitation_data.role,
-            token=str(uuid.uuid4()),
-            expires_at=datetime.now(timezone.utc) + timedelta(days=7),  # 7 day expiry
+            token=uuid.uuid4().hex,
+            expires_at=now + timedelta(days=7),  # 7 day expiry
         )
 
         db.add(invitation)
@@ -266,10 +283,32 @@ class ProjectService:
             .first()
         )
 
+    @staticmethod
+    def user_has_access(db: Session, user_id: str, project_id: str) -> bool:
+        """Check if a user owns or is a member of a project"""
+        # A single EXISTS; neither the project nor its members are loaded
+        is_member = (
+            select(ProjectMember.id)
+            .where(
+                ProjectMember.project_id == Project.id,
+                ProjectMember.user_id == user_id,
+            )
+            .exists()
+        )
+        has_access = (
+            select(Project.id)
+            .where(
+                Project.id == project_id,
+                or_(Project.owner_id == user_id, is_member),
+            )
+            .exists()
+        )
+        return db.query(has_access).scalar()
+
     @staticmethod
     def to_response(project: Project, user_id: str, db: Session) -> ProjectResponse:
         """Convert project to response model"""
-        task_count = len(project.tasks) if project.tasks else 0
+        task_count = project.task_count or 0
         member_count = len(project.members) + 1  # +1 for owner
 
         # Get user's role
@@ -297,34 +336,32 @@ class ProjectService:
         """Convert project to detailed response model"""
         base_response = ProjectService.to_response(project, user_id, db)
 
-        # Add owner as a member in the response
-        members = []
+        # Rows are built from trusted ORM data, so skip pydantic validation
+        members = [
+            ProjectMemberResponse.model_construct(
+                id=member.id,
+                user_id=member.user.id,
+                username=member.user.username,
+                email=member.user.email,
+                role=member.role,
+                joined_at=member.joined_at,
+            )
+            for member in project.members.values()
+            if member.user
+        ]
 
-        # Add owner
+        # Add owner as the first member in the response
         if project.owner:
-            members.append(
-                ProjectMemberResponse(
+            members.insert(
+                0,
+                ProjectMemberResponse.model_construct(
                     id="owner",
                     user_id=project.owner.id,
                     username=project.owner.username,
                     email=project.owner.email,
                     role=ProjectRole.OWNER,
                     joined_at=project.created_at,
-                )
+                ),
             )
 
-        # Add other members
-        for member in project.members:
-            if member.user:
-                members.append(
-                    ProjectMemberResponse(
-                        id=member.id,
-                        user_id=member.user.id,
-                        username=member.user.username,
-                        email=member.user.email,
-                        role=member.role,
-                        joined_at=member.joined_at,
-                    )
-                )
-
         return ProjectDetailResponse(**base_response.model_dump(), members=members)
@@ -3,18 +3,24 @@ Service for handling refresh token operations.
 """
 
 import hashlib
+import logging
 import secrets
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Tuple
 
-from jose import JWTError, jwt
-from sqlalchemy import and_
+from jose import JWTError, jwk, jwt
+from sqlalchemy import and_, delete, func, insert, select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.db.models import RefreshToken, User
 from app.models.auth import RefreshTokenData, SessionInfo
+from app.services.user_service import UserService
+
+logger = logging.getLogger(__name__)
 
 
 class RefreshTokenService:
@@ -22,18 +28,97 @@ class RefreshTokenService:
 
     # Separate secret for refresh tokens
     REFRESH_SECRET_KEY = settings.SECRET_KEY + "_refresh"
+    # Built once; jose would otherwise rebuild the key from the raw string
+    # (and try to parse it as a JWK set) on every encode and decode
+    REFRESH_SIGNING_KEY = jwk.construct(REFRESH_SECRET_KEY, settings.ALGORITHM)
+    # BLAKE2b accepts at most a 64-byte key, so derive a fixed-size one
+    TOKEN_HASH_KEY = hashlib.sha256(REFRESH_SECRET_KEY.encode()).digest()
     REFRESH_TOKEN_EXPIRE_DAYS = 30  # 30 days for refresh tokens
     ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
+    # Short-lived memo of verified payloads, keyed by token hash
+    DECODE_CACHE_TTL_SECONDS = 5
+    DECODE_CACHE_MAX_SIZE = 4096
+    _decode_cache: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+
     @staticmethod
-    def _hash_token(token: str) -> str:
-        """Hash a token for secure storage."""
-        return hashlib.sha256(token.encode()).hexdigest()
+    def _hash_token(token: str) -> bytes:
+        """
+        Hash a token for secure storage.
+
+        Keyed BLAKE2b is faster than SHA-256 on short inputs and doubles as a
+        MAC. The raw 32-byte digest is stored, half the size of a hex string.
+        """
+        return hashlib.blake2b(
+            token.encode(),
+            digest_size=32,
+            key=RefreshTokenService.TOKEN_HASH_KEY,
+        ).digest()
+
+    @staticmethod
+    def _decode_token(refresh_token: str, token_hash: bytes) -> dict:
+        """
+        Decode and verify a refresh token, memoized briefly by its hash.
+
+        Clients on flaky networks retry a refresh with the same token, and the
+        retries skip the signature check. Expiry stays enforced because the
+        rotation UPDATE compares expires_at in SQL.
+        """
+        cache = RefreshTokenService._decode_cache
+        now = time.monotonic()
+
+        cached = cache.get(token_hash)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        payload = jwt.decode(
+            refresh_token,
+            RefreshTokenService.REFRESH_SIGNING_KEY,
+            algorithms=[settings.ALGORITHM],
+        )
+
+        cache.pop(token_hash, None)
+        while len(cache) >= RefreshTokenService.DECODE_CACHE_MAX_SIZE:
+            cache.popitem(last=False)
+        cache[token_hash] = (
+            now + RefreshTokenService.DECODE_CACHE_TTL_SECONDS,
+            payload,
+        )
+        return payload
 
     @staticmethod
     def _generate_token_family() -> str:
         """Generate a new token family identifier."""
-        return str(uuid.uuid4())
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def _insert_token(
+        db: Session,
+        user_id: str,
+        token_hash: bytes,
+        family: str,
+        expires_at: datetime,
+        device_info: Optional[dict] = None,
+    ) -> None:
+        """
+        Insert a refresh token row with a Core INSERT.
+
+        Token rows are never read back in the request that issues them, so this
+        skips building an ORM instance and registering it in the identity map.
+        """
+        device_info = device_info or {}
+        db.execute(
+            insert(RefreshToken).values(
+                user_id=user_id,
+                token_hash=token_hash,
+                family=family,
+                device_name=device_info.get("device_name"),
+                device_type=device_info.get("device_type"),
+                browser=device_info.get("browser"),
+                ip_address=device_info.get("ip_address"),
+                expires_at=expires_at,
+            )
+        )
 
     @staticmethod
     def create_refresh_token(
@@ -56,20 +141,21 @@ class RefreshTokenService:
         )
 
         # Set expiration
+        now = datetime.now(timezone.utc)
         expires_delta = timedelta(days=RefreshTokenService.REFRESH_TOKEN_EXPIRE_DAYS)
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = now + expires_delta
 
         # Create JWT token
         to_encode = {
             **token_data.model_dump(),
             "exp": expire,
-            "iat": datetime.now(timezone.utc),
-            "jti": str(uuid.uuid4()),  # Unique token ID
+            "iat": now,
+            "jti": uuid.uuid4().hex,  # Unique token ID
         }
 
         refresh_token = jwt.encode(
             to_encode,
-            RefreshTokenService.REFRESH_SECRET_KEY,
+            RefreshTokenService.REFRESH_SIGNING_KEY,
             algorithm=settings.ALGORITHM,
         )
 
@@ -77,18 +163,9 @@ class RefreshTokenService:
         token_hash = RefreshTokenService._hash_token(refresh_token)
 
         # Store in database
-        db_token = RefreshToken(
-            user_id=user_id,
-            token_hash=token_hash,
-            family=family,
-            device_name=device_info.get("device_name") if device_info else None,
-            device_type=device_info.get("device_type") if device_info else None,
-            browser=device_info.get("browser") if device_info else None,
-            ip_address=device_info.get("ip_address") if device_info else None,
-            expires_at=expire,
+        RefreshTokenService._insert_token(
+            db, user_id, token_hash, family, expire, device_info
         )
-
-        db.add(db_token)
         db.commit()
 
         return refresh_token, family, expire
@@ -104,66 +181,72 @@ class RefreshTokenService:
             Tuple of (new_access_token, new_refresh_token, family_id, expiry) or (None, None, None, None) if invalid
         """
         try:
+            # Hash the token to look it up
+            token_hash = RefreshTokenService._hash_token(refresh_token)
+
             # Decode token
-            payload = jwt.decode(
-                refresh_token,
-                RefreshTokenService.REFRESH_SECRET_KEY,
-                algorithms=[settings.ALGORITHM],
-            )
+            payload = RefreshTokenService._decode_token(refresh_token, token_hash)
 
             user_id = payload.get("user_id")
             family = payload.get("family")
 
-            print(
-                f"[REFRESH SERVICE] Decoded token - user_id: {user_id}, family: {family}"
+            logger.debug(
+                "Decoded refresh token - user_id: %s, family: %s", user_id, family
             )
 
             if not user_id or not family:
-                print("[REFRESH SERVICE] Missing user_id or family in token")
+                logger.debug("Refresh token is missing user_id or family")
                 return None, None, None, None
 
-            # Hash the token to look it up
-            token_hash = RefreshTokenService._hash_token(refresh_token)
-
-            # Find the token in database
-            db_token = (
-                db.query(RefreshToken)
-                .filter(RefreshToken.token_hash == token_hash)
-                .first()
-            )
-
-            if not db_token:
-                print(
-                    f"[REFRESH SERVICE] Token not found in DB. Hash: {token_hash[:20]}..."
+            # Revoke the token and read it back in one statement. Only an
+            # active, unexpired token matches, so a returned row means the
+            # token was valid and is now consumed by this rotation.
+            now = datetime.now(timezone.utc)
+            rotated = db.execute(
+                update(RefreshToken)
+                .where(
+                    RefreshToken.token_hash == token_hash,
+                    RefreshToken.is_revoked == False,
+                    RefreshToken.expires_at > now,
                 )
-                # Token not found - might be reuse attack
-                # Revoke entire family as a security measure
-                RefreshTokenService.revoke_token_family(db, family, "reuse_detected")
-                return None, None, None, None
-
-            # Check if token is revoked
-            if db_token.is_revoked:
-                print(
-                    f"[REFRESH SERVICE] Token is revoked. Reason: {db_token.revoke_reason}"
+                .values(
+                    is_revoked=True,
+                    revoked_at=now,
+                    revoke_reason="rotated",
+                    last_used_at=now,
                 )
-                return None, None, None, None
-
-            # Check if token is expired (double check)
-            if db_token.expires_at < datetime.now(timezone.utc):
-                print(
-                    f"[REFRESH SERVICE] Token expired. Expires at: {db_token.expires_at}, Now: {datetime.now(timezone.utc)}"
+                .returning(RefreshToken.user_id, RefreshToken.family)
+                .execution_options(synchronize_session=False)
+            ).first()
+
+            if not rotated:
+                # Cold path: find out why the token was rejected
+                db_token = (
+                    db.query(RefreshToken.is_revoked, RefreshToken.revoke_reason)
+                    .filter(RefreshToken.token_hash == token_hash)
+                    .first()
                 )
-                return None, None, None, None
 
-            # Token is valid - rotate it
-            # First, revoke the old token
-            db_token.is_revoked = True
-            db_token.revoked_at = datetime.now(timezone.utc)
-            db_token.revoke_reason = "rotated"
-            db_token.last_used_at = datetime.now(timezone.utc)
+                if not db_token:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            "Refresh token not found in DB. Hash: %s...",
+                            token_hash[:10].hex(),
+                        )
+                    # Token not found - might be reuse attack
+                    # Revoke entire family as a security measure
+                    RefreshTokenService.revoke_token_family(
+                        db, family, "reuse_detected"
+                    )
+                elif db_token.is_revoked:
+                    logger.debug(
+                        "Refresh token is revoked. Reason: %s", db_token.revoke_reason
+                    )
+                else:
+                    logger.debug("Refresh token expired. Now: %s", now)
+                return None, None, None, None
 
-            # Create new tokens
-            from app.services.user_service import UserService
+            user_id, family = rotated.user_id, rotated.family
 
             # Generate new access token
             access_token = UserService.create_access_token(user_id)
@@ -183,7 +266,7 @@ class RefreshTokenService:
 
         except JWTError as e:
             # Invalid token - could be tampering
-            print(f"[REFRESH SERVICE] JWT Error: {str(e)}")
+            logger.debug("Refresh token JWT error: %s", e)
             return None, None, None, None
 
     @staticmethod
@@ -199,44 +282,36 @@ class RefreshTokenService:
         )
 
         # Set expiration
+        now = datetime.now(timezone.utc)
         expires_delta = timedelta(days=RefreshTokenService.REFRESH_TOKEN_EXPIRE_DAYS)
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = now + expires_delta
 
         # Create JWT token
         to_encode = {
             **token_data.model_dump(),
             "exp": expire,
-            "iat": datetime.now(timezone.utc),
-            "jti": str(uuid.uuid4()),
+            "iat": now,
+            "jti": uuid.uuid4().hex,
         }
 
         refresh_token = jwt.encode(
             to_encode,
-            RefreshTokenService.REFRESH_SECRET_KEY,
+            RefreshTokenService.REFRESH_SIGNING_KEY,
             algorithm=settings.ALGORITHM,
         )
 
         # Hash token for storage
         token_hash = RefreshTokenService._hash_token(refresh_token)
 
-        # Store in database
-        db_token = RefreshToken(
-            user_id=user_id,
-            token_hash=token_hash,
-            family=family,
-            device_name=device_info.get("device_name") if device_info else None,
-            device_type=device_info.get("device_type") if device_info else None,
-            browser=device_info.get("browser") if device_info else None,
-            ip_address=device_info.get("ip_address") if device_info else None,
-            expires_at=expire,
+        # Store in database; the caller commits together with the rotation
+        RefreshTokenService._insert_token(
+            db, user_id, token_hash, family, expire, device_info
         )
 
-        db.add(db_token)
-
         return refresh_token, family, expire
 
     @staticmethod
-    def revoke_token(db: Session, token_hash: str, reason: str = "user_logout"):
+    def revoke_token(db: Session, token_hash: bytes, reason: str = "user_logout"):
         """Revoke a specific refresh token."""
         db_token = (
             db.query(RefreshToken).filter(RefreshToken.token_hash == token_hash).first()
@@ -258,7 +333,10 @@ class RefreshTokenService:
                 "is_revoked": True,
                 "revoked_at": datetime.now(timezone.utc),
                 "revoke_reason": reason,
-            }
+            },
+            # Revoked rows are never read back in this session, so skip
+            # scanning the identity map for matching objects
+            synchronize_session=False,
         )
         db.commit()
 
@@ -272,56 +350,82 @@ class RefreshTokenService:
                 "is_revoked": True,
                 "revoked_at": datetime.now(timezone.utc),
                 "revoke_reason": reason,
-            }
+            },
+            # Revoked rows are never read back in this session, so skip
+            # scanning the identity map for matching objects
+            synchronize_session=False,
         )
         db.commit()
 
     @staticmethod
     def get_user_sessions(db: Session, user_id: str) -> List[SessionInfo]:
         """Get all active sessions for a user."""
-        # Get all non-revoked, non-expired tokens
+        # Each family represents a session. Rank the non-revoked, non-expired
+        # tokens within their family in SQL so only one row per session is
+        # fetched, however many times the family has been rotated.
+        recency = RefreshToken.last_used_at.desc().nullsfirst()
+        ranked = (
+            select(
+                RefreshToken.id,
+                func.row_number()
+                .over(partition_by=RefreshToken.family, order_by=recency)
+                .label("rank"),
+            )
+            .where(
+                RefreshToken.user_id == user_id,
+                RefreshToken.is_revoked == False,
+                RefreshToken.expires_at > datetime.now(timezone.utc),
+            )
+            .subquery()
+        )
         tokens = (
             db.query(RefreshToken)
-            .filter(
-                and_(
-                    RefreshToken.user_id == user_id,
-                    RefreshToken.is_revoked == False,
-                    RefreshToken.expires_at > datetime.now(timezone.utc),
-                )
-            )
-            .order_by(RefreshToken.last_used_at.desc().nullsfirst())
+            .join(ranked, ranked.c.id == RefreshToken.id)
+            .filter(ranked.c.rank == 1)
+            .order_by(recency)
             .all()
         )
 
-        # Group by family (each family represents a session)
-        families_seen = set()
-        sessions = []
-
-        for token in tokens:
-            if token.family not in families_seen:
-                families_seen.add(token.family)
-                sessions.append(
-                    SessionInfo(
-                        id=token.family,  # Use family as session ID
-                        device_name=token.device_name,
-                        device_type=token.device_type,
-                        browser=token.browser,
-                        ip_address=token.ip_address,
-                        last_active=token.last_used_at,
-                        created_at=token.created_at,
-                        is_current=False,  # Will be set by the endpoint
-                    )
-                )
-
-        return sessions
+        return [
+            SessionInfo(
+                id=token.family,  # Use family as session ID
+                device_name=token.device_name,
+                device_type=token.device_type,
+                browser=token.browser,
+                ip_address=token.ip_address,
+                last_active=token.last_used_at,
+                created_at=token.created_at,
+                is_current=False,  # Will be set by the endpoint
+            )
+            for token in tokens
+        ]
 
     @staticmethod
-    def cleanup_expired_tokens(db: Session) -> int:
-        """Remove expired tokens from database. Returns count of deleted tokens."""
-        result = (
-            db.query(RefreshToken)
-            .filter(RefreshToken.expires_at < datetime.now(timezone.utc))
-            .delete()
+    def cleanup_expired_tokens(db: Session, batch_size: int = 10000) -> int:
+        """
+        Remove expired tokens from database. Returns count of deleted tokens.
+
+        Rows are deleted in batches, each in its own transaction, so a large
+        backlog never holds row locks for long or piles up one huge WAL burst.
+        """
+        now = datetime.now(timezone.utc)
+        expired_batch = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < now)
+            .limit(batch_size)
+            .scalar_subquery()
         )
-        db.commit()
-        return result
+
+        total_deleted = 0
+        while True:
+            result = db.execute(
+                delete(RefreshToken)
+                .where(RefreshToken.id.in_(expired_batch))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            total_deleted += result.rowcount
+            if result.rowcount < batch_size:
+                break
+
+        return total_deleted
@@ -6,12 +6,14 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import or_
+from sqlalchemy import (Select, bindparam, distinct, exists, func, literal,
+                        literal_column, null, or_, select, union_all)
 from sqlalchemy.orm import Query, Session
 
 from app.core.config import settings
-from app.db.models import (Category, Project, ProjectRole, Tag, Task,
-                           TaskPriority, TaskShare, TaskStatus, User)
+from app.db.models import (Category, Project, ProjectMember, Tag, Task,
+                           TaskPriority, TaskShare, TaskStatus, User,
+                           task_categories, task_search_vector, task_tags)
 from app.services.cache_service import cache_service, cached
 
 
@@ -51,6 +53,8 @@ class TaskSearchQuery:
         self.sort_order: str = "desc"
         self.include_shared: bool = True
         self.include_assigned: bool = True
+        self.skip: int = 0
+        self.limit: Optional[int] = None
 
     def add_filter(self, filter: TaskSearchFilter):
         """Add a filter to the search query"""
@@ -65,6 +69,11 @@ class TaskSearchQuery:
         self.sort_by = field
         self.sort_order = order
 
+    def set_pagination(self, skip: int = 0, limit: Optional[int] = None):
+        """Set pagination parameters"""
+        self.skip = skip
+        self.limit = limit
+
 
 class SearchService:
     """Service for handling advanced search operations"""
@@ -88,6 +97,40 @@ class SearchService:
         "has_subtasks": Task.parent_task_id,
     }
 
+    # Access arms of search_tasks. They are built once and take user_id and
+    # now as bind parameters, so every search with the same filter shape
+    # reuses one cached compiled statement.
+    OWNED_TASK_IDS = select(Task.id).where(Task.user_id == bindparam("user_id"))
+    ASSIGNED_TASK_IDS = select(Task.id).where(
+        Task.assigned_to_id == bindparam("user_id")
+    )
+    SHARED_TASK_IDS = select(Task.id).where(
+        exists().where(
+            TaskShare.task_id == Task.id,
+            TaskShare.shared_with_id == bindparam("user_id"),
+            or_(
+                TaskShare.expires_at == None,
+                TaskShare.expires_at > bindparam("now"),
+            ),
+        )
+    )
+
+    # Mapping of search operators to SQL condition builders
+    OPERATOR_MAPPING = {
+        SearchOperator.EQUALS: lambda field, value: field == value,
+        SearchOperator.NOT_EQUALS: lambda field, value: field != value,
+        SearchOperator.GREATER_THAN: lambda field, value: field > value,
+        SearchOperator.GREATER_THAN_OR_EQUAL: lambda field, value: field >= value,
+        SearchOperator.LESS_THAN: lambda field, value: field < value,
+        SearchOperator.LESS_THAN_OR_EQUAL: lambda field, value: field <= value,
+        SearchOperator.CONTAINS: lambda field, value: field.ilike(f"%{value}%"),
+        SearchOperator.NOT_CONTAINS: lambda field, value: ~field.ilike(f"%{value}%"),
+        SearchOperator.IN: lambda field, value: field.in_(value),
+        SearchOperator.NOT_IN: lambda field, value: ~field.in_(value),
+        SearchOperator.IS_NULL: lambda field, value: field.is_(None),
+        SearchOperator.IS_NOT_NULL: lambda field, value: field.is_not(None),
+    }
+
     @staticmethod
     def search_tasks(
         db: Session, user_id: str, search_query: TaskSearchQuery
@@ -96,91 +139,99 @@ class SearchService:
         Perform advanced search on tasks.
         Returns tuple of (tasks, total_count)
         """
-        # Base query - user's own tasks
-        base_query = db.query(Task).filter(Task.user_id == user_id)
+        # Collect accessible task ids with UNION ALL; the IN below already
+        # de-duplicates, so there is no need for UNION to sort the id sets.
+        # Search filters are applied inside every arm so the union only
+        # carries matching ids.
+        id_queries = [SearchService.OWNED_TASK_IDS]
 
         # Include assigned tasks if requested
         if search_query.include_assigned:
-            assigned_query = db.query(Task).filter(Task.assigned_to_id == user_id)
-            base_query = base_query.union(assigned_query)
+            id_queries.append(SearchService.ASSIGNED_TASK_IDS)
 
         # Include shared tasks if requested
         if search_query.include_shared:
-            shared_task_ids = (
-                db.query(TaskShare.task_id)
-                .filter(
-                    TaskShare.shared_with_id == user_id,
-                    or_(
-                        TaskShare.expires_at == None,
-                        TaskShare.expires_at > datetime.now(timezone.utc),
-                    ),
-                )
-                .subquery()
+            id_queries.append(SearchService.SHARED_TASK_IDS)
+
+        params = {"user_id": user_id, "now": datetime.now(timezone.utc)}
+        full_text = db.get_bind().dialect.name == "postgresql"
+        task_ids = union_all(
+            *(
+                SearchService._apply_all_filters(id_query, search_query, full_text)
+                for id_query in id_queries
             )
-
-            shared_query = db.query(Task).filter(Task.id.in_(shared_task_ids))
-            base_query = base_query.union(shared_query)
-
-        # Apply text search if provided
-        if search_query.text_search:
-            text_filter = or_(
-                Task.title.ilike(f"%{search_query.text_search}%"),
-                Task.description.ilike(f"%{search_query.text_search}%"),
-            )
-            base_query = base_query.filter(text_filter)
-
-        # Apply filters
-        for filter in search_query.filters:
-            base_query = SearchService._apply_filter(base_query, filter)
+        ).subquery()
 
         # Get total count before pagination
-        total_count = base_query.count()
+        total_count = db.scalar(select(func.count(distinct(task_ids.c.id))), params)
+
+        base_query = (
+            db.query(Task).filter(Task.id.in_(select(task_ids.c.id))).params(params)
+        )
 
         # Apply sorting
         base_query = SearchService._apply_sort(
             base_query, search_query.sort_by, search_query.sort_order
         )
 
+        # Only fetch the requested page; total_count covers every match
+        if search_query.skip:
+            base_query = base_query.offset(search_query.skip)
+        if search_query.limit is not None:
+            base_query = base_query.limit(search_query.limit)
+
         tasks = base_query.all()
 
         return tasks, total_count
 
+    @staticmethod
+    def _apply_all_filters(
+        query: Select, search_query: TaskSearchQuery, full_text: bool = False
+    ) -> Select:
+        """Apply the text search and every filter of a search query"""
+        if search_query.text_search:
+            query = query.filter(
+                SearchService._text_search_condition(
+                    search_query.text_search, full_text
+                )
+            )
+
+        for filter in search_query.filters:
+            query = SearchService._apply_filter(query, filter)
+
+        return query
+
+    @staticmethod
+    def _text_search_condition(text: str, full_text: bool = False):
+        """
+        Build the text search condition.
+        Multi-word searches use the tasks_search_tsv full-text index when
+        available; anything else is a substring match served by the trigram
+        indexes.
+        """
+        words = text.split()
+        if full_text and len(words) > 1 and all(word.isalnum() for word in words):
+            return task_search_vector(Task.title, Task.description).op("@@")(
+                func.plainto_tsquery(literal_column("'english'"), text)
+            )
+
+        return or_(
+            Task.title.ilike(f"%{text}%"),
+            Task.description.ilike(f"%{text}%"),
+        )
+
     @staticmethod
     def _apply_filter(query: Query, filter: TaskSearchFilter) -> Query:
         """Apply a single filter to the query"""
         field = SearchService.FIELD_MAPPING.get(filter.field)
-        if not field:
+        if field is None:
             return query
 
-        operator = filter.operator
-        value = filter.value
-
-        if operator == SearchOperator.EQUALS:
-            return query.filter(field == value)
-        elif operator == SearchOperator.NOT_EQUALS:
-            return query.filter(field != value)
-        elif operator == SearchOperator.GREATER_THAN:
-            return query.filter(field > value)
-        elif operator == SearchOperator.GREATER_THAN_OR_EQUAL:
-            return query.filter(field >= value)
-        elif operator == SearchOperator.LESS_THAN:
-            return query.filter(field < value)
-        elif operator == SearchOperator.LESS_THAN_OR_EQUAL:
-            return query.filter(field <= value)
-        elif operator == SearchOperator.CONTAINS:
-            return query.filter(field.ilike(f"%{value}%"))
-        elif operator == SearchOperator.NOT_CONTAINS:
-            return query.filter(~field.ilike(f"%{value}%"))
-        elif operator == SearchOperator.IN:
-            return query.filter(field.in_(value))
-        elif operator == SearchOperator.NOT_IN:
-            return query.filter(~field.in_(value))
-        elif operator == SearchOperator.IS_NULL:
-            return query.filter(field == None)
-        elif operator == SearchOperator.IS_NOT_NULL:
-            return query.filter(field != None)
+        condition = SearchService.OPERATOR_MAPPING.get(filter.operator)
+        if condition is None:
+            return query
 
-        return query
+        return query.filter(condition(field, filter.value))
 
     @staticmethod
     def _apply_sort(query: Query, sort_by: str, sort_order: str) -> Query:
@@ -189,10 +240,11 @@ class SearchService:
         if not field:
             field = Task.created_at  # Default
 
+        # Task.id breaks ties so pages do not overlap or skip rows
         if sort_order.lower() == "desc":
-            return query.order_by(field.desc())
+            return query.order_by(field.desc(), Task.id.desc())
         else:
-            return query.order_by(field.asc())
+            return query.order_by(field.asc(), Task.id.asc())
 
     @staticmethod
     def search_by_category(
@@ -203,7 +255,11 @@ class SearchService:
             db.query(Task)
             .filter(
                 Task.user_id == user_id,
-                Task.categories.any(Category.id.in_(category_ids)),
+                # Only the association table is needed to match category ids
+                exists().where(
+                    task_categories.c.task_id == Task.id,
+                    task_categories.c.category_id.in_(category_ids),
+                ),
             )
             .all()
         )
@@ -217,7 +273,12 @@ class SearchService:
         return (
             db.query(Task)
             .filter(
-                Task.user_id == user_id, Task.tags.any(Tag.name.in_(tag_names_lower))
+                Task.user_id == user_id,
+                exists().where(
+                    task_tags.c.task_id == Task.id,
+                    task_tags.c.tag_id == Tag.id,
+                    func.lower(Tag.name).in_(tag_names_lower),
+                ),
             )
             .all()
         )
@@ -230,12 +291,19 @@ class SearchService:
         filters: Optional[Dict[str, Any]] = None,
     ) -> List[Task]:
         """Search tasks within a specific project"""
-        # Verify user has access to project
-        project = db.query(Project).filter(Project.id == project_id).first()
-        if not project or not project.has_permission(user_id, ProjectRole.VIEWER):
-            return []
-
-        query = db.query(Task).filter(Task.project_id == project_id)
+        # Project owners and members of any role may view the project's tasks
+        is_member = exists().where(
+            ProjectMember.project_id == Project.id,
+            ProjectMember.user_id == user_id,
+        )
+        query = (
+            db.query(Task)
+            .join(Project, Project.id == Task.project_id)
+            .filter(
+                Task.project_id == project_id,
+                or_(Project.owner_id == user_id, is_member),
+            )
+        )
 
         # Apply additional filters if provided
         if filters:
@@ -252,14 +320,40 @@ class SearchService:
     @cached(prefix=settings.CACHE_PREFIX_SEARCH, ttl=600)  # Cache for 10 minutes
     def get_suggested_filters(db: Session, user_id: str) -> Dict[str, List[Any]]:
         """Get suggested filter values based on user's tasks"""
-        # Get all accessible task IDs
-        user_tasks = db.query(Task.id).filter(Task.user_id == user_id)
-        assigned_tasks = db.query(Task.id).filter(Task.assigned_to_id == user_id)
-        shared_tasks = db.query(TaskShare.task_id).filter(
-            TaskShare.shared_with_id == user_id
+        # Users assigned to any task the user owns, is assigned or was shared
+        assigned_to_accessible_task = exists().where(
+            Task.assigned_to_id == User.id,
+            or_(
+                Task.user_id == user_id,
+                Task.assigned_to_id == user_id,
+                exists().where(
+                    TaskShare.task_id == Task.id,
+                    TaskShare.shared_with_id == user_id,
+                ),
+            ),
+        )
+        is_member = exists().where(
+            ProjectMember.project_id == Project.id,
+            ProjectMember.user_id == user_id,
         )
 
-        all_task_ids = user_tasks.union(assigned_tasks).union(shared_tasks).subquery()
+        # Fetch every suggestion list in one round trip, tagged by kind
+        rows = db.execute(
+            union_all(
+                select(
+                    literal("categories"), Category.id, Category.name, Category.color
+                ).where(Category.user_id == user_id),
+                select(literal("tags"), Tag.id, Tag.name, Tag.color).where(
+                    Tag.user_id == user_id
+                ),
+                select(literal("assigned_users"), User.id, User.username, null()).where(
+                    assigned_to_accessible_task
+                ),
+                select(literal("projects"), Project.id, Project.name, null()).where(
+                    or_(Project.owner_id == user_id, is_member)
+                ),
+            )
+        ).all()
 
         # Get unique values for filters
         suggestions = {
@@ -271,47 +365,12 @@ class SearchService:
             "projects": [],
         }
 
-        # Get user's categories
-        categories = db.query(Category).filter(Category.user_id == user_id).all()
-        suggestions["categories"] = [
-            {"id": cat.id, "name": cat.name, "color": cat.color} for cat in categories
-        ]
-
-        # Get user's tags
-        tags = db.query(Tag).filter(Tag.user_id == user_id).all()
-        suggestions["tags"] = [
-            {"id": tag.id, "name": tag.name, "color": tag.color} for tag in tags
-        ]
-
-        # Get assigned users from tasks
-        assigned_user_ids = (
-            db.query(Task.assigned_to_id)
-            .filter(Task.id.in_(all_task_ids), Task.assigned_to_id != None)
-            .distinct()
-            .all()
-        )
-
-        if assigned_user_ids:
-            users = (
-                db.query(User)
-                .filter(User.id.in_([uid[0] for uid in assigned_user_ids]))
-                .all()
-            )
-            suggestions["assigned_users"] = [
-                {"id": user.id, "username": user.username} for user in users
-            ]
-
-        # Get accessible projects
-        user_projects = db.query(Project).filter(Project.owner_id == user_id)
-        member_projects = (
-            db.query(Project)
-            .join(Project.members)
-            .filter(Project.members.any(user_id=user_id))
-        )
-
-        all_projects = user_projects.union(member_projects).all()
-        suggestions["projects"] = [
-            {"id": proj.id, "name": proj.name} for proj in all_projects
-        ]
+        for kind, item_id, name, color in rows:
+            if kind == "assigned_users":
+                suggestions[kind].append({"id": item_id, "username": name})
+            elif kind == "projects":
+                suggestions[kind].append({"id": item_id, "name": name})
+            else:
+                suggestions[kind].append({"id": item_id, "name": name, "color": color})
 
         return suggestions
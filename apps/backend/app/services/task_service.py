@@ -1,18 +1,28 @@
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
-from sqlalchemy import and_
+from sqlalchemy import and_, func, not_, or_, select, update
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.logging import logger
+from app.db.models import Project, ProjectMember, ProjectRole
 from app.db.models import Task as TaskModel
-from app.db.models import TaskPriority, TaskStatus, TimeLog
+from app.db.models import TaskPriority, TaskShare, TaskStatus, TimeLog
 from app.services.cache_service import (cache_service, cached,
                                         invalidate_task_cache,
                                         invalidate_user_cache)
 
 
+# Project roles from least to most privileged, as in Project.has_permission
+PROJECT_ROLE_ORDER = [
+    ProjectRole.VIEWER,
+    ProjectRole.MEMBER,
+    ProjectRole.ADMIN,
+    ProjectRole.OWNER,
+]
+
+
 class TaskService:
     """Service layer for task-related business logic"""
 
@@ -37,76 +47,84 @@ class TaskService:
     @staticmethod
     def validate_task_limit(db: Session, user_id: str, limit: int = 100) -> bool:
         """Check if user has reached task limit"""
-        count = TaskService.get_user_task_count(db, user_id)
-        if count >= limit:
+        # Probe for the limit-th task instead of counting them all, so at
+        # most `limit` index entries are read however many tasks exist
+        at_limit = db.scalar(
+            select(
+                select(TaskModel.id)
+                .where(TaskModel.user_id == user_id)
+                .offset(max(limit - 1, 0))
+                .limit(1)
+                .exists()
+            )
+        )
+        if at_limit or limit <= 0:
             logger.warning(f"User {user_id} has reached task limit of {limit}")
             return False
         return True
 
     @staticmethod
+    @cached(
+        prefix=settings.CACHE_PREFIX_TASKS,
+        ttl=60,  # Cache for 1 minute, statistics change with every task write
+        # Keyed by user so invalidate_user_cache() drops it on task writes
+        key_func=lambda db, user_id: f"user:{user_id}:statistics",
+    )
     def get_task_statistics(db: Session, user_id: str) -> dict:
         """Get task statistics for a user"""
-        tasks = db.query(TaskModel).filter(TaskModel.user_id == user_id).all()
-
-        stats = {
-            "total": len(tasks),
-            "by_status": {
-                TaskStatus.TODO: 0,
-                TaskStatus.IN_PROGRESS: 0,
-                TaskStatus.DONE: 0,
-            },
-            "by_priority": {
-                TaskPriority.LOW: 0,
-                TaskPriority.MEDIUM: 0,
-                TaskPriority.HIGH: 0,
-                TaskPriority.URGENT: 0,
-            },
-            "overdue": 0,
-            "due_today": 0,
-            "due_this_week": 0,
-            "completed_this_week": 0,
-            "total_estimated_hours": 0.0,
-            "total_actual_hours": 0.0,
-        }
-
-        today = datetime.now(timezone.utc).date()
+        now = datetime.now(timezone.utc)
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        tomorrow = today + timedelta(days=1)
         week_start = today - timedelta(days=today.weekday())
         week_end = week_start + timedelta(days=7)
 
-        for task in tasks:
-            stats["by_status"][task.status] += 1
-            # Handle tasks without priority (backward compatibility)
-            if hasattr(task, "priority") and task.priority:
-                stats["by_priority"][task.priority] += 1
-
-            if task.estimated_hours:
-                stats["total_estimated_hours"] += task.estimated_hours
-            if hasattr(task, "actual_hours") and task.actual_hours is not None:
-                stats["total_actual_hours"] += task.actual_hours
-
-            if task.due_date:
-                due_date = (
-                    task.due_date.date()
-                    if hasattr(task.due_date, "date")
-                    else task.due_date
-                )
-                if due_date < today and task.status != TaskStatus.DONE:
-                    stats["overdue"] += 1
-                elif due_date == today:
-                    stats["due_today"] += 1
-                elif week_start <= due_date < week_end:
-                    stats["due_this_week"] += 1
-
-            if task.completed_at:
-                completed_date = (
-                    task.completed_at.date()
-                    if hasattr(task.completed_at, "date")
-                    else task.completed_at
-                )
-                if week_start <= completed_date < week_end:
-                    stats["completed_this_week"] += 1
+        due_date = TaskModel.due_date
+        completed_at = TaskModel.completed_at
+        overdue = and_(due_date < today, TaskModel.status != TaskStatus.DONE)
+        due_today = and_(due_date >= today, due_date < tomorrow)
+
+        # Every figure is aggregated in a single pass over the user's tasks
+        row = (
+            db.query(
+                func.count(),
+                *(
+                    func.count().filter(TaskModel.status == status)
+                    for status in TaskStatus
+                ),
+                *(
+                    func.count().filter(TaskModel.priority == priority)
+                    for priority in TaskPriority
+                ),
+                func.count().filter(overdue),
+                func.count().filter(due_today),
+                func.count().filter(
+                    due_date >= week_start,
+                    due_date < week_end,
+                    not_(overdue),
+                    not_(due_today),
+                ),
+                func.count().filter(
+                    completed_at >= week_start, completed_at < week_end
+                ),
+                func.coalesce(func.sum(TaskModel.estimated_hours), 0.0),
+                func.coalesce(func.sum(TaskModel.actual_hours), 0.0),
+            )
+            .filter(TaskModel.user_id == user_id)
+            .one()
+        )
 
-        return stats
+        values = iter(row)
+        return {
+            "total": next(values),
+            "by_status": {status: next(values) for status in TaskStatus},
+            "by_priority": {priority: next(values) for priority in TaskPriority},
+            "overdue": next(values),
+            "due_today": next(values),
+            "due_this_week": next(values),
+            "completed_this_week": next(values),
+            "total_estimated_hours": float(next(values)),
+            "total_actual_hours": float(next(values)),
+        }
 
     @staticmethod
     def get_overdue_tasks(db: Session, user_id: str) -> List[TaskModel]:
@@ -149,35 +167,41 @@ class TaskService:
         db: Session, user_id: str, task_id: str, new_position: int
     ) -> bool:
         """Update task positions when reordering"""
-        tasks = (
-            db.query(TaskModel)
-            .filter(TaskModel.user_id == user_id)
-            .order_by(TaskModel.position)
-            .all()
+        old_position = (
+            db.query(TaskModel.position)
+            .filter(TaskModel.id == task_id, TaskModel.user_id == user_id)
+            .scalar()
         )
 
-        # Find the task to move
-        task_to_move = None
-        old_position = None
-        for i, task in enumerate(tasks):
-            if task.id == task_id:
-                task_to_move = task
-                old_position = i
-                break
-
-        if not task_to_move:
+        if old_position is None:
             return False
 
-        # Remove from old position
-        tasks.pop(old_position)
-
-        # Insert at new position
-        tasks.insert(new_position, task_to_move)
-
-        # Update positions
-        for i, task in enumerate(tasks):
-            task.position = i
+        if new_position == old_position:
+            return True
 
+        # Only the tasks between the old and new slot shift by one
+        if new_position > old_position:
+            shifted = update(TaskModel).where(
+                TaskModel.user_id == user_id,
+                TaskModel.position > old_position,
+                TaskModel.position <= new_position,
+            )
+            shifted = shifted.values(position=TaskModel.position - 1)
+        else:
+            shifted = update(TaskModel).where(
+                TaskModel.user_id == user_id,
+                TaskModel.position >= new_position,
+                TaskModel.position < old_position,
+            )
+            shifted = shifted.values(position=TaskModel.position + 1)
+
+        db.execute(shifted.execution_options(synchronize_session=False))
+        db.execute(
+            update(TaskModel)
+            .where(TaskModel.id == task_id)
+            .values(position=new_position)
+            .execution_options(synchronize_session=False)
+        )
         db.commit()
         return True
 
@@ -192,7 +216,9 @@ class TaskService:
     ) -> Optional[TaskModel]:
         """Add time log to a task and update actual hours."""
         # Get the task
-        task = TaskService.get_task_by_id(db, task_id, user_id)
+        task = TaskService.get_task_by_id(
+            db, task_id, user_id, required_role=ProjectRole.MEMBER
+        )
         if not task:
             return None
 
@@ -217,27 +243,51 @@ class TaskService:
         return task
 
     @staticmethod
-    def get_task_by_id(db: Session, task_id: str, user_id: str) -> Optional[TaskModel]:
-        """Get a task by ID if user has access to it."""
-        task = db.query(TaskModel).filter(TaskModel.id == task_id).first()
-
-        if not task:
-            return None
-
-        # Check if user has access (owner, assigned, or shared)
-        if task.user_id == user_id:
-            return task
-
-        if task.assigned_to_id == user_id:
-            return task
-
-        # Check if task is shared with user
-        for share in task.shares:
-            if share.shared_with_id == user_id:
-                return task
-
-        # Check if user has access through project
-        if task.project and task.project.has_permission(user_id):
-            return task
+    def get_task_by_id(
+        db: Session,
+        task_id: str,
+        user_id: str,
+        required_role: ProjectRole = ProjectRole.VIEWER,
+    ) -> Optional[TaskModel]:
+        """Get a task by ID if user has access to it.
+
+        Project members need at least required_role: the default lets
+        viewers read the task, write paths pass ProjectRole.MEMBER.
+        """
+        # Owner, assignee, share recipient or project member/owner, checked
+        # in the same query that loads the task
+        roles = PROJECT_ROLE_ORDER[PROJECT_ROLE_ORDER.index(required_role) :]
+        shared = (
+            select(TaskShare.id)
+            .where(TaskShare.task_id == TaskModel.id)
+            .where(TaskShare.shared_with_id == user_id)
+            .exists()
+        )
+        project_owner = (
+            select(Project.id)
+            .where(Project.id == TaskModel.project_id)
+            .where(Project.owner_id == user_id)
+            .exists()
+        )
+        project_member = (
+            select(ProjectMember.id)
+            .where(ProjectMember.project_id == TaskModel.project_id)
+            .where(ProjectMember.user_id == user_id)
+            .where(ProjectMember.role.in_(roles))
+            .exists()
+        )
 
-        return None
+        return (
+            db.query(TaskModel)
+            .filter(
+                TaskModel.id == task_id,
+                or_(
+                    TaskModel.user_id == user_id,
+                    TaskModel.assigned_to_id == user_id,
+                    shared,
+                    project_owner,
+                    project_member,
+                ),
+            )
+            .first()
+        )
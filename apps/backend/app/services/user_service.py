@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
-from jose import jwt
+from jose import jwk, jwt
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
@@ -12,6 +12,11 @@ from app.db.models import User as UserModel
 class UserService:
     """Service layer for user-related business logic"""
 
+    # Built once; jose would otherwise rebuild the key from the raw string
+    # (and try to parse it as a JWK set) on every encode
+    ACCESS_SIGNING_KEY = jwk.construct(settings.SECRET_KEY, settings.ALGORITHM)
+    ACCESS_TOKEN_EXPIRE = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
     @staticmethod
     def get_user_by_email(db: Session, email: str) -> Optional[UserModel]:
         """Get user by email address"""
@@ -38,7 +43,7 @@ class UserService:
     @staticmethod
     def get_recent_users(db: Session, days: int = 7) -> List[UserModel]:
         """Get users created in the last N days"""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
         return db.query(UserModel).filter(UserModel.created_at >= cutoff_date).all()
 
     @staticmethod
@@ -46,20 +51,14 @@ class UserService:
         user_id: str, expires_delta: Optional[timedelta] = None
     ) -> str:
         """Create JWT access token for a user"""
-        to_encode = {"sub": user_id}
-
-        if expires_delta:
-            expire = datetime.now(timezone.utc) + expires_delta
-        else:
-            expire = datetime.now(timezone.utc) + timedelta(
-                minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-            )
-
-        to_encode.update(
-            {"exp": expire, "iat": datetime.now(timezone.utc), "type": "access"}
-        )
+        now = datetime.now(timezone.utc)
+        to_encode = {
+            "sub": user_id,
+            "exp": now + (expires_delta or UserService.ACCESS_TOKEN_EXPIRE),
+            "iat": now,
+            "type": "access",
+        }
 
-        encoded_jwt = jwt.encode(
-            to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
+        return jwt.encode(
+            to_encode, UserService.ACCESS_SIGNING_KEY, algorithm=settings.ALGORITHM
         )
-        return encoded_jwt
@@ -2,19 +2,37 @@
 Service layer for webhook functionality.
 """
 
-import hashlib
-import hmac
-import json
+import atexit
+import uuid
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import httpx
-from sqlalchemy import or_
+import orjson
+from sqlalchemy import and_, exists, func, or_, true, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB, array
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.logging import logger
-from app.db.models import Project, WebhookDelivery, WebhookSubscription
+from app.db.models import (WebhookDelivery, WebhookDeliveryStatus,
+                           WebhookSubscription)
+from app.services.cache_service import cached, invalidate_webhook_cache
+from app.services.project_service import ProjectService
+
+# One client per process so deliveries reuse pooled keep-alive connections
+# instead of paying a TCP/TLS handshake for every webhook
+http_client = httpx.Client(
+    timeout=httpx.Timeout(
+        connect=5.0,  # 5 seconds to connect
+        read=30.0,  # 30 seconds to read response
+        write=10.0,  # 10 seconds to write request
+        pool=10.0,  # 10 seconds to get connection from pool
+    ),
+    limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+)
+atexit.register(http_client.close)
 
 
 class WebhookEvent(str, Enum):
@@ -43,6 +61,52 @@ class WebhookEvent(str, Enum):
     FILE_DELETED = "file.deleted"
 
 
+# Event names a subscription may list
+_VALID_EVENTS = frozenset(e.value for e in WebhookEvent)
+
+
+def _receives_event(db: Session, *event_types: str):
+    """SQL condition matching subscriptions that list an event or "*"."""
+    events = [*event_types, "*"]
+    if db.get_bind().dialect.name == "postgresql":
+        # JSONB ?| operator, answered from the GIN index on events
+        return type_coerce(WebhookSubscription.events, JSONB).has_any(array(events))
+
+    listed = func.json_each(WebhookSubscription.events).table_valued("value")
+    return exists().where(listed.c.value.in_(events))
+
+
+def _active_at(activated_at: Any, timestamp: Optional[str]) -> bool:
+    """Whether a subscription was active when an event was published."""
+    if not timestamp:
+        return True
+    if isinstance(activated_at, str):
+        activated_at = datetime.fromisoformat(activated_at)
+    if activated_at.tzinfo is None:
+        # SQLite hands back naive datetimes; stored values are UTC
+        activated_at = activated_at.replace(tzinfo=timezone.utc)
+    return activated_at <= datetime.fromisoformat(timestamp)
+
+
+def _insert_new_deliveries(db: Session, deliveries: List[Dict[str, Any]]) -> Set[str]:
+    """Insert deliveries and return the ids of the rows actually written.
+
+    Rows whose (subscription_id, event_id) is already recorded are skipped
+    by the database instead of raising.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    stmt = (
+        insert(WebhookDelivery)
+        .on_conflict_do_nothing(index_elements=["subscription_id", "event_id"])
+        .returning(WebhookDelivery.id)
+    )
+    return set(db.scalars(stmt, deliveries).all())
+
+
 class WebhookService:
     """Service for managing webhooks"""
 
@@ -58,22 +122,19 @@ class WebhookService:
     ) -> WebhookSubscription:
         """Create a new webhook subscription."""
         # Validate events
-        valid_events = [e.value for e in WebhookEvent]
-        invalid_events = [e for e in events if e not in valid_events]
+        invalid_events = [e for e in events if e not in _VALID_EVENTS]
         if invalid_events:
             raise ValueError(f"Invalid events: {invalid_events}")
 
         # Verify project access if project_id provided
-        if project_id:
-            project = db.query(Project).filter(Project.id == project_id).first()
-            if not project or not project.has_permission(user_id):
-                raise ValueError("Invalid project or no access")
+        if project_id and not ProjectService.user_has_access(db, user_id, project_id):
+            raise ValueError("Invalid project or no access")
 
         subscription = WebhookSubscription(
             user_id=user_id,
             name=name,
             url=url,
-            events=json.dumps(events),
+            events=events,
             secret=secret,
             project_id=project_id,
         )
@@ -81,6 +142,7 @@ class WebhookService:
         db.add(subscription)
         db.commit()
         db.refresh(subscription)
+        invalidate_webhook_cache(user_id)
 
         logger.info(
             f"Created webhook subscription {subscription.id} for user {user_id}"
@@ -130,16 +192,19 @@ class WebhookService:
             subscription.url = url
         if events is not None:
             # Validate events
-            valid_events = [e.value for e in WebhookEvent]
-            invalid_events = [e for e in events if e not in valid_events]
+            invalid_events = [e for e in events if e not in _VALID_EVENTS]
             if invalid_events:
                 raise ValueError(f"Invalid events: {invalid_events}")
-            subscription.events = json.dumps(events)
+            subscription.events = events
         if is_active is not None:
+            if is_active and not subscription.is_active:
+                # A reactivated subscription only receives new events
+                subscription.activated_at = datetime.now(timezone.utc)
             subscription.is_active = is_active
 
         db.commit()
         db.refresh(subscription)
+        invalidate_webhook_cache(user_id)
         return subscription
 
     @staticmethod
@@ -159,22 +224,31 @@ class WebhookService:
 
         db.delete(subscription)
         db.commit()
+        invalidate_webhook_cache(user_id)
 
         logger.info(f"Deleted webhook subscription {subscription_id}")
         return True
 
     @staticmethod
-    def trigger_webhook(
+    @cached(
+        prefix=settings.CACHE_PREFIX_WEBHOOKS,
+        ttl=300,  # Cache for 5 minutes, subscription writes invalidate it
+        key_func=lambda db, event_type, user_id=None, project_id=None: (
+            f"user:{user_id or 'any'}:project:{project_id or 'any'}:{event_type}"
+        ),
+    )
+    def get_event_subscriptions(
         db: Session,
-        event_type: WebhookEvent,
-        payload: Dict[str, Any],
+        event_type: str,
         user_id: Optional[str] = None,
         project_id: Optional[str] = None,
-    ):
-        """Trigger webhooks for an event."""
-        # Find relevant subscriptions
-        query = db.query(WebhookSubscription).filter(
-            WebhookSubscription.is_active == True
+    ) -> List[Tuple[str, str]]:
+        """Get (id, activated_at) of the active subscriptions receiving an event."""
+        query = db.query(
+            WebhookSubscription.id, WebhookSubscription.activated_at
+        ).filter(
+            WebhookSubscription.is_active == True,
+            _receives_event(db, event_type),
         )
 
         if user_id:
@@ -189,156 +263,291 @@ class WebhookService:
                 )
             )
 
-        subscriptions = query.all()
+        # Timestamps as ISO text so the cached value stays plain JSON
+        return [
+            (subscription_id, activated_at.isoformat())
+            for subscription_id, activated_at in query.all()
+        ]
 
-        # Filter subscriptions that include this event
-        relevant_subscriptions = []
-        for sub in subscriptions:
-            sub_events = json.loads(sub.events)
-            if event_type.value in sub_events or "*" in sub_events:
-                relevant_subscriptions.append(sub)
+    @staticmethod
+    def trigger_webhook(
+        db: Session,
+        event_type: WebhookEvent,
+        payload: Dict[str, Any],
+        user_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+    ):
+        """Trigger webhooks for an event.
 
-        # Queue webhook deliveries as background tasks
-        from app.tasks.webhooks import deliver_webhook
+        Publishes the event with a single broker message; a webhooks worker
+        resolves its subscriptions and records the deliveries.
+        """
+        from app.tasks.webhooks import broadcast_webhook_event
 
-        for subscription in relevant_subscriptions:
-            # Prepare webhook payload
-            webhook_payload = {
-                "event": event_type.value,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "data": payload,
-            }
+        broadcast_webhook_event.delay(
+            event_type.value,
+            payload,
+            user_id=user_id,
+            project_id=project_id,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            event_id=str(uuid.uuid4()),
+        )
 
-            deliver_webhook.delay(subscription.id, event_type.value, webhook_payload)
+        logger.info(f"Published webhook event {event_type.value}")
 
-        logger.info(
-            f"Queued {len(relevant_subscriptions)} webhook deliveries for event {event_type.value}"
+    @staticmethod
+    def trigger_many(db: Session, events: List[Dict[str, Any]]):
+        """Trigger webhooks for several events at once.
+
+        Each event is a dict of trigger_webhook arguments (event_type, payload
+        and optionally user_id and project_id). The whole batch is published
+        as one broker message and resolved by record_event_deliveries.
+        """
+        if not events:
+            return
+
+        from app.tasks.webhooks import broadcast_webhook_events
+
+        timestamp = datetime.now(timezone.utc).isoformat()
+        broadcast_webhook_events.delay(
+            [
+                {
+                    "event_type": event["event_type"].value,
+                    "payload": event["payload"],
+                    "user_id": event.get("user_id"),
+                    "project_id": event.get("project_id"),
+                    "timestamp": timestamp,
+                    "event_id": str(uuid.uuid4()),
+                }
+                for event in events
+            ]
         )
 
-    @staticmethod
-    def _deliver_webhook(
-        db: Session,
-        subscription: WebhookSubscription,
-        event_type: str,
-        payload: Dict[str, Any],
-    ):
-        """Deliver a webhook to a subscription."""
-        # Prepare webhook payload
-        webhook_payload = {
-            "event": event_type,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "data": payload,
-        }
+        logger.info(f"Published {len(events)} webhook events")
 
-        # Create delivery record
-        delivery = WebhookDelivery(
-            subscription_id=subscription.id,
-            event_type=event_type,
-            payload=json.dumps(webhook_payload),
+    @staticmethod
+    def record_event_deliveries(db: Session, events: List[Dict[str, Any]]) -> int:
+        """Record pending deliveries for published events and queue their sends.
+
+        Each event is a dict with event_type (a string), payload, and optional
+        user_id, project_id, timestamp and event_id. A single event is
+        resolved through the cached subscription lookup; a batch loads the
+        subscriptions of all its events with one query and matches them in
+        memory. Subscriptions activated after an event's timestamp do not
+        receive it, and an event_id is recorded at most once per
+        subscription, so a redelivered message sends nothing twice. Returns
+        the number of deliveries queued.
+        """
+        if not events:
+            return 0
+
+        if len(events) == 1:
+            event = events[0]
+            subscriptions = WebhookService.get_event_subscriptions(
+                db,
+                event["event_type"],
+                event.get("user_id"),
+                event.get("project_id"),
+            )
+            batches = [
+                (
+                    event,
+                    [
+                        subscription_id
+                        for subscription_id, activated_at in subscriptions
+                        if _active_at(activated_at, event.get("timestamp"))
+                    ],
+                )
+            ]
+            return WebhookService._queue_deliveries(db, batches)
+
+        scopes = []
+        for user_id, project_id in {
+            (event.get("user_id"), event.get("project_id")) for event in events
+        }:
+            conditions = [true()]
+            if user_id:
+                conditions.append(WebhookSubscription.user_id == user_id)
+            if project_id:
+                conditions.append(
+                    or_(
+                        WebhookSubscription.project_id == project_id,
+                        WebhookSubscription.project_id.is_(None),
+                    )
+                )
+            scopes.append(and_(*conditions))
+
+        subscriptions = (
+            db.query(
+                WebhookSubscription.id,
+                WebhookSubscription.user_id,
+                WebhookSubscription.project_id,
+                WebhookSubscription.events,
+                WebhookSubscription.activated_at,
+            )
+            .filter(
+                WebhookSubscription.is_active == True,
+                _receives_event(db, *{event["event_type"] for event in events}),
+                or_(*scopes),
+            )
+            .all()
         )
 
-        try:
-            # Prepare headers
-            headers = {
-                "Content-Type": "application/json",
-                "User-Agent": "TaskManager-Webhook/1.0",
-            }
-
-            # Add HMAC signature if secret is configured
-            if subscription.secret:
-                payload_bytes = json.dumps(webhook_payload).encode("utf-8")
-                signature = hmac.new(
-                    subscription.secret.encode("utf-8"), payload_bytes, hashlib.sha256
-                ).hexdigest()
-                headers["X-Webhook-Signature"] = f"sha256={signature}"
-
-            # Send webhook
-            with httpx.Client(timeout=30.0) as client:
-                response = client.post(
-                    subscription.url, json=webhook_payload, headers=headers
+        # Each subscription's event list becomes a set once per batch, not
+        # a list scan per event
+        subscribed_events = {
+            subscription.id: frozenset(subscription.events)
+            for subscription in subscriptions
+        }
+
+        batches = []
+        for event in events:
+            event_type = event["event_type"]
+            user_id = event.get("user_id")
+            project_id = event.get("project_id")
+            subscription_ids = [
+                subscription.id
+                for subscription in subscriptions
+                if (not user_id or subscription.user_id == user_id)
+                and (not project_id or subscription.project_id in (project_id, None))
+                and not subscribed_events[subscription.id].isdisjoint(
+                    (event_type, "*")
                 )
+                and _active_at(subscription.activated_at, event.get("timestamp"))
+            ]
+            batches.append((event, subscription_ids))
 
-            delivery.status_code = response.status_code
-            delivery.response = response.text[:1000]  # Store first 1000 chars
+        return WebhookService._queue_deliveries(db, batches)
 
-            if response.status_code >= 400:
-                delivery.error = f"HTTP {response.status_code}"
-                if delivery.retry_count < 3:
-                    # Schedule retry
-                    delivery.next_retry_at = datetime.now(timezone.utc) + timedelta(
-                        minutes=5 * (delivery.retry_count + 1)
+    @staticmethod
+    def _queue_deliveries(
+        db: Session, batches: List[Tuple[Dict[str, Any], List[str]]]
+    ) -> int:
+        """Record pending deliveries and queue one fan-out task per event."""
+        # Record every delivery with one batched INSERT and one commit;
+        # the tasks only update the rows with their outcome
+        deliveries = []
+        fanouts = []
+        for event, subscription_ids in batches:
+            event_type = event["event_type"]
+            if subscription_ids:
+                webhook_payload = {
+                    "event": event_type,
+                    "timestamp": event.get("timestamp")
+                    or datetime.now(timezone.utc).isoformat(),
+                    "data": event["payload"],
+                }
+                stored_payload = orjson.dumps(webhook_payload, default=str).decode(
+                    "utf-8"
+                )
+                event_deliveries = [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "subscription_id": subscription_id,
+                        "event_type": event_type,
+                        "event_id": event.get("event_id"),
+                        "payload": stored_payload,
+                        "status": WebhookDeliveryStatus.PENDING,
+                        "retry_count": 0,
+                    }
+                    for subscription_id in subscription_ids
+                ]
+                deliveries.extend(event_deliveries)
+                fanouts.append(
+                    (
+                        [delivery["id"] for delivery in event_deliveries],
+                        event_type,
+                        webhook_payload,
                     )
+                )
 
-            logger.info(
-                f"Delivered webhook to {subscription.url}: {response.status_code}"
-            )
+        if not deliveries:
+            return 0
 
-        except Exception as e:
-            delivery.error = str(e)
-            delivery.retry_count += 1
+        # One background task fans each event out to its subscriptions
+        from app.tasks.webhooks import deliver_webhook_event
 
-            if delivery.retry_count < 3:
-                # Schedule retry with exponential backoff
-                delivery.next_retry_at = datetime.now(timezone.utc) + timedelta(
-                    minutes=5 * delivery.retry_count
-                )
+        inserted = _insert_new_deliveries(db, deliveries)
+        db.commit()
 
-            logger.error(f"Failed to deliver webhook to {subscription.url}: {e}")
+        for delivery_ids, event_type, webhook_payload in fanouts:
+            delivery_ids = [
+                delivery_id for delivery_id in delivery_ids if delivery_id in inserted
+            ]
+            logger.info(
+                f"Queued {len(delivery_ids)} webhook deliveries for event {event_type}"
+            )
+            if delivery_ids:
+                deliver_webhook_event.delay(delivery_ids, event_type, webhook_payload)
 
-        db.add(delivery)
-        db.commit()
+        return len(inserted)
 
     @staticmethod
-    def get_delivery_history(
-        db: Session, subscription_id: str, user_id: str, limit: int = 100
-    ) -> List[WebhookDelivery]:
-        """Get webhook delivery history for a subscription."""
-        # Verify ownership
-        subscription = (
-            db.query(WebhookSubscription)
+    def get_delivery_by_id(
+        db: Session, delivery_id: str, user_id: str
+    ) -> Optional[WebhookDelivery]:
+        """Get a single webhook delivery by ID.
+
+        Primary-key lookup for callers that already know the delivery; use
+        get_delivery_history to list the deliveries of a subscription.
+        """
+        return (
+            db.query(WebhookDelivery)
+            .join(WebhookDelivery.subscription)
             .filter(
-                WebhookSubscription.id == subscription_id,
+                WebhookDelivery.id == delivery_id,
                 WebhookSubscription.user_id == user_id,
             )
             .first()
         )
 
-        if not subscription:
-            return []
+    @staticmethod
+    def get_delivery_history(
+        db: Session, subscription_id: str, user_id: str, limit: int = 100
+    ) -> List[WebhookDelivery]:
+        """Get webhook delivery history for a subscription.
 
+        Newest first, read in order from the (subscription_id, delivered_at)
+        index; use get_delivery_by_id to fetch one known delivery.
+        """
+        # Ownership is checked in the same query
         return (
             db.query(WebhookDelivery)
-            .filter(WebhookDelivery.subscription_id == subscription_id)
+            .join(WebhookDelivery.subscription)
+            .filter(
+                WebhookDelivery.subscription_id == subscription_id,
+                WebhookSubscription.user_id == user_id,
+            )
             .order_by(WebhookDelivery.delivered_at.desc())
             .limit(limit)
             .all()
         )
 
     @staticmethod
-    def retry_failed_deliveries(db: Session):
-        """Retry failed webhook deliveries - Now handled by Celery periodic task."""
-        # This method is replaced by the Celery periodic task
-        # app.tasks.webhooks.retry_failed_webhooks
-        logger.warning(
-            "retry_failed_deliveries called directly - this should be handled by Celery periodic task"
-        )
-
-        # For backward compatibility, we can queue the Celery task
-        from app.core.celery_app import celery_app
-
-        celery_app.send_task("app.tasks.webhooks.retry_failed_webhooks")
-        logger.info("Queued webhook retry task")
-
-    @staticmethod
-    def cleanup_old_deliveries(db: Session, days: int = 30):
+    def cleanup_old_deliveries(db: Session, days: int = 30, batch_size: int = 5000):
         """Clean up old webhook deliveries."""
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
 
-        deleted = (
-            db.query(WebhookDelivery)
-            .filter(WebhookDelivery.delivered_at < cutoff_date)
-            .delete()
-        )
+        # Deleted in bounded batches, each its own short transaction, so a
+        # large backlog never holds locks or WAL for one giant DELETE
+        deleted = 0
+        while True:
+            delivery_ids = [
+                delivery_id
+                for (delivery_id,) in db.query(WebhookDelivery.id)
+                .filter(WebhookDelivery.delivered_at < cutoff_date)
+                .limit(batch_size)
+                .all()
+            ]
+            if not delivery_ids:
+                break
+
+            deleted += (
+                db.query(WebhookDelivery)
+                .filter(WebhookDelivery.id.in_(delivery_ids))
+                .delete(synchronize_session=False)
+            )
+            db.commit()
 
-        db.commit()
         logger.info(f"Cleaned up {deleted} old webhook deliveries")
+        return deleted
@@ -2,9 +2,17 @@
 Background tasks for logging task activities asynchronously.
 """
 
+import atexit
 import logging
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+from sqlalchemy.orm import load_only
 
 from app.core.celery_app import celery_app
 from app.core.config import settings
@@ -16,8 +24,28 @@ from app.services.activity_service import ActivityService
 
 logger = logging.getLogger(__name__)
 
+# Activities queued within this window, or until the batch is full, reach
+# the broker as one message and the database as one transaction
+ACTIVITY_FLUSH_INTERVAL = 0.05  # seconds
+ACTIVITY_BATCH_SIZE = 100
 
-@celery_app.task(bind=True, queue="default")
+# Enum members by value, so broker strings resolve with one dict lookup
+_ACTIVITY_TYPES = {member.value: member for member in ActivityType}
+
+# Request handlers only put into the buffer; one background thread per
+# process drains it and talks to the broker
+_pending_activities: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+_flusher_lock = threading.Lock()
+_flusher: Optional[threading.Thread] = None
+
+# Last activity queued per (kind, task), to drop identical repeats such as
+# double clicks and autosaves within settings.ACTIVITY_DEDUP_WINDOW_MS
+ACTIVITY_DEDUP_SIZE = 4096
+_recent_activities: "OrderedDict[Tuple[str, str], Tuple[bytes, float]]" = OrderedDict()
+_recent_lock = threading.Lock()
+
+
+@celery_app.task(bind=True, queue="activities", ignore_result=True)
 def log_activity_async(
     self,
     task_id: str,
@@ -37,7 +65,7 @@ def log_activity_async(
     try:
         with get_celery_db() as db:
             # Convert string activity_type back to enum
-            activity_type_enum = ActivityType(activity_type)
+            activity_type_enum = _ACTIVITY_TYPES[activity_type]
 
             activity = ActivityService.log_activity(
                 db=db,
@@ -52,580 +80,598 @@ def log_activity_async(
             )
 
             logger.info(
-                f"Successfully logged activity {activity_type} for task {task_id}"
+                "Successfully logged activity %s for task %s", activity_type, task_id
             )
             return {"success": True, "activity_id": activity.id}
 
     except Exception as e:
         logger.error(
-            f"Failed to log activity {activity_type} for task {task_id}: {str(e)}"
+            "Failed to log activity %s for task %s: %s", activity_type, task_id, e
         )
         raise self.retry(countdown=60, max_retries=3)
 
 
-@celery_app.task(bind=True, queue="default")
-def log_task_created_async(
-    self,
-    task_id: str,
-    user_id: str,
-    task_data: Dict[str, Any],
-    ip_address: Optional[str] = None,
-    user_agent: Optional[str] = None,
+def _log_activity(db, activity_type: str, **kwargs):
+    """Log a generic activity whose type was sent as its string value."""
+    return ActivityService.log_activity(
+        db=db, activity_type=_ACTIVITY_TYPES[activity_type], **kwargs
+    )
+
+
+def _log_task_update(db, task_id: str, user_id: str, changes: List[Dict[str, Any]]):
+    """Log every field change of one task edit, one activity per change."""
+    for change in changes:
+        _METHOD_MAP[change["kind"]](
+            db=db, task_id=task_id, user_id=user_id, **change["payload"]
+        )
+
+
+# Activity kinds accepted by log_activity_dispatch
+_METHOD_MAP = {
+    "activity": _log_activity,
+    "task_created": ActivityService.log_task_created,
+    "status_change": ActivityService.log_status_change,
+    "priority_change": ActivityService.log_priority_change,
+    "assignment_change": ActivityService.log_assignment_change,
+    "due_date_change": ActivityService.log_due_date_change,
+    "title_change": ActivityService.log_title_change,
+    "description_change": ActivityService.log_description_change,
+    "comment_added": ActivityService.log_comment_added,
+    "attachment_added": ActivityService.log_attachment_added,
+    "time_logged": ActivityService.log_time_logged,
+    "subtask_added": ActivityService.log_subtask_added,
+    "task_completed": ActivityService.log_task_completed,
+    "task_shared": ActivityService.log_task_shared,
+    "task_update": _log_task_update,
+}
+
+
+def _insert_activities(db, activities: List[Dict[str, Any]]) -> int:
+    """
+    Validate buffered activity entries and insert their rows at once.
+
+    Entries that fail validation are logged and skipped. Row ids are derived
+    from each entry's activity_id, so a message redelivered after a lost
+    commit writes the same primary keys and the database skips them.
+
+    Returns:
+        Number of rows actually inserted
+    """
+    # Load every referenced task and user with one IN query each, so the
+    # per-row existence checks are answered by the identity map. The list
+    # keeps the (weakly referenced) objects alive meanwhile.
+    task_ids = {entry["payload"]["task_id"] for entry in activities}
+    user_ids = {entry["payload"].get("user_id") for entry in activities}
+    user_ids.discard(None)
+    prefetched = [
+        *db.query(TaskModel)
+        .options(load_only(TaskModel.id))
+        .filter(TaskModel.id.in_(task_ids)),
+        *db.query(User).options(load_only(User.id)).filter(User.id.in_(user_ids)),
+    ]
+
+    # Staging only lasts for this batch; later log_activity calls on the
+    # same session write their rows as usual
+    staged: List[TaskActivity] = []
+    db.info["activity_batch"] = staged
+    try:
+        for entry in activities:
+            first = len(staged)
+            try:
+                _METHOD_MAP[entry["kind"]](db=db, **entry["payload"])
+            except Exception as e:
+                logger.error("Failed to log bulk activity: %s", e)
+                continue
+
+            if entry.get("activity_id"):
+                entry_uuid = uuid.UUID(entry["activity_id"])
+                for n, activity in enumerate(staged[first:]):
+                    activity.id = str(uuid.uuid5(entry_uuid, str(n)))
+    finally:
+        db.info.pop("activity_batch", None)
+    del prefetched
+
+    if not staged:
+        return 0
+
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    stmt = (
+        insert(TaskActivity)
+        .on_conflict_do_nothing(index_elements=["id"])
+        .returning(TaskActivity.id)
+    )
+    rows = [
+        {
+            column.key: getattr(activity, column.key)
+            for column in TaskActivity.__table__.columns
+        }
+        for activity in staged
+    ]
+    return len(db.scalars(stmt, rows).all())
+
+
+@celery_app.task(bind=True, queue="activities", ignore_result=True)
+def log_activity_dispatch(
+    self, kind: str, payload: Dict[str, Any], activity_id: Optional[str] = None
 ):
-    """Log task creation activity asynchronously."""
+    """
+    Log one activity of a given kind asynchronously.
+
+    Single task behind the queue_*_log helpers: the kind selects the
+    ActivityService.log_* method and the payload holds its arguments.
+    """
+    task_id = payload.get("task_id")
     try:
         with get_celery_db() as db:
-            activity = ActivityService.log_task_created(
-                db=db,
-                task_id=task_id,
-                user_id=user_id,
-                task_data=task_data,
-                ip_address=ip_address,
-                user_agent=user_agent,
+            count = _insert_activities(
+                db, [{"kind": kind, "payload": payload, "activity_id": activity_id}]
             )
 
-            logger.info(f"Successfully logged task creation for task {task_id}")
-            return {"success": True, "activity_id": activity.id}
+            logger.info("Successfully logged %s for task %s", kind, task_id)
+            return {"success": True, "count": count}
 
     except Exception as e:
-        logger.error(f"Failed to log task creation for task {task_id}: {str(e)}")
+        logger.error("Failed to log %s for task %s: %s", kind, task_id, e)
         raise self.retry(countdown=60, max_retries=3)
 
 
-@celery_app.task(bind=True, queue="default")
-def log_status_change_async(
-    self,
-    task_id: str,
-    user_id: str,
-    old_status: str,
-    new_status: str,
-    ip_address: Optional[str] = None,
-    user_agent: Optional[str] = None,
-):
-    """Log task status change activity asynchronously."""
+@celery_app.task(bind=True, queue="activities", ignore_result=True)
+def log_bulk_activities_async(self, activities: List[Dict[str, Any]]):
+    """
+    Log a batch of activities with a single multi-row INSERT.
+
+    Each entry is a {"kind", "payload", "activity_id"} dict as taken by
+    log_activity_dispatch.
+    """
     try:
         with get_celery_db() as db:
-            activity = ActivityService.log_status_change(
-                db=db,
-                task_id=task_id,
-                user_id=user_id,
-                old_status=old_status,
-                new_status=new_status,
-                ip_address=ip_address,
-                user_agent=user_agent,
-            )
+            count = _insert_activities(db, activities)
 
             logger.info(
-                f"Successfully logged status change for task {task_id}: {old_status} -> {new_status}"
+                "Processed %d bulk activities, %d successful", len(activities), count
             )
-            return {"success": True, "activity_id": activity.id}
+            return {"success": True, "count": count}
 
     except Exception as e:
-        logger.error(f"Failed to log status change for task {task_id}: {str(e)}")
+        logger.error("Failed to process bulk activities: %s", e)
         raise self.retry(countdown=60, max_retries=3)
 
 
 @celery_app.task(bind=True, queue="default")
-def log_priority_change_async(
-    self,
-    task_id: str,
-    user_id: str,
-    old_priority: str,
-    new_priority: str,
-    ip_address: Optional[str] = None,
-    user_agent: Optional[str] = None,
-):
-    """Log task priority change activity asynchronously."""
+def cleanup_old_activities_async(self, days: int = 365):
+    """Clean up old activity records asynchronously."""
     try:
         with get_celery_db() as db:
-            activity = ActivityService.log_priority_change(
-                db=db,
-                task_id=task_id,
-                user_id=user_id,
-                old_priority=old_priority,
-                new_priority=new_priority,
-                ip_address=ip_address,
-                user_agent=user_agent,
-            )
+            deleted_count = ActivityService.cleanup_old_activities(db, days)
 
             logger.info(
-                f"Successfully logged priority change for task {task_id}: {old_priority} -> {new_priority}"
+                "Successfully cleaned up %d old activity records", deleted_count
             )
-            return {"success": True, "activity_id": activity.id}
+            return {"success": True, "deleted_count": deleted_count}
 
     except Exception as e:
-        logger.error(f"Failed to log priority change for task {task_id}: {str(e)}")
-        raise self.retry(countdown=60, max_retries=3)
+        logger.error("Failed to cleanup old activities: %s", e)
+        raise self.retry(countdown=300, max_retries=3)
 
 
-@celery_app.task(bind=True, queue="default")
-def log_assignment_change_async(
-    self,
+# Convenience functions for easier task queuing
+
+
+def _send_activities(activities: List[Dict[str, Any]]):
+    """Publish a batch of buffered activities as one broker message."""
+    if len(activities) == 1:
+        log_activity_dispatch.delay(**activities[0])
+    else:
+        log_bulk_activities_async.delay(activities=activities)
+
+
+def _take_pending(limit: int) -> List[Dict[str, Any]]:
+    """Take up to limit buffered activities without waiting."""
+    activities = []
+    while len(activities) < limit:
+        try:
+            activities.append(_pending_activities.get_nowait())
+        except queue.Empty:
+            break
+    return activities
+
+
+def flush_activity_logs():
+    """Send the buffered activities to the broker now."""
+    while activities := _take_pending(ACTIVITY_BATCH_SIZE):
+        _send_activities(activities)
+
+
+# Whatever is still buffered goes out before the process exits
+atexit.register(flush_activity_logs)
+
+
+def _run_flusher():
+    """Send one batch per flush window, or sooner once the batch is full."""
+    while True:
+        activities = [_pending_activities.get()]
+        deadline = time.monotonic() + ACTIVITY_FLUSH_INTERVAL
+        while len(activities) < ACTIVITY_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                activities.append(_pending_activities.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        try:
+            _send_activities(activities)
+        except Exception as e:
+            logger.error("Failed to queue %d activity logs: %s", len(activities), e)
+
+
+def _is_repeat(kind: str, payload: Dict[str, Any]) -> bool:
+    """
+    Tell whether the same activity was just queued for the same task.
+
+    Only the latest activity of each kind per task is compared, so a value
+    toggled back and forth still logs every change.
+    """
+    window = settings.ACTIVITY_DEDUP_WINDOW_MS / 1000
+    if window <= 0:
+        return False
+
+    key = (kind, payload["task_id"])
+    body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    now = time.monotonic()
+    with _recent_lock:
+        last = _recent_activities.get(key)
+        _recent_activities[key] = (body, now)
+        _recent_activities.move_to_end(key)
+        if len(_recent_activities) > ACTIVITY_DEDUP_SIZE:
+            _recent_activities.popitem(last=False)
+
+    return last is not None and last[0] == body and now - last[1] < window
+
+
+def _buffer_activity(kind: str, payload: Dict[str, Any]):
+    """Buffer an activity for the background flusher."""
+    global _flusher
+    if _is_repeat(kind, payload):
+        return
+
+    _pending_activities.put(
+        {"kind": kind, "payload": payload, "activity_id": str(uuid.uuid4())}
+    )
+
+    # Threads do not survive a fork, so a dead flusher is started again
+    if _flusher is None or not _flusher.is_alive():
+        with _flusher_lock:
+            if _flusher is None or not _flusher.is_alive():
+                _flusher = threading.Thread(
+                    target=_run_flusher, name="activity-log-flusher", daemon=True
+                )
+                _flusher.start()
+
+
+def queue_activity_log(
     task_id: str,
-    user_id: str,
-    old_assignee_id: Optional[str],
-    new_assignee_id: Optional[str],
+    user_id: Optional[str],
+    activity_type: ActivityType,
+    details: Optional[Dict[str, Any]] = None,
+    old_value: Optional[str] = None,
+    new_value: Optional[str] = None,
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
 ):
-    """Log task assignment change activity asynchronously."""
-    try:
-        with get_celery_db() as db:
-            activity = ActivityService.log_assignment_change(
-                db=db,
-                task_id=task_id,
-                user_id=user_id,
-                old_assignee_id=old_assignee_id,
-                new_assignee_id=new_assignee_id,
-                ip_address=ip_address,
-                user_agent=user_agent,
-            )
-
-            logger.info(f"Successfully logged assignment change for task {task_id}")
-            return {"success": True, "activity_id": activity.id}
-
-    except Exception as e:
-        logger.error(f"Failed to log assignment change for task {task_id}: {str(e)}")
-        raise self.retry(countdown=60, max_retries=3)
+    """Queue an activity log task asynchronously."""
+    _buffer_activity(
+        "activity",
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "activity_type": activity_type.value,
+            "details": details,
+            "old_value": old_value,
+            "new_value": new_value,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        },
+    )
 
 
-@celery_app.task(bind=True, queue="default")
-def log_due_date_change_async(
-    self,
+def queue_task_creation_log(
     task_id: str,
     user_id: str,
-    old_due_date: Optional[str],  # ISO format string
-    new_due_date: Optional[str],  # ISO format string
+    task_data: Dict[str, Any],
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
 ):
-    """Log task due date change activity asynchronously."""
-    try:
-        with get_celery_db() as db:
-            # Convert ISO strings back to datetime objects
-            old_dt = (
-                datetime.fromisoformat(old_due_date.replace("Z", "+00:00"))
-                if old_due_date
-                else None
-            )
-            new_dt = (
-                datetime.fromisoformat(new_due_date.replace("Z", "+00:00"))
-                if new_due_date
-                else None
-            )
-
-            activity = ActivityService.log_due_date_change(
-                db=db,
-                task_id=task_id,
-                user_id=user_id,
-                old_due_date=old_dt,
-                new_due_date=new_dt,
-                ip_address=ip_address,
-                user_agent=user_agent,
-            )
-
-            logger.info(f"Successfully logged due date change for task {task_id}")
-            return {"success": True, "activity_id": activity.id}
-
-    except Exception as e:
-        logger.error(f"Failed to log due date change for task {task_id}: {str(e)}")
-        raise self.retry(countdown=60, max_retries=3)
+    """Queue a task creation activity log task."""
+    _buffer_activity(
+        "task_created",
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "task_data": task_data,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        },
+    )
 
 
-@celery_app.task(bind=True, queue="default")
-def log_title_change_async(
-    self,
+def queue_status_change_log(
     task_id: str,
     user_id: str,
-    old_title: str,
-    new_title: str,
+    old_status: str,
+    new_status: str,
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
 ):
-    """Log task title change activity asynchronously."""
-    try:
-        with get_celery_db() as db:
-            activity = ActivityService.log_title_change(
-                db=db,
-                task_id=task_id,
-                user_id=user_id,
-                old_title=old_title,
-                new_title=new_title,
-                ip_address=ip_address,
-                user_agent=user_agent,
-            )
-
-            logger.info(f"Successfully logged title change for task {task_id}")
-            return {"success": True, "activity_id": activity.id}
-
-    except Exception as e:
-        logger.error(f"Failed to log title change for task {task_id}: {str(e)}")
-        raise self.retry(countdown=60, max_retries=3)
+    """Queue a status change activity log task."""
+    _buffer_activity(
+        "status_change",
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "old_status": old_status,
+            "new_status": new_status,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        },
+    )
 
 
-@celery_app.task(bind=True, queue="default")
-def log_description_change_async(
-    self,
+def queue_priority_change_log(
     task_id: str,
     user_id: str,
-    old_description: Optional[str],
-    new_description: Optional[str],
+    old_priority: str,
+    new_priority: str,
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
 ):
-    """Log task description change activity asynchronously."""
-    try:
-        with get_celery_db() as db:
-            activity = ActivityService.log_description_change(
-                db=db,
-                task_id=task_id,
-                user_id=user_id,
-                old_description=old_description,
-                new_description=new_description,
-                ip_address=ip_address,
-                user_agent=user_agent,
-            )
-
-            logger.info(f"Successfully logged description change for task {task_id}")
-            return {"success": True, "activity_id": activity.id}
-
-    except Exception as e:
-        logger.error(f"Failed to log description change for task {task_id}: {str(e)}")
-        raise self.retry(countdown=60, max_retries=3)
+    """Queue a priority change activity log task."""
+    _buffer_activity(
+        "priority_change",
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "old_priority": old_priority,
+            "new_priority": new_priority,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        },
+    )
 
 
-@celery_app.task(bind=True, queue="default")
-def log_comment_added_async(
-    self,
+def queue_assignment_change_log(
     task_id: str,
     user_id: str,
-    comment_id: str,
-    comment_content: str,
+    old_assignee_id: Optional[str],
+    new_assignee_id: Optional[str],
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
 ):
-    """Log comment addition activity asynchronously."""
-    print(
-        f"[CELERY TASK] Starting log_comment_added_async for task {task_id}, user {user_id}, comment {comment_id}"
+    """Queue an assignment change activity log task."""
+    _buffer_activity(
+        "assignment_change",
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "old_assignee_id": old_assignee_id,
+            "new_assignee_id": new_assignee_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        },
     )
-    logger.info(
-        f"Starting log_comment_added_async for task {task_id}, user {user_id}, comment {comment_id}"
-    )
-
-    try:
-        print(f"[CELERY TASK] Getting database session...")
-        with get_celery_db() as db:
-            logger.info(f"Got database session for task {task_id}")
-            print(f"[CELERY TASK] Got database session for task {task_id}")
-
-            activity = ActivityService.log_comment_added(
-                db=db,
-                task_id=task_id,
-                user_id=user_id,
-                comment_id=comment_id,
-                comment_content=comment_content,
-                ip_address=ip_address,
-                user_agent=user_agent,
-            )
-
-            logger.info(
-                f"ActivityService.log_comment_added returned activity {activity.id} for task {task_id}"
-            )
-            print(
-                f"[CELERY TASK] ActivityService.log_comment_added returned activity {activity.id}"
-            )
-
-            # Note: get_celery_db() automatically commits on successful completion
-            logger.info(
-                f"Transaction will be committed by context manager for activity {activity.id}"
-            )
-            print(
-                f"[CELERY TASK] Transaction will be committed by context manager for activity {activity.id}"
-            )
-
-        logger.info(
-            f"Successfully logged comment addition for task {task_id}, activity_id: {activity.id}"
-        )
-        print(
-            f"[CELERY TASK] SUCCESS! Logged comment addition for task {task_id}, activity_id: {activity.id}"
-        )
-        return {"success": True, "activity_id": activity.id}
-
-    except Exception as e:
-        logger.error(
-            f"Failed to log comment addition for task {task_id}: {str(e)}",
-            exc_info=True,
-        )
-        print(f"[CELERY TASK] ERROR! Failed to log comment addition: {str(e)}")
-        raise self.retry(countdown=60, max_retries=3)
 
 
-@celery_app.task(bind=True, queue="default")
-def log_attachment_added_async(
-    self,
+def queue_due_date_change_log(
     task_id: str,
     user_id: str,
-    attachment_id: str,
-    filename: str,
-    file_size: int,
+    old_due_date: Optional[str],  # ISO format string
+    new_due_date: Optional[str],  # ISO format string
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
 ):
-    """Log file attachment activity asynchronously."""
-    try:
-        with get_celery_db() as db:
-            activity = ActivityService.log_attachment_added(
-                db=db,
-                task_id=task_id,
-                user_id=user_id,
-                attachment_id=attachment_id,
-                filename=filename,
-                file_size=file_size,
-                ip_address=ip_address,
-                user_agent=user_agent,
-            )
-
-            logger.info(f"Successfully logged attachment addition for task {task_id}")
-            return {"success": True, "activity_id": activity.id}
-
-    except Exception as e:
-        logger.error(f"Failed to log attachment addition for task {task_id}: {str(e)}")
-        raise self.retry(countdown=60, max_retries=3)
+    """Queue a due date change activity log task."""
+    _buffer_activity(
+        "due_date_change",
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "old_due_date": old_due_date,
+            "new_due_date": new_due_date,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        },
+    )
 
 
-@celery_app.task(bind=True, queue="default")
-def log_time_logged_async(
-    self,
+def queue_title_change_log(
     task_id: str,
     user_id: str,
-    hours: float,
-    description: Optional[str] = None,
+    old_title: str,
+    new_title: str,
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
 ):
-    """Log time tracking activity asynchronously."""
-    try:
-        with get_celery_db() as db:
-            activity = ActivityService.log_time_logged(
-                db=db,
-                task_id=task_id,
-                user_id=user_id,
-                hours=hours,
-                description=description,
-                ip_address=ip_address,
-                user_agent=user_agent,
-            )
-
-            logger.info(
-                f"Successfully logged time tracking for task {task_id}: {hours} hours"
-            )
-            return {"success": True, "activity_id": activity.id}
-
-    except Exception as e:
-        logger.error(f"Failed to log time tracking for task {task_id}: {str(e)}")
-        raise self.retry(countdown=60, max_retries=3)
+    """Queue a title change activity log task."""
+    _buffer_activity(
+        "title_change",
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "old_title": old_title,
+            "new_title": new_title,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        },
+    )
 
 
-@celery_app.task(bind=True, queue="default")
-def log_subtask_added_async(
-    self,
+def queue_description_change_log(
     task_id: str,
     user_id: str,
-    subtask_id: str,
-    subtask_title: str,
+    old_description: Optional[str],
+    new_description: Optional[str],
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
 ):
-    """Log subtask addition activity asynchronously."""
-    try:
-        with get_celery_db() as db:
-            activity = ActivityService.log_subtask_added(
-                db=db,
-                task_id=task_id,
-                user_id=user_id,
-                subtask_id=subtask_id,
-                subtask_title=subtask_title,
-                ip_address=ip_address,
-                user_agent=user_agent,
-            )
-
-            logger.info(f"Successfully logged subtask addition for task {task_id}")
-            return {"success": True, "activity_id": activity.id}
-
-    except Exception as e:
-        logger.error(f"Failed to log subtask addition for task {task_id}: {str(e)}")
-        raise self.retry(countdown=60, max_retries=3)
+    """Queue a description change activity log task."""
+    _buffer_activity(
+        "description_change",
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "old_description": old_description,
+            "new_description": new_description,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        },
+    )
 
 
-@celery_app.task(bind=True, queue="default")
-def log_task_completed_async(
-    self,
+def queue_comment_added_log(
     task_id: str,
     user_id: str,
+    comment_id: str,
+    comment_content: str,
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
 ):
-    """Log task completion activity asynchronously."""
-    try:
-        with get_celery_db() as db:
-            activity = ActivityService.log_task_completed(
-                db=db,
-                task_id=task_id,
-                user_id=user_id,
-                ip_address=ip_address,
-                user_agent=user_agent,
-            )
-
-            logger.info(f"Successfully logged task completion for task {task_id}")
-            return {"success": True, "activity_id": activity.id}
-
-    except Exception as e:
-        logger.error(f"Failed to log task completion for task {task_id}: {str(e)}")
-        raise self.retry(countdown=60, max_retries=3)
+    """Queue a comment addition activity log task."""
+    _buffer_activity(
+        "comment_added",
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "comment_id": comment_id,
+            "comment_content": comment_content,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        },
+    )
 
 
-@celery_app.task(bind=True, queue="default")
-def log_task_shared_async(
-    self,
+def queue_attachment_added_log(
     task_id: str,
     user_id: str,
-    shared_with_user_id: str,
-    permission: str,
+    attachment_id: str,
+    filename: str,
+    file_size: int,
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
 ):
-    """Log task sharing activity asynchronously."""
-    try:
-        with get_celery_db() as db:
-            activity = ActivityService.log_task_shared(
-                db=db,
-                task_id=task_id,
-                user_id=user_id,
-                shared_with_user_id=shared_with_user_id,
-                permission=permission,
-                ip_address=ip_address,
-                user_agent=user_agent,
-            )
-
-            logger.info(f"Successfully logged task sharing for task {task_id}")
-            return {"success": True, "activity_id": activity.id}
-
-    except Exception as e:
-        logger.error(f"Failed to log task sharing for task {task_id}: {str(e)}")
-        raise self.retry(countdown=60, max_retries=3)
-
-
-@celery_app.task(bind=True, queue="default")
-def log_bulk_activities_async(self, activities: List[Dict[str, Any]]):
-    """Log multiple activities in bulk for better performance."""
-    try:
-        with get_celery_db() as db:
-            results = []
-
-            for activity_data in activities:
-                try:
-                    activity_type = ActivityType(activity_data["activity_type"])
-
-                    activity = ActivityService.log_activity(
-                        db=db,
-                        task_id=activity_data["task_id"],
-                        user_id=activity_data.get("user_id"),
-                        activity_type=activity_type,
-                        details=activity_data.get("details"),
-                        old_value=activity_data.get("old_value"),
-                        new_value=activity_data.get("new_value"),
-                        ip_address=activity_data.get("ip_address"),
-                        user_agent=activity_data.get("user_agent"),
-                    )
-
-                    results.append({"success": True, "activity_id": activity.id})
-
-                except Exception as e:
-                    logger.error(f"Failed to log bulk activity: {str(e)}")
-                    results.append({"success": False, "error": str(e)})
-
-            logger.info(
-                f"Processed {len(activities)} bulk activities, {sum(1 for r in results if r['success'])} successful"
-            )
-            return {"success": True, "results": results}
-
-    except Exception as e:
-        logger.error(f"Failed to process bulk activities: {str(e)}")
-        raise self.retry(countdown=60, max_retries=3)
-
-
-@celery_app.task(bind=True, queue="default")
-def cleanup_old_activities_async(self, days: int = 365):
-    """Clean up old activity records asynchronously."""
-    try:
-        with get_celery_db() as db:
-            deleted_count = ActivityService.cleanup_old_activities(db, days)
-
-            logger.info(f"Successfully cleaned up {deleted_count} old activity records")
-            return {"success": True, "deleted_count": deleted_count}
-
-    except Exception as e:
-        logger.error(f"Failed to cleanup old activities: {str(e)}")
-        raise self.retry(countdown=300, max_retries=3)
+    """Queue a file attachment activity log task."""
+    _buffer_activity(
+        "attachment_added",
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "attachment_id": attachment_id,
+            "filename": filename,
+            "file_size": file_size,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        },
+    )
 
 
-# Convenience functions for easier task queuing
+def queue_time_logged_log(
+    task_id: str,
+    user_id: str,
+    hours: float,
+    description: Optional[str] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+):
+    """Queue a time tracking activity log task."""
+    _buffer_activity(
+        "time_logged",
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "hours": hours,
+            "description": description,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        },
+    )
 
 
-def queue_activity_log(
+def queue_subtask_added_log(
     task_id: str,
-    user_id: Optional[str],
-    activity_type: ActivityType,
-    details: Optional[Dict[str, Any]] = None,
-    old_value: Optional[str] = None,
-    new_value: Optional[str] = None,
+    user_id: str,
+    subtask_id: str,
+    subtask_title: str,
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
 ):
-    """Queue an activity log task asynchronously."""
-    return log_activity_async.delay(
-        task_id=task_id,
-        user_id=user_id,
-        activity_type=activity_type.value,
-        details=details,
-        old_value=old_value,
-        new_value=new_value,
-        ip_address=ip_address,
-        user_agent=user_agent,
+    """Queue a subtask addition activity log task."""
+    _buffer_activity(
+        "subtask_added",
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "subtask_id": subtask_id,
+            "subtask_title": subtask_title,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        },
     )
 
 
-def queue_status_change_log(
+def queue_task_completed_log(
     task_id: str,
     user_id: str,
-    old_status: str,
-    new_status: str,
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
 ):
-    """Queue a status change activity log task."""
-    return log_status_change_async.delay(
-        task_id=task_id,
-        user_id=user_id,
-        old_status=old_status,
-        new_status=new_status,
-        ip_address=ip_address,
-        user_agent=user_agent,
+    """Queue a task completion activity log task."""
+    _buffer_activity(
+        "task_completed",
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        },
     )
 
 
-def queue_task_creation_log(
+def queue_task_update_log(task_id: str, user_id: str, changes: List[Dict[str, Any]]):
+    """
+    Queue the field changes of one task edit as a single activity entry.
+
+    Each change is a {"kind", "payload"} pair like the queue_*_log helpers
+    build, without task_id and user_id; every change still becomes its own
+    activity row.
+    """
+    if changes:
+        _buffer_activity(
+            "task_update",
+            {"task_id": task_id, "user_id": user_id, "changes": changes},
+        )
+
+
+def queue_task_shared_log(
     task_id: str,
     user_id: str,
-    task_data: Dict[str, Any],
+    shared_with_user_id: str,
+    permission: str,
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
 ):
-    """Queue a task creation activity log task."""
-    return log_task_created_async.delay(
-        task_id=task_id,
-        user_id=user_id,
-        task_data=task_data,
-        ip_address=ip_address,
-        user_agent=user_agent,
+    """Queue a task sharing activity log task."""
+    _buffer_activity(
+        "task_shared",
+        {
+            "task_id": task_id,
+            "user_id": user_id,
+            "shared_with_user_id": shared_with_user_id,
+            "permission": permission,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+        },
     )
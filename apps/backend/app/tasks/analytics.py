@@ -2,233 +2,340 @@
 Background tasks for analytics computation and caching.
 """
 
+import hashlib
 import logging
+import os
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
-from celery import Task
-from sqlalchemy.orm import Session
+from celery import group
+from sqlalchemy import case, distinct, func, select
 
 from app.core.celery_app import celery_app
 from app.core.config import settings
-from app.db.database import get_db
+from app.db.database import get_celery_db
 from app.db.models import Project
 from app.db.models import Task as TaskModel
 from app.db.models import User
 from app.services.analytics_service import AnalyticsService
-from app.services.cache_service import cache_service
+from app.services.cache_service import cache_service, jittered_ttl
+from app.services.project_service import ProjectService
 
 logger = logging.getLogger(__name__)
 
 
-class DatabaseTask(Task):
-    """Base task class that provides database session."""
+# Per-user metrics kept warm by precompute_analytics: key name, loader, TTL
+USER_METRICS = [
+    ("task_stats", AnalyticsService.get_task_statistics, 1800),  # 30 minutes
+    ("productivity", AnalyticsService.get_productivity_trends, 3600),  # 1 hour
+    ("categories", AnalyticsService.get_category_distribution, 1800),
+    ("tags", AnalyticsService.get_tag_distribution, 1800),
+]
 
-    def __call__(self, *args, **kwargs):
-        with get_db() as db:
-            return self.run_with_db(db, *args, **kwargs)
+# Users per precompute_analytics_batch task, whose cache entries are probed
+# and written per Redis round trip
+PRECOMPUTE_BATCH_SIZE = 200
 
-    def run_with_db(self, db: Session, *args, **kwargs):
-        """Override this method instead of run()"""
-        raise NotImplementedError
+# Exports are written here and found through their cache entry until it expires
+EXPORT_DIR = os.path.join(settings.UPLOAD_DIR, "exports")
+EXPORT_TTL = 3600  # 1 hour
 
 
-@celery_app.task(bind=True, base=DatabaseTask, queue="analytics")
-def precompute_analytics(self, db: Session):
-    """Precompute and cache analytics for all active users."""
-    try:
-        logger.info("Starting analytics precomputation")
-
-        # Get all active users (users who have created tasks in the last 30 days)
-        thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-        active_users = (
-            db.query(User)
-            .join(TaskModel)
-            .filter(TaskModel.created_at >= thirty_days_ago)
-            .distinct()
-            .all()
-        )
+def _user_lock(user_id: str) -> str:
+    """Lock held while a worker computes a user's cached analytics."""
+    return f"{settings.CACHE_PREFIX_ANALYTICS}user:{user_id}"
 
-        processed_count = 0
-        cache_hits = 0
 
-        for user in active_users:
-            try:
-                # Precompute user task statistics
-                cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}task_stats:{user.id}"
-                if not cache_service.exists(cache_key):
-                    stats = AnalyticsService.get_task_statistics(db, user.id)
-                    cache_service.set(cache_key, stats, ttl=1800)  # 30 minutes
-                else:
-                    cache_hits += 1
-
-                # Precompute productivity trends
-                cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}productivity:{user.id}"
-                if not cache_service.exists(cache_key):
-                    trends = AnalyticsService.get_productivity_trends(db, user.id)
-                    cache_service.set(cache_key, trends, ttl=3600)  # 1 hour
-                else:
-                    cache_hits += 1
-
-                # Precompute category and tag distributions
-                cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}categories:{user.id}"
-                if not cache_service.exists(cache_key):
-                    categories = AnalyticsService.get_category_distribution(db, user.id)
-                    cache_service.set(cache_key, categories, ttl=1800)  # 30 minutes
-                else:
-                    cache_hits += 1
-
-                cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}tags:{user.id}"
-                if not cache_service.exists(cache_key):
-                    tags = AnalyticsService.get_tag_distribution(db, user.id)
-                    cache_service.set(cache_key, tags, ttl=1800)  # 30 minutes
-                else:
-                    cache_hits += 1
-
-                processed_count += 1
-
-            except Exception as e:
-                logger.error(
-                    f"Error precomputing analytics for user {user.id}: {str(e)}"
-                )
-                continue
+def _params_digest(params: Dict[str, Any]) -> str:
+    """Fixed-size digest of canonical parameters, for use in cache keys."""
+    canonical = "|".join(f"{name}={params[name]}" for name in sorted(params))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def _canonical_datetime(value: datetime) -> str:
+    """ISO format that is the same for equivalent aware datetimes."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.isoformat()
 
-        logger.info(
-            f"Analytics precomputation completed: {processed_count} users processed, {cache_hits} cache hits"
-        )
-        return {
-            "success": True,
-            "users_processed": processed_count,
-            "cache_hits": cache_hits,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        }
+
+def _wait_for_cache(cache_key: str, attempts: int = 25, interval: float = 0.2):
+    """Wait for another worker to cache a value, or None if it never shows."""
+    for _ in range(attempts):
+        time.sleep(interval)
+        value = cache_service.get(cache_key)
+        if value is not None:
+            return value
+    return None
+
+
+@celery_app.task(bind=True, queue="analytics")
+def precompute_analytics(self):
+    """
+    Precompute and cache analytics for all active users.
+
+    Only schedules the work: active users are split into batches that run
+    in parallel as a group of precompute_analytics_batch tasks.
+    """
+    try:
+        with get_celery_db() as db:
+            logger.info("Starting analytics precomputation")
+
+            # Get all active users (users who have created tasks in the last 30 days)
+            thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+            user_ids = [
+                user_id
+                for (user_id,) in db.query(TaskModel.user_id)
+                .filter(TaskModel.created_at >= thirty_days_ago)
+                .distinct()
+            ]
+
+            batches = [
+                user_ids[start : start + PRECOMPUTE_BATCH_SIZE]
+                for start in range(0, len(user_ids), PRECOMPUTE_BATCH_SIZE)
+            ]
+            if batches:
+                group(
+                    precompute_analytics_batch.s(batch) for batch in batches
+                ).apply_async()
+
+            logger.info(
+                f"Analytics precomputation scheduled: {len(user_ids)} users in {len(batches)} batches"
+            )
+            return {
+                "success": True,
+                "users_scheduled": len(user_ids),
+                "batches": len(batches),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }
 
     except Exception as e:
         logger.error(f"Failed to precompute analytics: {str(e)}")
         raise self.retry(countdown=300, max_retries=2)
 
 
-@celery_app.task(bind=True, base=DatabaseTask, queue="analytics")
-def compute_user_analytics(
-    self, db: Session, user_id: str, force_refresh: bool = False
-):
+@celery_app.task(bind=True, queue="analytics", acks_late=True)
+def precompute_analytics_batch(self, user_ids: List[str]):
+    """Precompute and cache the analytics missing for a batch of users."""
+    try:
+        with get_celery_db() as db:
+            processed_count = 0
+            cache_hits = 0
+
+            # One pipelined EXISTS for every key of the batch
+            keys = {
+                (name, user_id): f"{settings.CACHE_PREFIX_ANALYTICS}{name}:{user_id}"
+                for user_id in user_ids
+                for name, _, _ in USER_METRICS
+            }
+            cached = cache_service.exists_multi(list(keys.values()))
+
+            # Computed values per metric, written with one call per TTL
+            computed: Dict[str, Dict[str, Any]] = {
+                name: {} for name, _, _ in USER_METRICS
+            }
+            # Users locked by this run until their values are written
+            locks: Dict[str, str] = {}
+            for user_id in user_ids:
+                try:
+                    missing = []
+                    for name, load, _ in USER_METRICS:
+                        cache_key = keys[(name, user_id)]
+                        if cached.get(cache_key):
+                            cache_hits += 1
+                        else:
+                            missing.append((name, load, cache_key))
+                    if not missing:
+                        processed_count += 1
+                        continue
+
+                    # Another worker is already filling this user's cache
+                    token = cache_service.acquire_lock(_user_lock(user_id))
+                    if token is None:
+                        continue
+                    locks[user_id] = token
+
+                    values = {
+                        name: (cache_key, load(db, user_id))
+                        for name, load, cache_key in missing
+                    }
+
+                    for name, (cache_key, value) in values.items():
+                        computed[name][cache_key] = value
+                    processed_count += 1
+
+                except Exception as e:
+                    logger.error(
+                        f"Error precomputing analytics for user {user_id}: {str(e)}"
+                    )
+                    continue
+
+            try:
+                for name, _, ttl in USER_METRICS:
+                    if computed[name]:
+                        cache_service.set_multi(computed[name], ttl=ttl, jitter=True)
+            finally:
+                for user_id, token in locks.items():
+                    cache_service.release_lock(_user_lock(user_id), token)
+
+            logger.info(
+                f"Analytics batch completed: {processed_count} users processed, {cache_hits} cache hits"
+            )
+            return {
+                "success": True,
+                "users_processed": processed_count,
+                "cache_hits": cache_hits,
+            }
+
+    except Exception as e:
+        logger.error(f"Failed to precompute analytics batch: {str(e)}")
+        raise self.retry(countdown=300, max_retries=2)
+
+
+@celery_app.task(bind=True, queue="analytics")
+def compute_user_analytics(self, user_id: str, force_refresh: bool = False):
     """Compute analytics for a specific user."""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user:
-            logger.warning(f"User {user_id} not found for analytics computation")
-            return {"success": False, "reason": "User not found"}
-
-        computed_metrics = []
-
-        # Task statistics
-        cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}task_stats:{user_id}"
-        if force_refresh or not cache_service.exists(cache_key):
-            stats = AnalyticsService.get_task_statistics(db, user_id)
-            cache_service.set(cache_key, stats, ttl=1800)
-            computed_metrics.append("task_statistics")
-
-        # Productivity trends
-        cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}productivity:{user_id}"
-        if force_refresh or not cache_service.exists(cache_key):
-            trends = AnalyticsService.get_productivity_trends(db, user_id)
-            cache_service.set(cache_key, trends, ttl=3600)
-            computed_metrics.append("productivity_trends")
-
-        # Category distribution
-        cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}categories:{user_id}"
-        if force_refresh or not cache_service.exists(cache_key):
-            categories = AnalyticsService.get_category_distribution(db, user_id)
-            cache_service.set(cache_key, categories, ttl=1800)
-            computed_metrics.append("category_distribution")
-
-        # Tag distribution
-        cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}tags:{user_id}"
-        if force_refresh or not cache_service.exists(cache_key):
-            tags = AnalyticsService.get_tag_distribution(db, user_id)
-            cache_service.set(cache_key, tags, ttl=1800)
-            computed_metrics.append("tag_distribution")
-
-        logger.info(f"Computed analytics for user {user_id}: {computed_metrics}")
-        return {
-            "success": True,
-            "user_id": user_id,
-            "computed_metrics": computed_metrics,
-            "force_refresh": force_refresh,
-        }
+        with get_celery_db() as db:
+            # Only existence matters, so no User row is loaded
+            if not db.query(User.id).filter(User.id == user_id).scalar():
+                logger.warning(f"User {user_id} not found for analytics computation")
+                return {"success": False, "reason": "User not found"}
+
+            computed_metrics = []
+
+            token = cache_service.acquire_lock(_user_lock(user_id))
+            if token is None:
+                logger.info(f"Analytics for user {user_id} are already being computed")
+                return {
+                    "success": True,
+                    "user_id": user_id,
+                    "computed_metrics": computed_metrics,
+                    "force_refresh": force_refresh,
+                }
+
+            try:
+                # Task statistics
+                cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}task_stats:{user_id}"
+                if force_refresh or not cache_service.exists(cache_key):
+                    stats = AnalyticsService.get_task_statistics(db, user_id)
+                    cache_service.set(cache_key, stats, ttl=jittered_ttl(1800))
+                    computed_metrics.append("task_statistics")
+
+                # Productivity trends
+                cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}productivity:{user_id}"
+                if force_refresh or not cache_service.exists(cache_key):
+                    trends = AnalyticsService.get_productivity_trends(db, user_id)
+                    cache_service.set(cache_key, trends, ttl=jittered_ttl(3600))
+                    computed_metrics.append("productivity_trends")
+
+                # Category distribution
+                cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}categories:{user_id}"
+                if force_refresh or not cache_service.exists(cache_key):
+                    categories = AnalyticsService.get_category_distribution(db, user_id)
+                    cache_service.set(cache_key, categories, ttl=jittered_ttl(1800))
+                    computed_metrics.append("category_distribution")
+
+                # Tag distribution
+                cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}tags:{user_id}"
+                if force_refresh or not cache_service.exists(cache_key):
+                    tags = AnalyticsService.get_tag_distribution(db, user_id)
+                    cache_service.set(cache_key, tags, ttl=jittered_ttl(1800))
+                    computed_metrics.append("tag_distribution")
+            finally:
+                cache_service.release_lock(_user_lock(user_id), token)
+
+            logger.info(f"Computed analytics for user {user_id}: {computed_metrics}")
+            return {
+                "success": True,
+                "user_id": user_id,
+                "computed_metrics": computed_metrics,
+                "force_refresh": force_refresh,
+            }
 
     except Exception as e:
         logger.error(f"Failed to compute analytics for user {user_id}: {str(e)}")
         raise self.retry(countdown=120, max_retries=3)
 
 
-@celery_app.task(bind=True, base=DatabaseTask, queue="analytics")
-def compute_project_analytics(self, db: Session, project_id: str, user_id: str):
+@celery_app.task(bind=True, queue="analytics")
+def compute_project_analytics(self, project_id: str, user_id: str):
     """Compute analytics for a specific project."""
     try:
-        project = db.query(Project).filter(Project.id == project_id).first()
-        if not project:
-            logger.warning(f"Project {project_id} not found for analytics computation")
-            return {"success": False, "reason": "Project not found"}
-
-        # Check user permission
-        if not project.has_permission(user_id, "VIEWER"):
-            logger.warning(
-                f"User {user_id} does not have permission to view project {project_id} analytics"
-            )
-            return {"success": False, "reason": "Permission denied"}
+        with get_celery_db() as db:
+            # Existence and access are checked in SQL, so neither the project
+            # nor its members are loaded (and nothing can be lazy loaded)
+            if not db.query(Project.id).filter(Project.id == project_id).scalar():
+                logger.warning(
+                    f"Project {project_id} not found for analytics computation"
+                )
+                return {"success": False, "reason": "Project not found"}
 
-        computed_metrics = []
+            # Check user permission (any owner or member has viewer access)
+            if not ProjectService.user_has_access(db, user_id, project_id):
+                logger.warning(
+                    f"User {user_id} does not have permission to view project {project_id} analytics"
+                )
+                return {"success": False, "reason": "Permission denied"}
 
-        # Project task statistics
-        cache_key = (
-            f"{settings.CACHE_PREFIX_ANALYTICS}project_stats:{project_id}:{user_id}"
-        )
-        stats = AnalyticsService.get_task_statistics(db, user_id, project_id=project_id)
-        cache_service.set(cache_key, stats, ttl=1800)
-        computed_metrics.append("project_task_statistics")
-
-        # Team performance
-        cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}team_performance:{project_id}"
-        performance = AnalyticsService.get_team_performance(db, project_id, user_id)
-        cache_service.set(cache_key, performance, ttl=1800)
-        computed_metrics.append("team_performance")
-
-        # Project category distribution
-        cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}project_categories:{project_id}:{user_id}"
-        categories = AnalyticsService.get_category_distribution(
-            db, user_id, project_id=project_id
-        )
-        cache_service.set(cache_key, categories, ttl=1800)
-        computed_metrics.append("project_category_distribution")
+            computed_metrics = []
 
-        # Project tag distribution
-        cache_key = (
-            f"{settings.CACHE_PREFIX_ANALYTICS}project_tags:{project_id}:{user_id}"
-        )
-        tags = AnalyticsService.get_tag_distribution(db, user_id, project_id=project_id)
-        cache_service.set(cache_key, tags, ttl=1800)
-        computed_metrics.append("project_tag_distribution")
+            # Project task statistics
+            cache_key = (
+                f"{settings.CACHE_PREFIX_ANALYTICS}project_stats:{project_id}:{user_id}"
+            )
+            stats = AnalyticsService.get_task_statistics(
+                db, user_id, project_id=project_id
+            )
+            cache_service.set(cache_key, stats, ttl=jittered_ttl(1800))
+            computed_metrics.append("project_task_statistics")
 
-        logger.info(
-            f"Computed project analytics for project {project_id}: {computed_metrics}"
-        )
-        return {
-            "success": True,
-            "project_id": project_id,
-            "user_id": user_id,
-            "computed_metrics": computed_metrics,
-        }
+            # Team performance
+            cache_key = (
+                f"{settings.CACHE_PREFIX_ANALYTICS}team_performance:{project_id}"
+            )
+            performance = AnalyticsService.get_team_performance(db, project_id, user_id)
+            cache_service.set(cache_key, performance, ttl=jittered_ttl(1800))
+            computed_metrics.append("team_performance")
+
+            # Project category distribution
+            cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}project_categories:{project_id}:{user_id}"
+            categories = AnalyticsService.get_category_distribution(
+                db, user_id, project_id=project_id
+            )
+            cache_service.set(cache_key, categories, ttl=jittered_ttl(1800))
+            computed_metrics.append("project_category_distribution")
+
+            # Project tag distribution
+            cache_key = (
+                f"{settings.CACHE_PREFIX_ANALYTICS}project_tags:{project_id}:{user_id}"
+            )
+            tags = AnalyticsService.get_tag_distribution(
+                db, user_id, project_id=project_id
+            )
+            cache_service.set(cache_key, tags, ttl=jittered_ttl(1800))
+            computed_metrics.append("project_tag_distribution")
+
+            logger.info(
+                f"Computed project analytics for project {project_id}: {computed_metrics}"
+            )
+            return {
+                "success": True,
+                "project_id": project_id,
+                "user_id": user_id,
+                "computed_metrics": computed_metrics,
+            }
 
     except Exception as e:
         logger.error(f"Failed to compute project analytics for {project_id}: {str(e)}")
         raise self.retry(countdown=120, max_retries=3)
 
 
-@celery_app.task(bind=True, base=DatabaseTask, queue="analytics")
+@celery_app.task(bind=True, queue="analytics")
 def generate_time_tracking_report(
     self,
-    db: Session,
     user_id: str,
     start_date: str,
     end_date: str,
@@ -236,27 +343,53 @@ def generate_time_tracking_report(
 ):
     """Generate a time tracking report asynchronously."""
     try:
-        from datetime import datetime
-
-        start_dt = datetime.fromisoformat(start_date)
-        end_dt = datetime.fromisoformat(end_date)
-
-        report = AnalyticsService.get_time_tracking_report(
-            db, user_id, start_dt, end_dt, group_by
-        )
-
-        # Cache the report for quick access
-        cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}time_report:{user_id}:{start_date}:{end_date}:{group_by}"
-        cache_service.set(cache_key, report, ttl=3600)  # 1 hour
+        with get_celery_db() as db:
+            from datetime import datetime
+
+            start_dt = datetime.fromisoformat(start_date)
+            end_dt = datetime.fromisoformat(end_date)
+
+            # Equivalent requests (e.g. "Z" vs "+00:00") share one fixed-size key;
+            # the user id stays in the clear so user invalidation still matches
+            params = {
+                "start_date": _canonical_datetime(start_dt),
+                "end_date": _canonical_datetime(end_dt),
+                "group_by": group_by,
+            }
+            digest = _params_digest(params)
+            cache_key = (
+                f"{settings.CACHE_PREFIX_ANALYTICS}time_report:{user_id}:{digest}"
+            )
 
-        logger.info(f"Generated time tracking report for user {user_id}")
-        return {
-            "success": True,
-            "user_id": user_id,
-            "report_cache_key": cache_key,
-            "total_hours": report["total_hours"],
-            "entries_count": len(report["entries"]),
-        }
+            # The same report requested twice is only computed once; the second
+            # worker waits for the first one's cached result
+            report = None
+            token = cache_service.acquire_lock(cache_key)
+            if token is None:
+                report = _wait_for_cache(cache_key)
+
+            if report is None:
+                try:
+                    report = AnalyticsService.get_time_tracking_report(
+                        db, user_id, start_dt, end_dt, group_by
+                    )
+
+                    # Cache the report for quick access
+                    cache_service.set(
+                        cache_key, {**report, "params": params}, ttl=jittered_ttl(3600)
+                    )  # 1 hour
+                finally:
+                    if token is not None:
+                        cache_service.release_lock(cache_key, token)
+
+            logger.info(f"Generated time tracking report for user {user_id}")
+            return {
+                "success": True,
+                "user_id": user_id,
+                "report_cache_key": cache_key,
+                "total_hours": report["total_hours"],
+                "entries_count": len(report["entries"]),
+            }
 
     except Exception as e:
         logger.error(
@@ -265,52 +398,96 @@ def generate_time_tracking_report(
         raise self.retry(countdown=120, max_retries=3)
 
 
-@celery_app.task(bind=True, base=DatabaseTask, queue="analytics")
+@celery_app.task(bind=True, queue="analytics")
 def export_tasks_async(
-    self, db: Session, user_id: str, task_ids: Optional[List[str]], format: str = "csv"
+    self, user_id: str, task_ids: Optional[List[str]], format: str = "csv"
 ):
-    """Export tasks asynchronously and cache the result."""
+    """Export tasks asynchronously to a file and cache where to find it."""
     try:
-        if format.lower() == "csv":
-            export_data = AnalyticsService.export_tasks_csv(db, user_id, task_ids)
-            content_type = "text/csv"
-        elif format.lower() == "excel":
-            export_data = AnalyticsService.export_tasks_excel(db, user_id, task_ids)
-            content_type = (
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        with get_celery_db() as db:
+            if format.lower() == "csv":
+                write_export = AnalyticsService.write_tasks_csv
+                content_type = "text/csv"
+                extension, mode = "csv", "w"
+                open_kwargs = {"newline": "", "encoding": "utf-8"}
+            elif format.lower() == "excel":
+                write_export = AnalyticsService.write_tasks_excel
+                content_type = (
+                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+                extension, mode = "xlsx", "wb"
+                open_kwargs = {}
+            else:
+                raise ValueError(f"Unsupported export format: {format}")
+
+            # Write straight to disk; the rename keeps readers from seeing a
+            # half-written file if the worker dies mid-export
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            filename = f"tasks_export_{uuid.uuid4().hex}.{extension}"
+            file_path = os.path.join(EXPORT_DIR, filename)
+            partial_path = f"{file_path}.part"
+            try:
+                with open(partial_path, mode, **open_kwargs) as output:
+                    write_export(db, user_id, output, task_ids)
+                os.replace(partial_path, file_path)
+            finally:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+
+            # Cache only the export metadata, not the file contents. Exporting the
+            # same selection again replaces the entry instead of adding a new one
+            params = {
+                "format": format.lower(),
+                "task_ids": ",".join(sorted(set(task_ids))) if task_ids else "*",
+            }
+            digest = _params_digest(params)
+            cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}export:{user_id}:{digest}"
+            cache_service.set(
+                cache_key,
+                {
+                    "file_path": file_path,
+                    "filename": filename,
+                    "content_type": content_type,
+                    "format": format,
+                    "task_count": len(task_ids) if task_ids else "all",
+                },
+                ttl=EXPORT_TTL,
             )
-        else:
-            raise ValueError(f"Unsupported export format: {format}")
-
-        # Cache the export data temporarily
-        cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}export:{user_id}:{datetime.now(timezone.utc).timestamp()}"
-        cache_service.set(
-            cache_key,
-            {
-                "data": export_data,
-                "content_type": content_type,
+
+            logger.info(f"Generated {format} export for user {user_id}")
+            return {
+                "success": True,
+                "user_id": user_id,
+                "export_cache_key": cache_key,
                 "format": format,
-                "task_count": len(task_ids) if task_ids else "all",
-            },
-            ttl=3600,
-        )  # 1 hour
-
-        logger.info(f"Generated {format} export for user {user_id}")
-        return {
-            "success": True,
-            "user_id": user_id,
-            "export_cache_key": cache_key,
-            "format": format,
-            "content_type": content_type,
-        }
+                "content_type": content_type,
+            }
 
     except Exception as e:
         logger.error(f"Failed to export tasks for user {user_id}: {str(e)}")
         raise self.retry(countdown=120, max_retries=3)
 
 
-@celery_app.task(bind=True, base=DatabaseTask, queue="analytics")
-def cleanup_analytics_cache(self, db: Session):
+def _remove_expired_exports() -> int:
+    """Remove export files whose cache entry has already expired."""
+    if not os.path.isdir(EXPORT_DIR):
+        return 0
+
+    cutoff = time.time() - EXPORT_TTL
+    removed = 0
+    with os.scandir(EXPORT_DIR) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+    return removed
+
+
+@celery_app.task(bind=True, queue="analytics")
+def cleanup_analytics_cache(self):
     """Clean up expired analytics cache entries."""
     try:
         # Delete analytics cache entries that are older than 24 hours
@@ -319,10 +496,8 @@ def cleanup_analytics_cache(self, db: Session):
             f"{settings.CACHE_PREFIX_ANALYTICS}time_report:*",
         ]
 
-        cleaned_count = 0
-        for pattern in patterns_to_clean:
-            count = cache_service.delete_pattern(pattern)
-            cleaned_count += count
+        cleaned_count = cache_service.delete_patterns(patterns_to_clean)
+        cleaned_count += _remove_expired_exports()
 
         logger.info(f"Cleaned up {cleaned_count} expired analytics cache entries")
         return {"success": True, "cleaned_count": cleaned_count}
@@ -332,86 +507,76 @@ def cleanup_analytics_cache(self, db: Session):
         raise self.retry(countdown=300, max_retries=2)
 
 
-@celery_app.task(bind=True, base=DatabaseTask, queue="analytics")
-def compute_system_wide_analytics(self, db: Session):
+@celery_app.task(bind=True, queue="analytics")
+def compute_system_wide_analytics(self):
     """Compute system-wide analytics and metrics."""
     try:
-        now = datetime.now(timezone.utc)
-
-        # Count total users
-        total_users = db.query(User).count()
-
-        # Count active users (users with tasks in last 30 days)
-        thirty_days_ago = now - timedelta(days=30)
-        active_users = (
-            db.query(User)
-            .join(TaskModel)
-            .filter(TaskModel.created_at >= thirty_days_ago)
-            .distinct()
-            .count()
-        )
-
-        # Count total tasks
-        total_tasks = db.query(TaskModel).count()
-
-        # Count tasks created in last 30 days
-        recent_tasks = (
-            db.query(TaskModel).filter(TaskModel.created_at >= thirty_days_ago).count()
-        )
-
-        # Count total projects
-        total_projects = db.query(Project).count()
-
-        # Count active projects (projects with tasks in last 30 days)
-        active_projects = (
-            db.query(Project)
-            .join(TaskModel)
-            .filter(TaskModel.created_at >= thirty_days_ago)
-            .distinct()
-            .count()
-        )
-
-        system_metrics = {
-            "timestamp": now.isoformat(),
-            "users": {
-                "total": total_users,
-                "active_30_days": active_users,
-                "activity_rate": (
-                    (active_users / total_users * 100) if total_users > 0 else 0
-                ),
-            },
-            "tasks": {
-                "total": total_tasks,
-                "created_30_days": recent_tasks,
-                "average_per_user": (
-                    (total_tasks / total_users) if total_users > 0 else 0
-                ),
-            },
-            "projects": {
-                "total": total_projects,
-                "active_30_days": active_projects,
-                "activity_rate": (
-                    (active_projects / total_projects * 100)
-                    if total_projects > 0
-                    else 0
-                ),
-            },
-        }
-
-        # Cache system metrics
-        cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}system_metrics"
-        cache_service.set(cache_key, system_metrics, ttl=3600)  # 1 hour
-
-        logger.info("Computed system-wide analytics")
-        return {"success": True, "metrics": system_metrics}
+        with get_celery_db() as db:
+            now = datetime.now(timezone.utc)
+
+            # Every count in one round trip: totals as scalar subqueries, the
+            # 30-day figures as conditional aggregates over a single tasks scan
+            thirty_days_ago = now - timedelta(days=30)
+            recent = TaskModel.created_at >= thirty_days_ago
+            (
+                total_users,
+                total_projects,
+                total_tasks,
+                recent_tasks,
+                active_users,
+                active_projects,
+            ) = db.query(
+                select(func.count()).select_from(User).scalar_subquery(),
+                select(func.count()).select_from(Project).scalar_subquery(),
+                func.count(TaskModel.id),
+                func.count(case((recent, TaskModel.id))),
+                func.count(distinct(case((recent, TaskModel.user_id)))),
+                func.count(distinct(case((recent, TaskModel.project_id)))),
+            ).one()
+
+            system_metrics = {
+                "timestamp": now.isoformat(),
+                "users": {
+                    "total": total_users,
+                    "active_30_days": active_users,
+                    "activity_rate": (
+                        (active_users / total_users * 100) if total_users > 0 else 0
+                    ),
+                },
+                "tasks": {
+                    "total": total_tasks,
+                    "created_30_days": recent_tasks,
+                    "average_per_user": (
+                        (total_tasks / total_users) if total_users > 0 else 0
+                    ),
+                },
+                "projects": {
+                    "total": total_projects,
+                    "active_30_days": active_projects,
+                    "activity_rate": (
+                        (active_projects / total_projects * 100)
+                        if total_projects > 0
+                        else 0
+                    ),
+                },
+            }
+
+            # Cache system metrics
+            cache_key = f"{settings.CACHE_PREFIX_ANALYTICS}system_metrics"
+            cache_service.set(
+                cache_key, system_metrics, ttl=jittered_ttl(3600)
+            )  # 1 hour
+
+            logger.info("Computed system-wide analytics")
+            return {"success": True, "metrics": system_metrics}
 
     except Exception as e:
         logger.error(f"Failed to compute system-wide analytics: {str(e)}")
         raise self.retry(countdown=300, max_retries=2)
 
 
-@celery_app.task(bind=True, base=DatabaseTask, queue="analytics")
-def invalidate_user_analytics_cache(self, db: Session, user_id: str):
+@celery_app.task(bind=True, queue="analytics")
+def invalidate_user_analytics_cache(self, user_id: str):
     """Invalidate analytics cache for a specific user."""
     try:
         patterns = [
@@ -423,10 +588,7 @@ def invalidate_user_analytics_cache(self, db: Session, user_id: str):
             f"{settings.CACHE_PREFIX_ANALYTICS}export:{user_id}*",
         ]
 
-        invalidated_count = 0
-        for pattern in patterns:
-            count = cache_service.delete_pattern(pattern)
-            invalidated_count += count
+        invalidated_count = cache_service.delete_patterns(patterns)
 
         logger.info(
             f"Invalidated {invalidated_count} analytics cache entries for user {user_id}"
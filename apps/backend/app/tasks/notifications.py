@@ -2,7 +2,6 @@
 Background tasks for sending notifications and emails.
 """
 
-import json
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
@@ -91,13 +90,11 @@ def send_task_assignment_notification(
                 type="task_assigned",
                 title="New Task Assigned",
                 message=f"You have been assigned the task '{task.title}' by {assigned_by.username}",
-                data=json.dumps(
-                    {
-                        "task_id": task_id,
-                        "assigned_by": assigned_by.username,
-                        "task_title": task.title,
-                    }
-                ),
+                data={
+                    "task_id": task_id,
+                    "assigned_by": assigned_by.username,
+                    "task_title": task.title,
+                },
             )
             db.add(notification)
             db.commit()
@@ -295,14 +292,12 @@ def send_comment_mention_notification(self, comment_id: str, mentioned_user_id:
                 type="comment_mention",
                 title="You were mentioned",
                 message=f"{commenter.username} mentioned you in a comment on task '{task.title}'",
-                data=json.dumps(
-                    {
-                        "comment_id": comment_id,
-                        "task_id": task.id,
-                        "task_title": task.title,
-                        "commenter": commenter.username,
-                    }
-                ),
+                data={
+                    "comment_id": comment_id,
+                    "task_id": task.id,
+                    "task_title": task.title,
+                    "commenter": commenter.username,
+                },
             )
             db.add(notification)
             db.commit()
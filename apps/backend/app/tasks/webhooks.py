@@ -2,343 +2,467 @@
 Background tasks for webhook delivery and processing.
 """
 
-import hashlib
+import asyncio
 import hmac
-import json
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import httpx
-from celery import Task
-from sqlalchemy.orm import Session
+import orjson
+from celery.exceptions import Retry
+from celery.utils.time import get_exponential_backoff_interval
+from sqlalchemy.orm import joinedload
 
 from app.core.celery_app import celery_app
 from app.core.config import settings
-from app.db.database import get_db
+from app.db.database import get_celery_db
 from app.db.models import (WebhookDelivery, WebhookDeliveryStatus,
                            WebhookSubscription)
+from app.services.cache_service import invalidate_webhook_cache
+from app.services.webhook_service import WebhookService, http_client
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on in-flight requests when fanning one event out
+MAX_CONCURRENT_DELIVERIES = 64
 
-class DatabaseTask(Task):
-    """Base task class that provides database session."""
+# Failed deliveries are retried by the broker with jittered exponential
+# backoff: about 5 minutes after the first failure, capped at an hour
+RETRY_BACKOFF = 300
+RETRY_BACKOFF_MAX = 3600
+MAX_DELIVERY_RETRIES = 3
 
-    def __call__(self, *args, **kwargs):
-        with get_db() as db:
-            return self.run_with_db(db, *args, **kwargs)
 
-    def run_with_db(self, db: Session, *args, **kwargs):
-        """Override this method instead of run()"""
-        raise NotImplementedError
+def generate_webhook_signature(payload: bytes, secret: str) -> str:
+    """Generate HMAC signature for webhook payload."""
+    # One-shot C HMAC, no intermediate HMAC object
+    return hmac.digest(secret.encode("utf-8"), payload, "sha256").hex()
+
+
+def _with_delivery_id(payload_bytes: bytes, delivery_id: str) -> bytes:
+    """Add a delivery_id member to an already serialized JSON object."""
+    separator = b"," if payload_bytes != b"{}" else b""
+    return (
+        payload_bytes[:-1]
+        + separator
+        + b'"delivery_id":'
+        + orjson.dumps(delivery_id)
+        + b"}"
+    )
 
 
-def generate_webhook_signature(payload: str, secret: str) -> str:
-    """Generate HMAC signature for webhook payload."""
-    return hmac.new(
-        secret.encode("utf-8"), payload.encode("utf-8"), hashlib.sha256
-    ).hexdigest()
+def build_webhook_headers(
+    event_type: str, delivery_id: str, signature: Optional[str]
+) -> Dict[str, str]:
+    """Build the request headers for a delivery, with its body signature."""
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": f"TaskManager-Webhook/1.0",
+        "X-Webhook-Event": event_type,
+        "X-Webhook-Delivery": delivery_id,
+    }
 
+    if signature:
+        headers["X-Webhook-Signature-256"] = f"sha256={signature}"
 
-@celery_app.task(bind=True, base=DatabaseTask, queue="webhooks")
-def deliver_webhook(
-    self, db: Session, subscription_id: str, event_type: str, payload: Dict[str, Any]
+    return headers
+
+
+def record_webhook_response(
+    subscription: WebhookSubscription,
+    delivery: WebhookDelivery,
+    response: httpx.Response,
 ):
-    """Deliver a webhook to a subscribed endpoint."""
-    try:
-        subscription = (
-            db.query(WebhookSubscription)
-            .filter(WebhookSubscription.id == subscription_id)
-            .first()
+    """Update a delivery and its subscription from the endpoint's response."""
+    delivery.delivered_at = datetime.now(timezone.utc)
+    delivery.response_status_code = response.status_code
+    delivery.response_headers = orjson.dumps(dict(response.headers)).decode("utf-8")
+    delivery.response_body = response.text[:1000]  # Limit response body storage
+
+    if 200 <= response.status_code < 300:
+        delivery.status = WebhookDeliveryStatus.DELIVERED
+        logger.info(
+            f"Webhook delivered successfully to {subscription.url} for event {delivery.event_type}"
         )
 
-        if not subscription:
-            logger.warning(f"Webhook subscription {subscription_id} not found")
-            return {"success": False, "reason": "Subscription not found"}
+        # Reset failure count on successful delivery
+        subscription.failure_count = 0
+        subscription.last_delivery_at = delivery.delivered_at
 
-        if not subscription.is_active:
-            logger.info(f"Webhook subscription {subscription_id} is inactive")
-            return {"success": False, "reason": "Subscription inactive"}
+    else:
+        delivery.status = WebhookDeliveryStatus.FAILED
+        delivery.failure_reason = f"HTTP {response.status_code}: {response.text[:200]}"
 
-        # Check if this event type is subscribed to
-        if event_type not in subscription.events:
-            logger.debug(
-                f"Event type {event_type} not subscribed for {subscription_id}"
-            )
-            return {"success": False, "reason": "Event not subscribed"}
-
-        # Create delivery record
-        delivery = WebhookDelivery(
-            subscription_id=subscription_id,
-            event_type=event_type,
-            payload=payload,
-            status=WebhookDeliveryStatus.PENDING,
-        )
-        db.add(delivery)
-        db.commit()
-
-        # Prepare the webhook payload
-        webhook_payload = {
-            "event_type": event_type,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "data": payload,
-            "delivery_id": delivery.id,
-        }
-
-        payload_str = json.dumps(webhook_payload, default=str)
-
-        # Generate signature if secret is provided
-        headers = {
-            "Content-Type": "application/json",
-            "User-Agent": f"TaskManager-Webhook/1.0",
-            "X-Webhook-Event": event_type,
-            "X-Webhook-Delivery": delivery.id,
-        }
-
-        if subscription.secret:
-            signature = generate_webhook_signature(payload_str, subscription.secret)
-            headers["X-Webhook-Signature-256"] = f"sha256={signature}"
-
-        # Deliver the webhook with retries
-        timeout_config = httpx.Timeout(
-            connect=5.0,  # 5 seconds to connect
-            read=30.0,  # 30 seconds to read response
-            write=10.0,  # 10 seconds to write request
-            pool=10.0,  # 10 seconds to get connection from pool
+        # Increment failure count
+        subscription.failure_count += 1
+        subscription.last_failure_at = delivery.delivered_at
+
+        logger.warning(
+            f"Webhook delivery failed to {subscription.url}: {response.status_code}"
         )
 
-        with httpx.Client(timeout=timeout_config) as client:
-            response = client.post(
-                subscription.url, content=payload_str, headers=headers
+        # Disable subscription after too many failures
+        if subscription.failure_count >= 10:
+            subscription.is_active = False
+            invalidate_webhook_cache(subscription.user_id)
+            logger.warning(
+                f"Disabled webhook subscription {subscription.id} after {subscription.failure_count} failures"
             )
 
-        # Update delivery status
-        delivery.delivered_at = datetime.now(timezone.utc)
-        delivery.response_status_code = response.status_code
-        delivery.response_headers = dict(response.headers)
-        delivery.response_body = response.text[:1000]  # Limit response body storage
 
-        if 200 <= response.status_code < 300:
-            delivery.status = WebhookDeliveryStatus.DELIVERED
-            logger.info(
-                f"Webhook delivered successfully to {subscription.url} for event {event_type}"
-            )
+async def _post_many(
+    requests: List[Tuple[str, bytes, Dict[str, str]]],
+) -> List[Union[httpx.Response, Exception]]:
+    """POST every (url, body, headers) concurrently, keeping request order."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DELIVERIES)
 
-            # Reset failure count on successful delivery
-            subscription.failure_count = 0
-            subscription.last_delivery_at = delivery.delivered_at
+    # An AsyncClient is bound to the event loop it first ran on, so each
+    # fan-out gets its own; connections are still pooled within the batch
+    async with httpx.AsyncClient(
+        timeout=http_client.timeout,
+        limits=httpx.Limits(max_connections=MAX_CONCURRENT_DELIVERIES),
+    ) as client:
 
-        else:
-            delivery.status = WebhookDeliveryStatus.FAILED
-            delivery.failure_reason = (
-                f"HTTP {response.status_code}: {response.text[:200]}"
-            )
+        async def post(url: str, content: bytes, headers: Dict[str, str]):
+            async with semaphore:
+                return await client.post(url, content=content, headers=headers)
 
-            # Increment failure count
-            subscription.failure_count += 1
-            subscription.last_failure_at = delivery.delivered_at
+        return await asyncio.gather(
+            *(post(*request) for request in requests), return_exceptions=True
+        )
 
-            logger.warning(
-                f"Webhook delivery failed to {subscription.url}: {response.status_code}"
+
+@celery_app.task(
+    bind=True,
+    queue="webhooks_io",
+    autoretry_for=(httpx.HTTPError,),
+    retry_backoff=RETRY_BACKOFF,
+    retry_backoff_max=RETRY_BACKOFF_MAX,
+    retry_jitter=True,
+    max_retries=MAX_DELIVERY_RETRIES,
+)
+def deliver_webhook(
+    self, subscription_id: str, event_type: str, payload: Dict[str, Any]
+):
+    """Deliver a webhook to a subscribed endpoint."""
+    with get_celery_db() as db:
+        try:
+            subscription = (
+                db.query(WebhookSubscription)
+                .filter(WebhookSubscription.id == subscription_id)
+                .first()
             )
 
-            # Disable subscription after too many failures
-            if subscription.failure_count >= 10:
-                subscription.is_active = False
-                logger.warning(
-                    f"Disabled webhook subscription {subscription_id} after {subscription.failure_count} failures"
+            if not subscription:
+                logger.warning(f"Webhook subscription {subscription_id} not found")
+                return {"success": False, "reason": "Subscription not found"}
+
+            if not subscription.is_active:
+                logger.info(f"Webhook subscription {subscription_id} is inactive")
+                return {"success": False, "reason": "Subscription inactive"}
+
+            # Check if this event type is subscribed to
+            if event_type not in subscription.events:
+                logger.debug(
+                    f"Event type {event_type} not subscribed for {subscription_id}"
                 )
+                return {"success": False, "reason": "Event not subscribed"}
+
+            # Create delivery record
+            delivery = WebhookDelivery(
+                subscription_id=subscription_id,
+                event_type=event_type,
+                payload=payload,
+                status=WebhookDeliveryStatus.PENDING,
+            )
+            db.add(delivery)
+            db.commit()
 
-        db.commit()
+            # Prepare the webhook payload
+            webhook_payload = {
+                "event_type": event_type,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "data": payload,
+                "delivery_id": delivery.id,
+            }
+
+            # Encoded once; the same bytes are signed and sent
+            payload_bytes = orjson.dumps(webhook_payload, default=str)
+
+            signature = (
+                generate_webhook_signature(payload_bytes, subscription.secret)
+                if subscription.secret
+                else None
+            )
+            headers = build_webhook_headers(event_type, delivery.id, signature)
 
-        return {
-            "success": delivery.status == WebhookDeliveryStatus.DELIVERED,
-            "delivery_id": delivery.id,
-            "status_code": response.status_code,
-            "subscription_id": subscription_id,
-        }
+            # Deliver the webhook over the worker's shared connection pool
+            response = http_client.post(
+                subscription.url, content=payload_bytes, headers=headers
+            )
 
-    except httpx.TimeoutException:
-        # Handle timeout specifically
-        delivery.status = WebhookDeliveryStatus.FAILED
-        delivery.failure_reason = "Request timeout"
-        subscription.failure_count += 1
-        subscription.last_failure_at = datetime.now(timezone.utc)
-        db.commit()
+            record_webhook_response(subscription, delivery, response)
+            db.commit()
 
-        logger.warning(f"Webhook delivery timeout to {subscription.url}")
-        raise self.retry(countdown=60 * (self.request.retries + 1), max_retries=3)
+            return {
+                "success": delivery.status == WebhookDeliveryStatus.DELIVERED,
+                "delivery_id": delivery.id,
+                "status_code": response.status_code,
+                "subscription_id": subscription_id,
+            }
 
-    except httpx.RequestError as e:
-        # Handle connection errors
-        delivery.status = WebhookDeliveryStatus.FAILED
-        delivery.failure_reason = f"Connection error: {str(e)}"
-        subscription.failure_count += 1
-        subscription.last_failure_at = datetime.now(timezone.utc)
-        db.commit()
+        except httpx.TimeoutException:
+            # Handle timeout specifically
+            delivery.status = WebhookDeliveryStatus.FAILED
+            delivery.failure_reason = "Request timeout"
+            subscription.failure_count += 1
+            subscription.last_failure_at = datetime.now(timezone.utc)
+            db.commit()
 
-        logger.error(
-            f"Webhook delivery connection error to {subscription.url}: {str(e)}"
-        )
-        raise self.retry(countdown=60 * (self.request.retries + 1), max_retries=3)
+            logger.warning(f"Webhook delivery timeout to {subscription.url}")
+            raise
 
-    except Exception as e:
-        # Handle other errors
-        if "delivery" in locals():
+        except httpx.RequestError as e:
+            # Handle connection errors
             delivery.status = WebhookDeliveryStatus.FAILED
-            delivery.failure_reason = f"Error: {str(e)}"
+            delivery.failure_reason = f"Connection error: {str(e)}"
+            subscription.failure_count += 1
+            subscription.last_failure_at = datetime.now(timezone.utc)
             db.commit()
 
-        logger.error(f"Webhook delivery error: {str(e)}")
-        raise self.retry(countdown=60 * (self.request.retries + 1), max_retries=3)
+            logger.error(
+                f"Webhook delivery connection error to {subscription.url}: {str(e)}"
+            )
+            raise
 
+        except Exception as e:
+            # Handle other errors
+            if "delivery" in locals():
+                delivery.status = WebhookDeliveryStatus.FAILED
+                delivery.failure_reason = f"Error: {str(e)}"
+                db.commit()
 
-@celery_app.task(bind=True, base=DatabaseTask, queue="webhooks")
-def broadcast_webhook_event(
+            logger.error(f"Webhook delivery error: {str(e)}")
+            raise
+
+
+@celery_app.task(bind=True, queue="webhooks_io")
+def deliver_webhook_event(
     self,
-    db: Session,
+    delivery_ids: List[str],
     event_type: str,
     payload: Dict[str, Any],
-    user_id: Optional[str] = None,
 ):
-    """Broadcast a webhook event to all applicable subscriptions."""
+    """Send the pre-created deliveries of one event concurrently."""
     try:
-        # Get all active subscriptions for this event type
-        query = db.query(WebhookSubscription).filter(
-            WebhookSubscription.is_active == True,
-            WebhookSubscription.events.contains([event_type]),
-        )
+        with get_celery_db() as db:
+            deliveries = (
+                db.query(WebhookDelivery)
+                .options(joinedload(WebhookDelivery.subscription))
+                .filter(
+                    WebhookDelivery.id.in_(delivery_ids),
+                    WebhookDelivery.status != WebhookDeliveryStatus.DELIVERED,
+                )
+                .all()
+            )
 
-        # Filter by user if specified
-        if user_id:
-            query = query.filter(WebhookSubscription.user_id == user_id)
-
-        subscriptions = query.all()
-
-        if not subscriptions:
-            logger.debug(f"No active subscriptions found for event {event_type}")
-            return {"success": True, "delivered_count": 0}
-
-        # Queue delivery for each subscription
-        delivery_tasks = []
-        for subscription in subscriptions:
-            try:
-                task = deliver_webhook.delay(subscription.id, event_type, payload)
-                delivery_tasks.append(task.id)
-            except Exception as e:
-                logger.error(
-                    f"Failed to queue webhook delivery for subscription {subscription.id}: {str(e)}"
+            # Subscribers receive the stored payload plus their delivery_id. The
+            # payload is serialized once and each delivery_id is spliced in
+            payload_bytes = orjson.dumps(payload, default=str)
+            sending = []
+            requests = []
+            for delivery in deliveries:
+                subscription = delivery.subscription
+                if not subscription.is_active:
+                    delivery.status = WebhookDeliveryStatus.FAILED
+                    delivery.failure_reason = "Subscription inactive"
+                    continue
+
+                body = _with_delivery_id(payload_bytes, delivery.id)
+                signature = (
+                    generate_webhook_signature(body, subscription.secret)
+                    if subscription.secret
+                    else None
                 )
+                headers = build_webhook_headers(event_type, delivery.id, signature)
+                sending.append(delivery)
+                requests.append((subscription.url, body, headers))
+
+            results = asyncio.run(_post_many(requests)) if requests else []
+
+            for delivery, result in zip(sending, results):
+                subscription = delivery.subscription
+                if isinstance(result, Exception):
+                    delivery.status = WebhookDeliveryStatus.FAILED
+                    delivery.failure_reason = (
+                        "Request timeout"
+                        if isinstance(result, httpx.TimeoutException)
+                        else f"Connection error: {str(result)}"
+                    )
+                    subscription.failure_count += 1
+                    subscription.last_failure_at = datetime.now(timezone.utc)
+                    logger.warning(
+                        f"Webhook delivery error to {subscription.url}: {str(result)}"
+                    )
+                else:
+                    record_webhook_response(subscription, delivery, result)
+
+            # Failed sends to active subscriptions are retried by the broker
+            failed_ids = [
+                delivery.id
+                for delivery in sending
+                if delivery.status == WebhookDeliveryStatus.FAILED
+                and delivery.subscription.is_active
+            ]
+            retrying = bool(failed_ids) and self.request.retries < MAX_DELIVERY_RETRIES
+            if retrying:
+                for delivery in sending:
+                    if delivery.id in failed_ids:
+                        delivery.retry_count = self.request.retries + 1
+
+            # Rows were inserted by record_event_deliveries; only their outcome
+            # is written
+            db.commit()
 
-        logger.info(
-            f"Queued {len(delivery_tasks)} webhook deliveries for event {event_type}"
-        )
-        return {
-            "success": True,
-            "delivered_count": len(delivery_tasks),
-            "delivery_task_ids": delivery_tasks,
-        }
+            delivered = sum(
+                delivery.status == WebhookDeliveryStatus.DELIVERED
+                for delivery in deliveries
+            )
+            logger.info(
+                f"Delivered event {event_type} to {delivered}/{len(deliveries)} webhooks"
+            )
+
+            if retrying:
+                # Only the failed deliveries go back on the queue
+                raise self.retry(
+                    args=[failed_ids, event_type, payload],
+                    countdown=get_exponential_backoff_interval(
+                        factor=RETRY_BACKOFF,
+                        retries=self.request.retries,
+                        maximum=RETRY_BACKOFF_MAX,
+                        full_jitter=True,
+                    ),
+                    max_retries=MAX_DELIVERY_RETRIES,
+                )
+
+            return {
+                "success": True,
+                "delivered_count": delivered,
+                "delivery_ids": [delivery.id for delivery in deliveries],
+            }
+
+    except Retry:
+        raise
 
     except Exception as e:
-        logger.error(f"Failed to broadcast webhook event {event_type}: {str(e)}")
-        raise self.retry(countdown=60, max_retries=3)
+        logger.error(f"Failed to deliver webhook event {event_type}: {str(e)}")
+        raise self.retry(countdown=60, max_retries=MAX_DELIVERY_RETRIES)
 
 
-@celery_app.task(bind=True, base=DatabaseTask, queue="webhooks")
-def retry_failed_webhooks(self, db: Session, max_age_hours: int = 24):
-    """Retry failed webhook deliveries that are not too old."""
+@celery_app.task(bind=True, queue="webhooks")
+def broadcast_webhook_event(
+    self,
+    event_type: str,
+    payload: Dict[str, Any],
+    user_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    timestamp: Optional[str] = None,
+    event_id: Optional[str] = None,
+):
+    """Broadcast a webhook event to all applicable subscriptions."""
     try:
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=max_age_hours)
-
-        # Find failed deliveries to retry
-        failed_deliveries = (
-            db.query(WebhookDelivery)
-            .filter(
-                WebhookDelivery.status == WebhookDeliveryStatus.FAILED,
-                WebhookDelivery.created_at >= cutoff_time,
-                WebhookDelivery.retry_count < 3,  # Limit retries
+        with get_celery_db() as db:
+            # Subscriptions are resolved here rather than in the request that
+            # published the event; the sends go out through deliver_webhook_event
+            delivered_count = WebhookService.record_event_deliveries(
+                db,
+                [
+                    {
+                        "event_type": event_type,
+                        "payload": payload,
+                        "user_id": user_id,
+                        "project_id": project_id,
+                        "timestamp": timestamp,
+                        "event_id": event_id,
+                    }
+                ],
             )
-            .all()
-        )
+            return {"success": True, "delivered_count": delivered_count}
 
-        retry_count = 0
-        for delivery in failed_deliveries:
-            try:
-                # Increment retry count
-                delivery.retry_count += 1
-                db.commit()
-
-                # Queue for retry
-                deliver_webhook.delay(
-                    delivery.subscription_id, delivery.event_type, delivery.payload
-                )
-                retry_count += 1
+    except Exception as e:
+        logger.error(f"Failed to broadcast webhook event {event_type}: {str(e)}")
+        raise self.retry(countdown=60, max_retries=3)
 
-            except Exception as e:
-                logger.error(
-                    f"Failed to queue retry for delivery {delivery.id}: {str(e)}"
-                )
 
-        logger.info(f"Queued {retry_count} webhook deliveries for retry")
-        return {"success": True, "retry_count": retry_count}
+@celery_app.task(bind=True, queue="webhooks")
+def broadcast_webhook_events(self, events: List[Dict[str, Any]]):
+    """Broadcast a batch of webhook events, resolving subscriptions once."""
+    try:
+        with get_celery_db() as db:
+            delivered_count = WebhookService.record_event_deliveries(db, events)
+            return {"success": True, "delivered_count": delivered_count}
 
     except Exception as e:
-        logger.error(f"Failed to retry webhook deliveries: {str(e)}")
-        raise self.retry(countdown=300, max_retries=2)
+        logger.error(f"Failed to broadcast {len(events)} webhook events: {str(e)}")
+        raise self.retry(countdown=60, max_retries=3)
 
 
-@celery_app.task(bind=True, base=DatabaseTask, queue="webhooks")
-def cleanup_old_webhook_deliveries(self, db: Session, keep_days: int = 30):
+@celery_app.task(bind=True, queue="webhooks")
+def cleanup_old_webhook_deliveries(self, keep_days: int = 30):
     """Clean up old webhook delivery records."""
     try:
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=keep_days)
-
-        # Delete old delivery records
-        deleted_count = (
-            db.query(WebhookDelivery)
-            .filter(WebhookDelivery.created_at < cutoff_date)
-            .delete()
-        )
+        with get_celery_db() as db:
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=keep_days)
+
+            # Delete old delivery records
+            deleted_count = (
+                db.query(WebhookDelivery)
+                .filter(WebhookDelivery.created_at < cutoff_date)
+                .delete()
+            )
 
-        db.commit()
+            db.commit()
 
-        logger.info(f"Cleaned up {deleted_count} old webhook delivery records")
-        return {"success": True, "deleted_count": deleted_count}
+            logger.info(f"Cleaned up {deleted_count} old webhook delivery records")
+            return {"success": True, "deleted_count": deleted_count}
 
     except Exception as e:
         logger.error(f"Failed to cleanup webhook deliveries: {str(e)}")
         raise self.retry(countdown=300, max_retries=2)
 
 
-@celery_app.task(bind=True, base=DatabaseTask, queue="webhooks")
-def test_webhook_endpoint(self, db: Session, subscription_id: str):
+@celery_app.task(bind=True, queue="webhooks")
+def test_webhook_endpoint(self, subscription_id: str):
     """Test a webhook endpoint with a ping event."""
     try:
-        subscription = (
-            db.query(WebhookSubscription)
-            .filter(WebhookSubscription.id == subscription_id)
-            .first()
-        )
+        with get_celery_db() as db:
+            subscription = (
+                db.query(WebhookSubscription)
+                .filter(WebhookSubscription.id == subscription_id)
+                .first()
+            )
 
-        if not subscription:
-            return {"success": False, "reason": "Subscription not found"}
+            if not subscription:
+                return {"success": False, "reason": "Subscription not found"}
 
-        # Send a test ping
-        test_payload = {
-            "message": "This is a test webhook from Task Manager",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "subscription_id": subscription_id,
-        }
+            # Send a test ping
+            test_payload = {
+                "message": "This is a test webhook from Task Manager",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "subscription_id": subscription_id,
+            }
 
-        result = deliver_webhook.delay(subscription_id, "webhook.ping", test_payload)
+            result = deliver_webhook.delay(
+                subscription_id, "webhook.ping", test_payload
+            )
 
-        logger.info(f"Queued test webhook for subscription {subscription_id}")
-        return {
-            "success": True,
-            "test_delivery_task_id": result.id,
-            "subscription_id": subscription_id,
-        }
+            logger.info(f"Queued test webhook for subscription {subscription_id}")
+            return {
+                "success": True,
+                "test_delivery_task_id": result.id,
+                "subscription_id": subscription_id,
+            }
 
     except Exception as e:
         logger.error(f"Failed to test webhook endpoint {subscription_id}: {str(e)}")
@@ -134,7 +134,7 @@ import redis
 from app.core.config import settings
 try:
     r = redis.Redis.from_url(settings.redis_url)
-    queues = ['default', 'notifications', 'recurring', 'webhooks', 'analytics', 'reminders']
+    queues = ['default', 'notifications', 'recurring', 'webhooks', 'webhooks_io', 'analytics', 'reminders', 'activities']
     for queue in queues:
         length = r.llen(queue)
         print(f'  {queue}: {length} tasks')
@@ -296,16 +296,16 @@ start_workers() {
         local logfile="$LOG_DIR/${worker_name}.log"
         
         # Define queues for this worker
-        local queues="default,notifications,recurring,webhooks,analytics,reminders"
+        local queues="default,notifications,recurring,webhooks,webhooks_io,analytics,reminders,activities"
         if [[ $i -eq 1 ]]; then
             # First worker handles all queues
-            queues="default,notifications,recurring,webhooks,analytics,reminders"
+            queues="default,notifications,recurring,webhooks,webhooks_io,analytics,reminders,activities"
         elif [[ $i -eq 2 ]]; then
             # Second worker focuses on notifications and reminders
             queues="notifications,reminders,default"
         else
             # Additional workers handle default and specific queues
-            queues="default,analytics,webhooks"
+            queues="default,analytics,webhooks,webhooks_io,activities"
         fi
         
         echo -e "  Starting $worker_name (queues: $queues)"
@@ -22,7 +22,7 @@ fi
 WORKER_NAME="worker1"
 CONCURRENCY=4
 LOGLEVEL="info"
-QUEUES="default,notifications,recurring,webhooks,analytics,reminders"
+QUEUES="default,notifications,recurring,webhooks,webhooks_io,analytics,reminders,activities"
 PIDFILE=""
 LOGFILE=""
 DETACH=false
@@ -136,11 +136,6 @@ def test_webhook_service():
             )
             print("✅ Webhook triggers queued")
 
-            # Test retry_failed_deliveries
-            print("Testing retry_failed_deliveries...")
-            WebhookService.retry_failed_deliveries(db)
-            print("✅ Webhook retry task queued")
-
             assert True, "Test passed"
 
         except Exception as e:
@@ -186,7 +181,6 @@ def check_celery_tasks():
         "app.tasks.recurring.process_recurring_tasks",
         "app.tasks.recurring.create_recurring_task_instance",
         "app.tasks.webhooks.deliver_webhook",
-        "app.tasks.webhooks.retry_failed_webhooks",
         "app.tasks.reminders.send_reminder_notifications",
         "app.tasks.reminders.send_task_reminder",
     ]
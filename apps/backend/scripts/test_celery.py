@@ -53,10 +53,13 @@ def test_task_registration():
         "app.tasks.recurring.create_recurring_task_instance",
         "app.tasks.webhooks.deliver_webhook",
         "app.tasks.webhooks.broadcast_webhook_event",
+        "app.tasks.webhooks.deliver_webhook_event",
         "app.tasks.analytics.precompute_analytics",
         "app.tasks.analytics.compute_user_analytics",
         "app.tasks.reminders.send_reminder_notifications",
         "app.tasks.reminders.send_task_reminder",
+        "app.tasks.activities.log_activity_dispatch",
+        "app.tasks.activities.log_bulk_activities_async",
     ]
 
     registered_tasks = list(celery_app.tasks.keys())
@@ -85,8 +88,10 @@ def test_queue_configuration():
         "notifications",
         "recurring",
         "webhooks",
+        "webhooks_io",
         "analytics",
         "reminders",
+        "activities",
     ]
     configured_queues = [q.name for q in celery_app.conf.task_queues]
 
@@ -159,9 +164,13 @@ def test_task_routing():
     test_cases = [
         ("app.tasks.notifications.send_email_notification", "notifications"),
         ("app.tasks.recurring.process_recurring_tasks", "recurring"),
-        ("app.tasks.webhooks.deliver_webhook", "webhooks"),
+        ("app.tasks.webhooks.deliver_webhook", "webhooks_io"),
+        ("app.tasks.webhooks.deliver_webhook_event", "webhooks_io"),
+        ("app.tasks.webhooks.broadcast_webhook_event", "webhooks"),
         ("app.tasks.analytics.precompute_analytics", "analytics"),
         ("app.tasks.reminders.send_reminder_notifications", "reminders"),
+        ("app.tasks.activities.log_activity_dispatch", "activities"),
+        ("app.tasks.activities.log_bulk_activities_async", "activities"),
     ]
 
     routes = celery_app.conf.task_routes
@@ -213,8 +222,10 @@ def test_redis_queues():
             "notifications",
             "recurring",
             "webhooks",
+            "webhooks_io",
             "analytics",
             "reminders",
+            "activities",
         ]
         for queue in queues:
             length = r.llen(queue)
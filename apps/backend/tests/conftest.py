@@ -4,8 +4,9 @@ Pytest configuration and shared fixtures for all tests.
 
 import os
 import sys
+from contextlib import contextmanager
 from typing import Generator
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -22,6 +23,7 @@ from datetime import timedelta
 from app.core.middleware.jwt_auth_backend import (create_access_token,
                                                   get_password_hash)
 from app.db.database import Base, get_db
+from app.core.celery_app import celery_app
 from app.db.models import Task, User
 from app.main import app
 
@@ -256,6 +258,28 @@ def mock_db() -> Mock:
     return mock
 
 
+@pytest.fixture
+def eager_celery(test_db: Session) -> Generator[None, None, None]:
+    """
+    Run tasks sent with .delay() inline, with the test database session.
+    """
+
+    @contextmanager
+    def task_db():
+        yield test_db
+        test_db.commit()
+
+    previous = celery_app.conf.task_always_eager
+    celery_app.conf.task_always_eager = True
+    try:
+        with patch("app.tasks.webhooks.get_celery_db", task_db), patch(
+            "app.tasks.analytics.get_celery_db", task_db
+        ):
+            yield
+    finally:
+        celery_app.conf.task_always_eager = previous
+
+
 # Pytest configuration
 def pytest_configure(config):
     """
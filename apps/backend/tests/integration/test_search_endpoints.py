@@ -8,8 +8,8 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
-from app.db.models import (Category, SavedSearch, Tag, Task, TaskPriority,
-                           TaskStatus, User)
+from app.db.models import (Category, Project, SavedSearch, Tag, Task,
+                           TaskPriority, TaskStatus, User)
 
 
 class TestSearchEndpoints:
@@ -126,7 +126,14 @@ class TestSearchEndpoints:
             id="cat1", name="Work", color="#0000FF", user_id=test_user.id
         )
         tag = Tag(id="tag1", name="urgent", color="#FF0000", user_id=test_user.id)
-        test_db.add_all([category, tag])
+        project = Project(id="proj1", name="Alpha", owner_id=test_user.id)
+        task = Task(
+            id="task1",
+            title="Assigned task",
+            user_id=test_user.id,
+            assigned_to_id=test_user.id,
+        )
+        test_db.add_all([category, tag, project, task])
         test_db.commit()
 
         response = test_client.get("/search/suggestions", headers=auth_headers)
@@ -148,6 +155,10 @@ class TestSearchEndpoints:
         assert data["categories"][0]["name"] == "Work"
         assert len(data["tags"]) == 1
         assert data["tags"][0]["name"] == "urgent"
+        assert data["assigned_users"] == [
+            {"id": test_user.id, "username": test_user.username}
+        ]
+        assert data["projects"] == [{"id": "proj1", "name": "Alpha"}]
 
     def test_saved_search_crud(
         self,
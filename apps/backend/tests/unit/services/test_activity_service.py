@@ -0,0 +1,120 @@
+"""
+Unit tests for ActivityService
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.models import ActivityType, Task, TaskActivity, User
+from app.services.activity_service import ActivityService
+from app.tasks.activities import _insert_activities, _is_repeat
+
+
+@pytest.mark.unit
+class TestCleanupOldActivities:
+    """Test retention cleanup of activities"""
+
+    def test_deletes_old_activities_in_batches(
+        self, test_db: Session, test_user: User, test_task: Task
+    ):
+        """Test every old activity is removed across batches, recent ones are kept"""
+        # Arrange
+        old = [
+            TaskActivity(
+                task_id=test_task.id,
+                user_id=test_user.id,
+                activity_type=ActivityType.TITLE_CHANGED,
+                created_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+            )
+            for _ in range(3)
+        ]
+        recent = TaskActivity(
+            task_id=test_task.id,
+            user_id=test_user.id,
+            activity_type=ActivityType.TITLE_CHANGED,
+            created_at=datetime.now(timezone.utc),
+        )
+        test_db.add_all([*old, recent])
+        test_db.commit()
+
+        # Act
+        deleted = ActivityService.cleanup_old_activities(test_db, batch_size=2)
+
+        # Assert
+        assert deleted == 3
+        assert [a.id for a in test_db.query(TaskActivity).all()] == [recent.id]
+
+
+@pytest.mark.unit
+class TestBatchedActivityInsert:
+    """Test inserting buffered activity entries"""
+
+    def test_redelivered_entries_are_inserted_once(
+        self, test_db: Session, test_user: User, test_task: Task
+    ):
+        """Test a retried batch writes no duplicate rows and skips bad entries"""
+        # Arrange
+        entries = [
+            {
+                "kind": "title_change",
+                "payload": {
+                    "task_id": test_task.id,
+                    "user_id": test_user.id,
+                    "old_title": "Old",
+                    "new_title": "New",
+                },
+                "activity_id": "0b6f3c4e-8a51-4d6c-9f0e-2b7d1a3c5e90",
+            },
+            {
+                "kind": "task_completed",
+                "payload": {"task_id": "missing", "user_id": test_user.id},
+                "activity_id": "5d2e8f1a-3c47-4b9e-8a60-7f1c2d3e4b5a",
+            },
+        ]
+
+        # Act
+        first = _insert_activities(test_db, entries)
+        test_db.commit()
+        second = _insert_activities(test_db, entries)
+        test_db.commit()
+
+        # Assert
+        assert (first, second) == (1, 0)
+        activity = test_db.query(TaskActivity).one()
+        assert activity.activity_type == ActivityType.TITLE_CHANGED
+        assert activity.new_value == "New"
+
+    def test_session_logs_directly_after_batch(
+        self, test_db: Session, test_user: User, test_task: Task
+    ):
+        """Test log_activity writes its row once a batch has been inserted"""
+        # Arrange
+        _insert_activities(test_db, [])
+        test_db.commit()
+
+        # Act
+        ActivityService.log_task_completed(test_db, test_task.id, test_user.id)
+
+        # Assert
+        assert "activity_batch" not in test_db.info
+        activity = test_db.query(TaskActivity).one()
+        assert activity.activity_type == ActivityType.COMPLETED
+
+
+@pytest.mark.unit
+class TestActivityDedup:
+    """Test dropping repeated activities at the queue boundary"""
+
+    def test_only_identical_repeats_are_dropped(self):
+        """Test a double submit is dropped while a toggled value is kept"""
+        # Arrange
+        to_done = {"task_id": "dedup-task", "old_status": "todo", "new_status": "done"}
+        to_todo = {"task_id": "dedup-task", "old_status": "done", "new_status": "todo"}
+
+        # Act / Assert
+        assert not _is_repeat("status_change", to_done)
+        assert _is_repeat("status_change", dict(to_done))
+        assert not _is_repeat("status_change", to_todo)
+        assert not _is_repeat("status_change", to_done)
@@ -0,0 +1,49 @@
+"""
+Unit tests for AnalyticsService
+"""
+
+import csv
+import io
+import uuid
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.models import Task, TaskPriority, TaskStatus, User
+from app.services.analytics_service import AnalyticsService
+
+
+@pytest.mark.unit
+class TestTaskExport:
+    """Test streaming task exports"""
+
+    def test_csv_export_chunks_task_ids(self, test_db: Session, test_user: User):
+        """Test selected tasks are exported once each across id chunks"""
+        # Arrange
+        tasks = [
+            Task(
+                id=str(uuid.uuid4()),
+                title=f"Task {i}",
+                status=TaskStatus.TODO,
+                priority=TaskPriority.MEDIUM,
+                user_id=test_user.id,
+                position=i,
+            )
+            for i in range(5)
+        ]
+        test_db.add_all(tasks)
+        test_db.commit()
+        selected = [task.id for task in tasks[:4]]
+        output = io.StringIO()
+
+        # Act
+        with patch("app.services.analytics_service.EXPORT_ID_CHUNK_SIZE", 2):
+            AnalyticsService.write_tasks_csv(
+                test_db, test_user.id, output, [*selected, selected[0], "missing"]
+            )
+
+        # Assert
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        assert rows[0][0] == "ID"
+        assert sorted(row[0] for row in rows[1:]) == sorted(selected)
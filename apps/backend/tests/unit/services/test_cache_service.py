@@ -0,0 +1,160 @@
+"""
+Unit tests for CacheService
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.cache_service import CacheService, jittered_ttl
+
+
+@pytest.fixture
+def redis_client() -> MagicMock:
+    """Redis client mock behind the cache service"""
+    return MagicMock()
+
+
+@pytest.fixture
+def cache(redis_client: MagicMock) -> CacheService:
+    """Cache service talking to the mocked Redis client"""
+    with patch.object(CacheService, "_initialize_connection"):
+        service = CacheService()
+    service._redis_client = redis_client
+    return service
+
+
+@pytest.mark.unit
+class TestDeletePatterns:
+    """Test deleting keys by pattern"""
+
+    def test_single_pattern_is_matched_by_redis(
+        self, cache: CacheService, redis_client: MagicMock
+    ):
+        """Test one pattern is passed to SCAN and keys are unlinked in batches"""
+        # Arrange
+        redis_client.scan_iter.return_value = iter([f"a:{i}" for i in range(5)])
+        redis_client.unlink.side_effect = lambda *keys: len(keys)
+
+        # Act
+        deleted = cache.delete_patterns(["a:*"], batch_size=2)
+
+        # Assert
+        assert deleted == 5
+        redis_client.scan_iter.assert_called_once_with(match="a:*", count=1000)
+        redis_client.keys.assert_not_called()
+        assert [len(call.args) for call in redis_client.unlink.call_args_list] == [
+            2,
+            2,
+            1,
+        ]
+
+    def test_several_patterns_scan_once(
+        self, cache: CacheService, redis_client: MagicMock
+    ):
+        """Test several patterns share one keyspace scan"""
+        # Arrange
+        redis_client.scan_iter.return_value = iter(["a:1", "b:1", "c:1", "b:2"])
+        redis_client.unlink.side_effect = lambda *keys: len(keys)
+
+        # Act
+        deleted = cache.delete_patterns(["a:*", "b:*"])
+
+        # Assert
+        assert deleted == 3
+        redis_client.scan_iter.assert_called_once_with(count=1000)
+        redis_client.unlink.assert_called_once_with("a:1", "b:1", "b:2")
+
+
+@pytest.mark.unit
+class TestExistsMulti:
+    """Test probing several keys at once"""
+
+    def test_keys_are_probed_in_one_pipeline(
+        self, cache: CacheService, redis_client: MagicMock
+    ):
+        """Test every key is checked through a single pipeline"""
+        # Arrange
+        pipeline = redis_client.pipeline.return_value
+        pipeline.execute.return_value = [1, 0]
+
+        # Act
+        found = cache.exists_multi(["a", "b"])
+
+        # Assert
+        assert found == {"a": True, "b": False}
+        assert pipeline.exists.call_count == 2
+        pipeline.execute.assert_called_once()
+
+
+@pytest.mark.unit
+class TestLocks:
+    """Test the per-key compute lock"""
+
+    def test_acquire_returns_token(self, cache: CacheService, redis_client: MagicMock):
+        """Test a free lock is set with NX and an expiry"""
+        # Arrange
+        redis_client.set.return_value = True
+
+        # Act
+        token = cache.acquire_lock("job", ttl_ms=1000)
+
+        # Assert
+        redis_client.set.assert_called_once_with("lock:job", token, nx=True, px=1000)
+
+    def test_acquire_held_lock_returns_none(
+        self, cache: CacheService, redis_client: MagicMock
+    ):
+        """Test a lock someone else holds is not granted"""
+        # Arrange
+        redis_client.set.return_value = None
+
+        # Act & Assert
+        assert cache.acquire_lock("job") is None
+
+    def test_release_checks_token(self, cache: CacheService, redis_client: MagicMock):
+        """Test the lock is only deleted while it holds the caller's token"""
+        # Arrange
+        redis_client.eval.return_value = 1
+
+        # Act
+        released = cache.release_lock("job", "token")
+
+        # Assert
+        assert released is True
+        redis_client.eval.assert_called_once_with(
+            CacheService._RELEASE_LOCK_SCRIPT, 1, "lock:job", "token"
+        )
+
+
+@pytest.mark.unit
+class TestJitter:
+    """Test TTL jitter"""
+
+    @pytest.mark.parametrize("sample", [0.0, 0.5, 0.999])
+    def test_jittered_ttl_stays_within_spread(self, sample: float):
+        """Test the TTL moves by at most the spread"""
+        # Act
+        with patch("app.services.cache_service.random.random", return_value=sample):
+            ttl = jittered_ttl(1000)
+
+        # Assert
+        assert 900 <= ttl <= 1100
+
+    def test_set_multi_jitters_each_key(
+        self, cache: CacheService, redis_client: MagicMock
+    ):
+        """Test keys written together get their own expiry"""
+        # Arrange
+        pipeline = redis_client.pipeline.return_value
+        pipeline.execute.return_value = [True, True, True]
+
+        # Act
+        with patch("app.services.cache_service.random.random", side_effect=[0.0, 1.0]):
+            cache.set_multi({"a": 1, "b": 2}, ttl=1000, jitter=True)
+
+        # Assert
+        assert [call.args for call in pipeline.expire.call_args_list] == [
+            ("a", 900),
+            ("b", 1100),
+        ]
@@ -0,0 +1,171 @@
+"""
+Unit tests for RefreshTokenService
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from jose import jwt
+from sqlalchemy.orm import Session
+
+from app.db.models import RefreshToken, User
+from app.services.refresh_token_service import RefreshTokenService
+
+
+@pytest.mark.unit
+class TestRefreshTokenRotation:
+    """Test refresh token rotation and reuse detection"""
+
+    def test_rotate_valid_token(self, test_db: Session, test_user: User):
+        """Test rotating a valid token revokes it and issues a new one"""
+        # Arrange
+        refresh_token, family, _ = RefreshTokenService.create_refresh_token(
+            test_db, test_user.id
+        )
+
+        # Act
+        (
+            access_token,
+            new_refresh_token,
+            new_family,
+            new_expiry,
+        ) = RefreshTokenService.validate_and_rotate_token(test_db, refresh_token)
+
+        # Assert
+        assert access_token is not None
+        assert new_refresh_token not in (None, refresh_token)
+        assert new_family == family
+        assert new_expiry is not None
+
+        old_token = (
+            test_db.query(RefreshToken)
+            .filter(
+                RefreshToken.token_hash
+                == RefreshTokenService._hash_token(refresh_token)
+            )
+            .one()
+        )
+        test_db.refresh(old_token)
+        assert old_token.is_revoked is True
+        assert old_token.revoke_reason == "rotated"
+        assert old_token.last_used_at is not None
+
+    def test_rotated_token_cannot_be_reused(self, test_db: Session, test_user: User):
+        """Test a rotated token is rejected without revoking its family"""
+        # Arrange
+        refresh_token, family, _ = RefreshTokenService.create_refresh_token(
+            test_db, test_user.id
+        )
+        _, new_refresh_token, _, _ = RefreshTokenService.validate_and_rotate_token(
+            test_db, refresh_token
+        )
+
+        # Act
+        result = RefreshTokenService.validate_and_rotate_token(test_db, refresh_token)
+
+        # Assert
+        assert result == (None, None, None, None)
+        assert (
+            RefreshTokenService.validate_and_rotate_token(test_db, new_refresh_token)[1]
+            is not None
+        )
+
+    def test_unknown_token_revokes_family(self, test_db: Session, test_user: User):
+        """Test a validly signed token missing from the database revokes its family"""
+        # Arrange
+        refresh_token, family, _ = RefreshTokenService.create_refresh_token(
+            test_db, test_user.id
+        )
+        test_db.query(RefreshToken).delete()
+        RefreshTokenService.create_refresh_token_with_family(
+            test_db, test_user.id, family
+        )
+        test_db.commit()
+
+        # Act
+        result = RefreshTokenService.validate_and_rotate_token(test_db, refresh_token)
+
+        # Assert
+        assert result == (None, None, None, None)
+        assert (
+            test_db.query(RefreshToken)
+            .filter(RefreshToken.family == family, RefreshToken.is_revoked == False)
+            .count()
+            == 0
+        )
+
+
+@pytest.mark.unit
+class TestUserSessions:
+    """Test session listing"""
+
+    def test_one_session_per_family(self, test_db: Session, test_user: User):
+        """Test active tokens are collapsed to one session per family"""
+        # Arrange
+        _, family, _ = RefreshTokenService.create_refresh_token(test_db, test_user.id)
+        RefreshTokenService.create_refresh_token_with_family(
+            test_db, test_user.id, family
+        )
+        test_db.commit()
+        _, other_family, _ = RefreshTokenService.create_refresh_token(
+            test_db, test_user.id
+        )
+
+        # Act
+        sessions = RefreshTokenService.get_user_sessions(test_db, test_user.id)
+
+        # Assert
+        assert sorted(session.id for session in sessions) == sorted(
+            [family, other_family]
+        )
+
+
+@pytest.mark.unit
+class TestCleanupExpiredTokens:
+    """Test expired token cleanup"""
+
+    def test_cleanup_deletes_only_expired_in_batches(
+        self, test_db: Session, test_user: User
+    ):
+        """Test expired tokens are removed across several batches"""
+        # Arrange
+        for _ in range(5):
+            RefreshTokenService.create_refresh_token(test_db, test_user.id)
+        test_db.query(RefreshToken).update(
+            {"expires_at": datetime.now(timezone.utc) - timedelta(days=1)}
+        )
+        test_db.commit()
+        RefreshTokenService.create_refresh_token(test_db, test_user.id)
+
+        # Act
+        deleted = RefreshTokenService.cleanup_expired_tokens(test_db, batch_size=2)
+
+        # Assert
+        assert deleted == 5
+        assert test_db.query(RefreshToken).count() == 1
+
+
+@pytest.mark.unit
+class TestDecodeCache:
+    """Test the short-lived decode memo"""
+
+    def test_retried_token_is_verified_once(self, test_db: Session, test_user: User):
+        """Test decoding the same token twice only verifies the signature once"""
+        # Arrange
+        refresh_token, family, _ = RefreshTokenService.create_refresh_token(
+            test_db, test_user.id
+        )
+        token_hash = RefreshTokenService._hash_token(refresh_token)
+
+        # Act
+        with patch(
+            "app.services.refresh_token_service.jwt.decode", wraps=jwt.decode
+        ) as mock_decode:
+            first = RefreshTokenService._decode_token(refresh_token, token_hash)
+            second = RefreshTokenService._decode_token(refresh_token, token_hash)
+
+        # Assert
+        assert first == second
+        assert first["family"] == family
+        mock_decode.assert_called_once()
@@ -6,10 +6,11 @@ from datetime import datetime, timezone
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Session
 
-from app.db.models import (Category, Project, Tag, Task, TaskPriority,
-                           TaskStatus, User)
+from app.db.models import (Category, Project, ProjectMember, ProjectRole, Tag,
+                           Task, TaskPriority, TaskStatus, User)
 from app.services.search_service import (SearchOperator, SearchService,
                                          TaskSearchFilter, TaskSearchQuery)
 
@@ -54,8 +55,8 @@ class TestSearchService:
 
         # Mock query chain
         mock_query.filter.return_value = mock_query
-        mock_query.union.return_value = mock_query
-        mock_query.count.return_value = 2
+        mock_query.params.return_value = mock_query
+        mock_db.scalar.return_value = 2
         mock_query.order_by.return_value = mock_query
         mock_query.all.return_value = [
             Mock(spec=Task, id="1", title="Fix login bug"),
@@ -70,7 +71,7 @@ class TestSearchService:
         assert len(tasks) == 2
         mock_query.filter.assert_called()
 
-    def test_apply_filter_operators(self):
+    def test_apply_filter_operators(self, monkeypatch):
         """Test filter operator application."""
         mock_query = Mock()
         mock_field = Mock()
@@ -80,7 +81,7 @@ class TestSearchService:
 
         # Test EQUALS
         filter_eq = TaskSearchFilter("status", SearchOperator.EQUALS, "todo")
-        SearchService.FIELD_MAPPING = {"status": mock_field}
+        monkeypatch.setattr(SearchService, "FIELD_MAPPING", {"status": mock_field})
         result = SearchService._apply_filter(mock_query, filter_eq)
         mock_query.filter.assert_called()
 
@@ -88,7 +89,7 @@ class TestSearchService:
         mock_query.reset_mock()
         mock_query.filter.return_value = mock_query
         filter_contains = TaskSearchFilter("title", SearchOperator.CONTAINS, "test")
-        SearchService.FIELD_MAPPING = {"title": mock_field}
+        monkeypatch.setattr(SearchService, "FIELD_MAPPING", {"title": mock_field})
         result = SearchService._apply_filter(mock_query, filter_contains)
         mock_query.filter.assert_called()
 
@@ -98,13 +99,37 @@ class TestSearchService:
         filter_in = TaskSearchFilter(
             "status", SearchOperator.IN, ["todo", "in_progress"]
         )
-        SearchService.FIELD_MAPPING = {
-            "status": mock_field
-        }  # Re-set mapping after reset
+        monkeypatch.setattr(
+            SearchService, "FIELD_MAPPING", {"status": mock_field}
+        )  # Re-set mapping after reset
         result = SearchService._apply_filter(mock_query, filter_in)
         mock_query.filter.assert_called()
 
-    def test_apply_sort(self):
+    def test_text_search_condition(self):
+        """Test multi-word searches use full-text matching only when enabled."""
+
+        def compile(condition):
+            return str(condition.compile(dialect=postgresql.dialect()))
+
+        # Multi-word search with full-text support
+        assert "plainto_tsquery" in compile(
+            SearchService._text_search_condition("login bug", full_text=True)
+        )
+
+        # Single words and partial input stay substring matches
+        assert "ILIKE" in compile(
+            SearchService._text_search_condition("log", full_text=True)
+        )
+        assert "ILIKE" in compile(
+            SearchService._text_search_condition("50% off", full_text=True)
+        )
+
+        # No full-text support
+        assert "ILIKE" in compile(
+            SearchService._text_search_condition("login bug", full_text=False)
+        )
+
+    def test_apply_sort(self, monkeypatch):
         """Test sort application."""
         mock_query = Mock()
         mock_field = Mock()
@@ -112,7 +137,7 @@ class TestSearchService:
         mock_field.asc.return_value = Mock()
 
         # Test descending sort
-        SearchService.FIELD_MAPPING = {"created_at": mock_field}
+        monkeypatch.setattr(SearchService, "FIELD_MAPPING", {"created_at": mock_field})
         result = SearchService._apply_sort(mock_query, "created_at", "desc")
         mock_field.desc.assert_called_once()
         mock_query.order_by.assert_called_once()
@@ -163,50 +188,83 @@ class TestSearchService:
         assert len(tasks) == 1
         mock_query.filter.assert_called()
 
-    @patch("app.services.search_service.Session")
-    def test_search_in_project(self, mock_session):
-        """Test searching tasks within a project."""
-        mock_db = Mock(spec=Session)
+    def test_search_by_category_matches_any(self, test_db: Session, test_user: User):
+        """Test tasks in any of the given categories are returned once."""
+        work = Category(id="cat1", name="Work", user_id=test_user.id)
+        home = Category(id="cat2", name="Home", user_id=test_user.id)
+        test_db.add_all(
+            [
+                Task(
+                    id="task1",
+                    title="Task 1",
+                    user_id=test_user.id,
+                    categories=[work, home],
+                ),
+                Task(id="task2", title="Task 2", user_id=test_user.id),
+            ]
+        )
+        test_db.commit()
 
-        # Set up different query objects for different query calls
-        mock_project_query = Mock()
-        mock_task_query = Mock()
+        tasks = SearchService.search_by_category(
+            test_db, test_user.id, ["cat1", "cat2"]
+        )
+
+        assert [task.id for task in tasks] == ["task1"]
+
+    def test_search_by_tags_ignores_case(self, test_db: Session, test_user: User):
+        """Test tags stored with mixed case match lowercase searches."""
+        tag = Tag(id="tag1", name="Urgent", user_id=test_user.id)
+        task = Task(id="task1", title="Task 1", user_id=test_user.id, tags=[tag])
+        test_db.add(task)
+        test_db.commit()
 
-        # First query is for project
-        mock_project = Mock(spec=Project)
-        mock_project.has_permission.return_value = True
-        mock_project_query.filter.return_value = mock_project_query
-        mock_project_query.first.return_value = mock_project
+        tasks = SearchService.search_by_tags(test_db, test_user.id, ["URGENT"])
 
-        # Second query is for tasks
-        mock_task_query.filter.return_value = mock_task_query
-        mock_task_query.all.return_value = [Mock(spec=Task)]
+        assert [task.id for task in tasks] == ["task1"]
 
-        # Mock query calls to return different objects
-        mock_db.query.side_effect = [mock_project_query, mock_task_query]
+    def test_search_in_project(self, test_db: Session, test_user: User):
+        """Test searching tasks within a project."""
+        project = Project(id="proj1", name="Project", owner_id="owner1")
+        member = ProjectMember(
+            project_id="proj1", user_id=test_user.id, role=ProjectRole.VIEWER
+        )
+        tasks = [
+            Task(
+                id="task1",
+                title="Task 1",
+                user_id="owner1",
+                project_id="proj1",
+                status=TaskStatus.TODO,
+                priority=TaskPriority.HIGH,
+            ),
+            Task(
+                id="task2",
+                title="Task 2",
+                user_id="owner1",
+                project_id="proj1",
+                status=TaskStatus.DONE,
+                priority=TaskPriority.HIGH,
+            ),
+        ]
+        test_db.add_all([project, member, *tasks])
+        test_db.commit()
 
         # Execute search with filters
         filters = {"status": TaskStatus.TODO, "priority": TaskPriority.HIGH}
-        tasks = SearchService.search_in_project(mock_db, "user123", "proj1", filters)
+        tasks = SearchService.search_in_project(test_db, test_user.id, "proj1", filters)
 
         # Verify
-        assert len(tasks) == 1
-        mock_project.has_permission.assert_called_once()
+        assert [task.id for task in tasks] == ["task1"]
 
-    @patch("app.services.search_service.Session")
-    def test_search_in_project_no_permission(self, mock_session):
+    def test_search_in_project_no_permission(self, test_db: Session, test_user: User):
         """Test searching in project without permission."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-
-        # Mock project without permission
-        mock_project = Mock(spec=Project)
-        mock_project.has_permission.return_value = False
-        mock_query.filter.return_value.first.return_value = mock_project
+        project = Project(id="proj1", name="Project", owner_id="owner1")
+        task = Task(id="task1", title="Task 1", user_id="owner1", project_id="proj1")
+        test_db.add_all([project, task])
+        test_db.commit()
 
         # Execute search
-        tasks = SearchService.search_in_project(mock_db, "user123", "proj1")
+        tasks = SearchService.search_in_project(test_db, test_user.id, "proj1")
 
         # Verify empty result
         assert tasks == []
@@ -2,55 +2,65 @@
 Unit tests for enhanced task service functionality.
 """
 
+import uuid
 from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, Mock
 
 import pytest
+from sqlalchemy.orm import Session
 
-from app.db.models import Task, TaskPriority, TaskStatus
+from app.db.models import (Project, ProjectMember, ProjectRole, Task,
+                           TaskPriority, TaskShare, TaskStatus, User)
 from app.services.task_service import TaskService
 
 
+def make_task(user_id: str, **kwargs) -> Task:
+    """Build a task row for statistics tests"""
+    kwargs.setdefault("status", TaskStatus.TODO)
+    kwargs.setdefault("priority", TaskPriority.MEDIUM)
+    return Task(id=str(uuid.uuid4()), title="Task", user_id=user_id, **kwargs)
+
+
 @pytest.mark.unit
 class TestEnhancedTaskStatistics:
     """Test cases for enhanced task statistics"""
 
-    def test_get_task_statistics_with_priorities(self):
+    def test_get_task_statistics_with_priorities(
+        self, test_db: Session, test_user: User
+    ):
         """Test statistics include priority breakdown"""
-        mock_db = Mock()
-        user_id = "user123"
-
-        # Create mock tasks with different priorities
-        mock_tasks = [
-            Mock(
-                status=TaskStatus.TODO,
-                priority=TaskPriority.HIGH,
-                due_date=None,
-                completed_at=None,
-                estimated_hours=2.0,
-                actual_hours=0.0,
-            ),
-            Mock(
-                status=TaskStatus.IN_PROGRESS,
-                priority=TaskPriority.URGENT,
-                due_date=None,
-                completed_at=None,
-                estimated_hours=4.0,
-                actual_hours=1.5,
-            ),
-            Mock(
-                status=TaskStatus.DONE,
-                priority=TaskPriority.MEDIUM,
-                due_date=None,
-                completed_at=datetime.now(timezone.utc),
-                estimated_hours=3.0,
-                actual_hours=3.5,
-            ),
-        ]
-
-        mock_db.query.return_value.filter.return_value.all.return_value = mock_tasks
+        user_id = test_user.id
+
+        # Create tasks with different priorities
+        test_db.add_all(
+            [
+                make_task(
+                    user_id,
+                    status=TaskStatus.TODO,
+                    priority=TaskPriority.HIGH,
+                    estimated_hours=2.0,
+                    actual_hours=0.0,
+                ),
+                make_task(
+                    user_id,
+                    status=TaskStatus.IN_PROGRESS,
+                    priority=TaskPriority.URGENT,
+                    estimated_hours=4.0,
+                    actual_hours=1.5,
+                ),
+                make_task(
+                    user_id,
+                    status=TaskStatus.DONE,
+                    priority=TaskPriority.MEDIUM,
+                    completed_at=datetime.now(timezone.utc),
+                    estimated_hours=3.0,
+                    actual_hours=3.5,
+                ),
+            ]
+        )
+        test_db.commit()
 
-        stats = TaskService.get_task_statistics(mock_db, user_id)
+        stats = TaskService.get_task_statistics(test_db, user_id)
 
         assert stats["total"] == 3
         assert stats["by_priority"][TaskPriority.HIGH] == 1
@@ -59,73 +69,64 @@ class TestEnhancedTaskStatistics:
         assert stats["by_priority"][TaskPriority.LOW] == 0
         assert stats["total_estimated_hours"] == 9.0
         assert stats["total_actual_hours"] == 5.0
+        assert stats["completed_this_week"] == 1
 
-    def test_get_task_statistics_overdue(self):
+    def test_get_task_statistics_overdue(self, test_db: Session, test_user: User):
         """Test statistics correctly identify overdue tasks"""
-        mock_db = Mock()
-        user_id = "user123"
+        user_id = test_user.id
 
         yesterday = datetime.now(timezone.utc) - timedelta(days=1)
         tomorrow = datetime.now(timezone.utc) + timedelta(days=1)
 
-        mock_tasks = [
-            Mock(
-                status=TaskStatus.TODO,
-                priority=TaskPriority.MEDIUM,
-                due_date=yesterday,  # Overdue
-                completed_at=None,
-                estimated_hours=None,
-                actual_hours=0.0,
-            ),
-            Mock(
-                status=TaskStatus.TODO,
-                priority=TaskPriority.HIGH,
-                due_date=tomorrow,  # Not overdue
-                completed_at=None,
-                estimated_hours=None,
-                actual_hours=0.0,
-            ),
-            Mock(
-                status=TaskStatus.DONE,
-                priority=TaskPriority.HIGH,
-                due_date=yesterday,  # Past due but completed
-                completed_at=datetime.now(timezone.utc),
-                estimated_hours=None,
-                actual_hours=2.0,
-            ),
-        ]
-
-        mock_db.query.return_value.filter.return_value.all.return_value = mock_tasks
+        test_db.add_all(
+            [
+                # Overdue
+                make_task(user_id, status=TaskStatus.TODO, due_date=yesterday),
+                # Not overdue
+                make_task(user_id, status=TaskStatus.TODO, due_date=tomorrow),
+                # Past due but completed
+                make_task(
+                    user_id,
+                    status=TaskStatus.DONE,
+                    due_date=yesterday,
+                    completed_at=datetime.now(timezone.utc),
+                ),
+            ]
+        )
+        test_db.commit()
 
-        stats = TaskService.get_task_statistics(mock_db, user_id)
+        stats = TaskService.get_task_statistics(test_db, user_id)
 
         assert stats["overdue"] == 1  # Only the TODO task is overdue
 
-    def test_get_task_statistics_due_today(self):
+    def test_get_task_statistics_due_today(self, test_db: Session, test_user: User):
         """Test statistics for tasks due today"""
-        mock_db = Mock()
-        user_id = "user123"
+        user_id = test_user.id
 
         today = datetime.now(timezone.utc).replace(
             hour=12, minute=0, second=0, microsecond=0
         )
 
-        mock_tasks = [
-            Mock(
-                status=TaskStatus.TODO,
-                priority=TaskPriority.HIGH,
-                due_date=today,
-                completed_at=None,
-                estimated_hours=None,
-                actual_hours=0.0,
-            )
-        ]
+        test_db.add(make_task(user_id, status=TaskStatus.TODO, due_date=today))
+        test_db.commit()
 
-        mock_db.query.return_value.filter.return_value.all.return_value = mock_tasks
-
-        stats = TaskService.get_task_statistics(mock_db, user_id)
+        stats = TaskService.get_task_statistics(test_db, user_id)
 
         assert stats["due_today"] == 1
+        assert stats["overdue"] == 0
+        assert stats["due_this_week"] == 0
+
+    def test_get_task_statistics_ignores_other_users(
+        self, test_db: Session, test_user: User
+    ):
+        """Test statistics only count the requesting user's tasks"""
+        test_db.add(make_task(test_user.id))
+        test_db.add(make_task(str(uuid.uuid4())))
+        test_db.commit()
+
+        stats = TaskService.get_task_statistics(test_db, test_user.id)
+
+        assert stats["total"] == 1
 
 
 @pytest.mark.unit
@@ -169,73 +170,129 @@ class TestTaskFiltering:
 class TestTaskPositioning:
     """Test cases for task positioning"""
 
-    def test_update_task_positions_success(self):
+    def test_update_task_positions_success(self, test_db: Session, test_user: User):
         """Test successful task position update"""
-        mock_db = Mock()
-        user_id = "user123"
-        task_id = "task456"
-        new_position = 2
-
-        # Create mock tasks
-        mock_tasks = [
-            Mock(id="task1", position=0),
-            Mock(id="task456", position=1),  # Task to move
-            Mock(id="task3", position=2),
-            Mock(id="task4", position=3),
+        user_id = test_user.id
+        tasks = [make_task(user_id, position=i) for i in range(4)]
+        test_db.add_all(tasks)
+        test_db.commit()
+        task_ids = [task.id for task in tasks]
+
+        # Move the second task down to position 2
+        result = TaskService.update_task_positions(test_db, user_id, task_ids[1], 2)
+
+        assert result is True
+        ordered = [
+            task_id
+            for (task_id,) in test_db.query(Task.id)
+            .filter(Task.user_id == user_id)
+            .order_by(Task.position)
         ]
+        assert ordered == [task_ids[0], task_ids[2], task_ids[1], task_ids[3]]
 
-        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = (
-            mock_tasks
-        )
+    def test_update_task_positions_task_not_found(
+        self, test_db: Session, test_user: User
+    ):
+        """Test position update when task doesn't exist"""
+        test_db.add(make_task(test_user.id, position=0))
+        test_db.commit()
 
         result = TaskService.update_task_positions(
-            mock_db, user_id, task_id, new_position
+            test_db, test_user.id, "nonexistent", 1
         )
 
-        assert result is True
-        mock_db.commit.assert_called_once()
+        assert result is False
 
-        # Verify positions were updated
-        assert mock_tasks[0].position == 0  # task1 stays at 0
-        assert mock_tasks[1].position == 1  # task3 moves to 1
-        assert mock_tasks[2].position == 2  # task456 at new position
-        assert mock_tasks[3].position == 3  # task4 stays at 3
+    def test_update_task_positions_other_users_task(
+        self, test_db: Session, test_user: User
+    ):
+        """Test a user cannot reorder someone else's task"""
+        task = make_task(str(uuid.uuid4()), position=0)
+        test_db.add(task)
+        test_db.commit()
 
-    def test_update_task_positions_task_not_found(self):
-        """Test position update when task doesn't exist"""
-        mock_db = Mock()
-        user_id = "user123"
-        task_id = "nonexistent"
-        new_position = 1
+        result = TaskService.update_task_positions(test_db, test_user.id, task.id, 1)
 
-        mock_tasks = [Mock(id="task1", position=0), Mock(id="task2", position=1)]
+        assert result is False
 
-        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = (
-            mock_tasks
-        )
+    def test_update_task_positions_edge_cases(self, test_db: Session, test_user: User):
+        """Test position update edge cases"""
+        user_id = test_user.id
+        tasks = [make_task(user_id, position=i) for i in range(3)]
+        test_db.add_all(tasks)
+        test_db.commit()
+        task_ids = [task.id for task in tasks]
 
-        result = TaskService.update_task_positions(
-            mock_db, user_id, task_id, new_position
+        # Test moving to position 0
+        result = TaskService.update_task_positions(test_db, user_id, task_ids[2], 0)
+        assert result is True
+
+        positions = dict(
+            test_db.query(Task.id, Task.position).filter(Task.user_id == user_id)
         )
+        assert positions == {task_ids[2]: 0, task_ids[0]: 1, task_ids[1]: 2}
 
-        assert result is False
-        mock_db.commit.assert_not_called()
 
-    def test_update_task_positions_edge_cases(self):
-        """Test position update edge cases"""
-        mock_db = Mock()
-        user_id = "user123"
+@pytest.mark.unit
+class TestTaskAccess:
+    """Test cases for task access checks"""
+
+    def test_get_task_by_id_access(self, test_db: Session, test_user: User):
+        """Test owners, share recipients and project members can load a task"""
+        owner_id = str(uuid.uuid4())
+        project = Project(id=str(uuid.uuid4()), name="Project", owner_id=owner_id)
+        owned = make_task(test_user.id)
+        shared = make_task(owner_id)
+        in_project = make_task(owner_id, project_id=project.id)
+        private = make_task(owner_id)
+        test_db.add_all([project, owned, shared, in_project, private])
+        test_db.add(
+            TaskShare(
+                task_id=shared.id, shared_by_id=owner_id, shared_with_id=test_user.id
+            )
+        )
+        test_db.add(
+            ProjectMember(
+                project_id=project.id, user_id=test_user.id, role=ProjectRole.VIEWER
+            )
+        )
+        test_db.commit()
 
-        # Test moving to position 0
-        mock_tasks = [
-            Mock(id="task1", position=0),
-            Mock(id="task2", position=1),
-            Mock(id="task3", position=2),
-        ]
+        for task in (owned, shared, in_project):
+            assert (
+                TaskService.get_task_by_id(test_db, task.id, test_user.id) is not None
+            )
+        assert TaskService.get_task_by_id(test_db, private.id, test_user.id) is None
+        assert TaskService.get_task_by_id(test_db, "missing", test_user.id) is None
+
+    def test_get_task_by_id_required_role(self, test_db: Session, test_user: User):
+        """Test project viewers can read a task but not pass a member check"""
+        owner_id = str(uuid.uuid4())
+        project = Project(id=str(uuid.uuid4()), name="Project", owner_id=owner_id)
+        task = make_task(owner_id, project_id=project.id)
+        member = ProjectMember(
+            project_id=project.id, user_id=test_user.id, role=ProjectRole.VIEWER
+        )
+        test_db.add_all([project, task, member])
+        test_db.commit()
 
-        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = (
-            mock_tasks.copy()
+        assert TaskService.get_task_by_id(test_db, task.id, test_user.id) is not None
+        assert (
+            TaskService.get_task_by_id(
+                test_db, task.id, test_user.id, required_role=ProjectRole.MEMBER
+            )
+            is None
+        )
+        assert (
+            TaskService.add_time_to_task(test_db, task.id, test_user.id, 1.0) is None
         )
 
-        result = TaskService.update_task_positions(mock_db, user_id, "task3", 0)
-        assert result is True
+        member.role = ProjectRole.MEMBER
+        test_db.commit()
+
+        assert (
+            TaskService.get_task_by_id(
+                test_db, task.id, test_user.id, required_role=ProjectRole.MEMBER
+            )
+            is not None
+        )
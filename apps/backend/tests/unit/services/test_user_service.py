@@ -3,7 +3,7 @@ Unit tests for UserService.
 """
 
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
@@ -143,8 +143,8 @@ class TestUserService:
     def test_get_recent_users_default_days(self, mock_datetime):
         """Test getting recent users with default 7 days."""
         # Mock current time
-        current_time = datetime(2024, 1, 15, 12, 0, 0)
-        mock_datetime.utcnow.return_value = current_time
+        current_time = datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+        mock_datetime.now.return_value = current_time
 
         # Create test users
         recent_users = UserFactory.create_batch(3)
@@ -163,7 +163,7 @@ class TestUserService:
 
         # Assertions
         assert len(result) == 3
-        mock_datetime.utcnow.assert_called_once()
+        mock_datetime.now.assert_called_once_with(timezone.utc)
         # Verify the cutoff date calculation
         expected_cutoff = current_time - timedelta(days=7)
         mock_filter.all.assert_called_once()
@@ -172,8 +172,8 @@ class TestUserService:
     def test_get_recent_users_custom_days(self, mock_datetime):
         """Test getting recent users with custom days."""
         # Mock current time
-        current_time = datetime(2024, 1, 15, 12, 0, 0)
-        mock_datetime.utcnow.return_value = current_time
+        current_time = datetime(2024, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+        mock_datetime.now.return_value = current_time
 
         # Create test users
         recent_users = UserFactory.create_batch(5)
@@ -192,4 +192,4 @@ class TestUserService:
 
         # Assertions
         assert len(result) == 5
-        mock_datetime.utcnow.assert_called_once()
+        mock_datetime.now.assert_called_once_with(timezone.utc)
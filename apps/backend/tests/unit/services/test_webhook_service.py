@@ -0,0 +1,434 @@
+"""
+Unit tests for WebhookService
+"""
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import httpx
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.models import (Project, User, WebhookDelivery,
+                           WebhookDeliveryStatus, WebhookSubscription)
+from app.services.webhook_service import WebhookEvent, WebhookService
+
+
+def make_subscription(
+    db: Session, user: User, events: list, **kwargs
+) -> WebhookSubscription:
+    """Store a subscription for the given user"""
+    subscription = WebhookSubscription(
+        user_id=user.id,
+        name="Hook",
+        url="https://example.com/hook",
+        events=events,
+        **kwargs,
+    )
+    db.add(subscription)
+    db.commit()
+    return subscription
+
+
+@pytest.mark.unit
+class TestCreateSubscription:
+    """Test subscription creation"""
+
+    def test_project_subscription_requires_access(
+        self, test_db: Session, test_user: User
+    ):
+        """Test project subscriptions are limited to projects the user can access"""
+        # Arrange
+        test_db.add(Project(id="p1", name="Project 1", owner_id=test_user.id))
+        test_db.commit()
+
+        # Act
+        subscription = WebhookService.create_subscription(
+            test_db,
+            test_user.id,
+            "Hook",
+            "https://example.com/hook",
+            ["task.created"],
+            project_id="p1",
+        )
+
+        # Assert
+        assert subscription.project_id == "p1"
+        with pytest.raises(ValueError, match="Invalid project or no access"):
+            WebhookService.create_subscription(
+                test_db,
+                test_user.id,
+                "Hook",
+                "https://example.com/hook",
+                ["task.created"],
+                project_id="missing",
+            )
+
+
+@pytest.mark.unit
+class TestTriggerWebhook:
+    """Test publishing events for the webhooks worker"""
+
+    def test_trigger_publishes_one_message(self, test_db: Session, test_user: User):
+        """Test an event is published without touching the deliveries table"""
+        # Arrange
+        make_subscription(test_db, test_user, ["task.created"])
+
+        # Act
+        with patch("app.tasks.webhooks.broadcast_webhook_event.delay") as mock_delay:
+            WebhookService.trigger_webhook(
+                test_db, WebhookEvent.TASK_CREATED, {"id": "t1"}, user_id=test_user.id
+            )
+
+        # Assert
+        assert test_db.query(WebhookDelivery).count() == 0
+        mock_delay.assert_called_once()
+        assert mock_delay.call_args.args == ("task.created", {"id": "t1"})
+        assert mock_delay.call_args.kwargs["user_id"] == test_user.id
+
+    def test_trigger_many_publishes_one_message(self, test_db: Session):
+        """Test a batch of events is published as a single message"""
+        # Act
+        with patch("app.tasks.webhooks.broadcast_webhook_events.delay") as mock_delay:
+            WebhookService.trigger_many(
+                test_db,
+                [
+                    {"event_type": event_type, "payload": {"id": "t1"}}
+                    for event_type in (
+                        WebhookEvent.TASK_UPDATED,
+                        WebhookEvent.TASK_COMPLETED,
+                    )
+                ],
+            )
+
+        # Assert
+        mock_delay.assert_called_once()
+        (events,) = mock_delay.call_args.args
+        assert [event["event_type"] for event in events] == [
+            "task.updated",
+            "task.completed",
+        ]
+
+
+@pytest.mark.unit
+class TestRecordEventDeliveries:
+    """Test event fan-out to subscriptions"""
+
+    def test_records_pending_deliveries(self, test_db: Session, test_user: User):
+        """Test one pending delivery is stored per matching subscription"""
+        # Arrange
+        created = make_subscription(test_db, test_user, ["task.created"])
+        wildcard = make_subscription(test_db, test_user, ["*"])
+        make_subscription(test_db, test_user, ["task.deleted"])
+        make_subscription(test_db, test_user, ["task.created"], is_active=False)
+
+        # Act
+        with patch("app.tasks.webhooks.deliver_webhook_event.delay") as mock_delay:
+            queued = WebhookService.record_event_deliveries(
+                test_db,
+                [
+                    {
+                        "event_type": "task.created",
+                        "payload": {"id": "t1"},
+                        "user_id": test_user.id,
+                    }
+                ],
+            )
+
+        # Assert
+        deliveries = test_db.query(WebhookDelivery).all()
+        assert queued == 2
+        assert sorted(d.subscription_id for d in deliveries) == sorted(
+            [created.id, wildcard.id]
+        )
+        assert all(d.status == WebhookDeliveryStatus.PENDING for d in deliveries)
+        assert json.loads(deliveries[0].payload)["data"] == {"id": "t1"}
+
+        mock_delay.assert_called_once()
+        delivery_ids, event_type, _ = mock_delay.call_args.args
+        assert sorted(delivery_ids) == sorted(d.id for d in deliveries)
+        assert event_type == "task.created"
+
+    def test_without_subscribers_queues_nothing(
+        self, test_db: Session, test_user: User
+    ):
+        """Test no task is queued when nobody subscribed to the event"""
+        # Arrange
+        make_subscription(test_db, test_user, ["task.deleted"])
+
+        # Act
+        with patch("app.tasks.webhooks.deliver_webhook_event.delay") as mock_delay:
+            queued = WebhookService.record_event_deliveries(
+                test_db,
+                [
+                    {
+                        "event_type": "task.created",
+                        "payload": {"id": "t1"},
+                        "user_id": test_user.id,
+                    }
+                ],
+            )
+
+        # Assert
+        assert queued == 0
+        assert test_db.query(WebhookDelivery).count() == 0
+        mock_delay.assert_not_called()
+
+    def test_batch_matches_each_event(self, test_db: Session, test_user: User):
+        """Test a batch of events reaches the subscriptions of each event"""
+        # Arrange
+        created = make_subscription(test_db, test_user, ["task.created"])
+        wildcard = make_subscription(test_db, test_user, ["*"])
+        deleted = make_subscription(test_db, test_user, ["task.deleted"])
+
+        # Act
+        with patch("app.tasks.webhooks.deliver_webhook_event.delay") as mock_delay:
+            WebhookService.record_event_deliveries(
+                test_db,
+                [
+                    {
+                        "event_type": "task.created",
+                        "payload": {"id": "t1"},
+                        "user_id": test_user.id,
+                    },
+                    {
+                        "event_type": "task.completed",
+                        "payload": {"id": "t1"},
+                        "user_id": test_user.id,
+                    },
+                ],
+            )
+
+        # Assert
+        deliveries = test_db.query(WebhookDelivery).all()
+        assert sorted((d.event_type, d.subscription_id) for d in deliveries) == sorted(
+            [
+                ("task.created", created.id),
+                ("task.created", wildcard.id),
+                ("task.completed", wildcard.id),
+            ]
+        )
+        assert deleted.id not in {d.subscription_id for d in deliveries}
+        assert [call.args[1] for call in mock_delay.call_args_list] == [
+            "task.created",
+            "task.completed",
+        ]
+
+    def test_redelivered_event_is_recorded_once(
+        self, test_db: Session, test_user: User
+    ):
+        """Test the same event id never creates a second delivery"""
+        # Arrange
+        make_subscription(test_db, test_user, ["task.created"])
+        event = {
+            "event_type": "task.created",
+            "payload": {"id": "t1"},
+            "user_id": test_user.id,
+            "event_id": "e1",
+        }
+
+        # Act
+        with patch("app.tasks.webhooks.deliver_webhook_event.delay") as mock_delay:
+            first = WebhookService.record_event_deliveries(test_db, [event])
+            second = WebhookService.record_event_deliveries(test_db, [event])
+
+        # Assert
+        assert (first, second) == (1, 0)
+        assert test_db.query(WebhookDelivery).count() == 1
+        mock_delay.assert_called_once()
+
+    def test_skips_events_published_before_activation(
+        self, test_db: Session, test_user: User
+    ):
+        """Test a subscription does not receive events older than its activation"""
+        # Arrange
+        make_subscription(
+            test_db,
+            test_user,
+            ["task.created"],
+            activated_at=datetime(2026, 1, 2, tzinfo=timezone.utc),
+        )
+        events = [
+            {
+                "event_type": "task.created",
+                "payload": {"id": "t1"},
+                "user_id": test_user.id,
+                "timestamp": datetime(2026, 1, day, tzinfo=timezone.utc).isoformat(),
+            }
+            for day in (1, 3)
+        ]
+
+        # Act
+        with patch("app.tasks.webhooks.deliver_webhook_event.delay"):
+            queued = WebhookService.record_event_deliveries(test_db, events)
+
+        # Assert
+        assert queued == 1
+        delivery = test_db.query(WebhookDelivery).one()
+        assert json.loads(delivery.payload)["timestamp"] == events[1]["timestamp"]
+
+
+@pytest.mark.unit
+class TestEventDelivery:
+    """Test an event end to end through the webhook worker tasks"""
+
+    def test_trigger_sends_event_to_subscribers(
+        self, test_db: Session, test_user: User, eager_celery
+    ):
+        """Test a triggered event is broadcast, recorded and delivered"""
+        # Arrange
+        subscription = make_subscription(test_db, test_user, ["task.created"])
+        sent = []
+
+        async def post_many(requests):
+            sent.extend(requests)
+            return [httpx.Response(200, text="ok") for _ in requests]
+
+        # Act
+        with patch("app.tasks.webhooks._post_many", post_many):
+            WebhookService.trigger_webhook(
+                test_db, WebhookEvent.TASK_CREATED, {"id": "t1"}, user_id=test_user.id
+            )
+
+        # Assert
+        delivery = test_db.query(WebhookDelivery).one()
+        assert delivery.subscription_id == subscription.id
+        assert delivery.status == WebhookDeliveryStatus.DELIVERED
+        assert delivery.response_status_code == 200
+        [(url, body, headers)] = sent
+        assert url == subscription.url
+        assert headers["X-Webhook-Delivery"] == delivery.id
+        assert json.loads(body) == {
+            **json.loads(delivery.payload),
+            "delivery_id": delivery.id,
+        }
+        assert json.loads(body)["data"] == {"id": "t1"}
+
+
+@pytest.mark.unit
+class TestEventSubscriptionIds:
+    """Test resolving the subscriptions that receive an event"""
+
+    def test_project_filter_keeps_user_wide_subscriptions(
+        self, test_db: Session, test_user: User
+    ):
+        """Test project events reach project and user-wide subscriptions only"""
+        # Arrange
+        test_db.add_all(
+            [
+                Project(id="p1", name="Project 1", owner_id=test_user.id),
+                Project(id="p2", name="Project 2", owner_id=test_user.id),
+            ]
+        )
+        test_db.commit()
+        user_wide = make_subscription(test_db, test_user, ["task.created"])
+        in_project = make_subscription(
+            test_db, test_user, ["task.created"], project_id="p1"
+        )
+        make_subscription(test_db, test_user, ["task.created"], project_id="p2")
+
+        # Act
+        subscriptions = WebhookService.get_event_subscriptions(
+            test_db, "task.created", test_user.id, "p1"
+        )
+
+        # Assert
+        assert sorted(subscription_id for subscription_id, _ in subscriptions) == (
+            sorted([user_wide.id, in_project.id])
+        )
+
+
+@pytest.mark.unit
+class TestDeliveryLookup:
+    """Test reading stored deliveries"""
+
+    def test_history_is_limited_to_the_owner(self, test_db: Session, test_user: User):
+        """Test history is returned newest first and only to the owner"""
+        # Arrange
+        subscription = make_subscription(test_db, test_user, ["task.created"])
+        older = WebhookDelivery(
+            subscription_id=subscription.id,
+            event_type="task.created",
+            payload="{}",
+            delivered_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        )
+        newer = WebhookDelivery(
+            subscription_id=subscription.id,
+            event_type="task.created",
+            payload="{}",
+            delivered_at=datetime(2026, 1, 2, tzinfo=timezone.utc),
+        )
+        test_db.add_all([older, newer])
+        test_db.commit()
+
+        # Act
+        history = WebhookService.get_delivery_history(
+            test_db, subscription.id, test_user.id
+        )
+        foreign = WebhookService.get_delivery_history(
+            test_db, subscription.id, "someone-else"
+        )
+
+        # Assert
+        assert [d.id for d in history] == [newer.id, older.id]
+        assert foreign == []
+
+    def test_get_delivery_by_id(self, test_db: Session, test_user: User):
+        """Test a single delivery is only visible to the subscription owner"""
+        # Arrange
+        subscription = make_subscription(test_db, test_user, ["task.created"])
+        delivery = WebhookDelivery(
+            subscription_id=subscription.id, event_type="task.created", payload="{}"
+        )
+        test_db.add(delivery)
+        test_db.commit()
+
+        # Act / Assert
+        found = WebhookService.get_delivery_by_id(test_db, delivery.id, test_user.id)
+        assert found.id == delivery.id
+        assert (
+            WebhookService.get_delivery_by_id(test_db, delivery.id, "someone-else")
+            is None
+        )
+
+
+@pytest.mark.unit
+class TestCleanupOldDeliveries:
+    """Test retention cleanup of deliveries"""
+
+    def test_deletes_old_deliveries_in_batches(
+        self, test_db: Session, test_user: User
+    ):
+        """Test every old delivery is removed across batches, others are kept"""
+        # Arrange
+        subscription = make_subscription(test_db, test_user, ["task.created"])
+        old = [
+            WebhookDelivery(
+                subscription_id=subscription.id,
+                event_type="task.created",
+                payload="{}",
+                delivered_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+            )
+            for _ in range(3)
+        ]
+        recent = WebhookDelivery(
+            subscription_id=subscription.id,
+            event_type="task.created",
+            payload="{}",
+            delivered_at=datetime.now(timezone.utc),
+        )
+        pending = WebhookDelivery(
+            subscription_id=subscription.id, event_type="task.created", payload="{}"
+        )
+        test_db.add_all([*old, recent, pending])
+        test_db.commit()
+
+        # Act
+        deleted = WebhookService.cleanup_old_deliveries(test_db, batch_size=2)
+
+        # Assert
+        assert deleted == 3
+        assert sorted(d.id for d in test_db.query(WebhookDelivery).all()) == sorted(
+            [recent.id, pending.id]
+        )
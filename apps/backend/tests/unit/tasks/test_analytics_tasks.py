@@ -0,0 +1,173 @@
+"""
+Unit tests for the analytics background tasks
+"""
+
+import os
+import time
+import uuid
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import Task, User
+from app.tasks.analytics import (USER_METRICS, _remove_expired_exports,
+                                 export_tasks_async,
+                                 generate_time_tracking_report,
+                                 precompute_analytics)
+
+
+def make_user(db: Session) -> User:
+    """Store a user with a task created now, so it counts as active"""
+    user = User(
+        id=str(uuid.uuid4()),
+        username=f"user-{uuid.uuid4().hex[:8]}",
+        email=f"{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password="hashed",
+        is_active=True,
+    )
+    db.add(user)
+    db.add(Task(id=str(uuid.uuid4()), title="Task", user_id=user.id))
+    db.commit()
+    return user
+
+
+def metric_key(name: str, user_id: str) -> str:
+    """Cache key precompute_analytics writes a user's metric under"""
+    return f"{settings.CACHE_PREFIX_ANALYTICS}{name}:{user_id}"
+
+
+@pytest.fixture
+def mock_cache():
+    """Replace the cache used by the analytics tasks"""
+    with patch("app.tasks.analytics.cache_service") as cache:
+        cache.exists_multi.return_value = {}
+        cache.acquire_lock.return_value = "token"
+        yield cache
+
+
+@pytest.mark.unit
+class TestPrecomputeAnalytics:
+    """Test precomputing analytics through the batch task group"""
+
+    def test_group_fills_missing_entries(
+        self, test_db: Session, eager_celery, mock_cache
+    ):
+        """Test each batch probes once, computes misses and writes with jitter"""
+        # Arrange
+        cold = make_user(test_db)
+        warm = make_user(test_db)
+        mock_cache.exists_multi.side_effect = lambda keys: {
+            key: key.endswith(warm.id) for key in keys
+        }
+
+        # Act
+        with patch("app.tasks.analytics.PRECOMPUTE_BATCH_SIZE", 1):
+            result = precompute_analytics.delay().result
+
+        # Assert
+        assert (result["users_scheduled"], result["batches"]) == (2, 2)
+        assert mock_cache.exists_multi.call_count == 2
+        mock_cache.acquire_lock.assert_called_once_with(
+            f"{settings.CACHE_PREFIX_ANALYTICS}user:{cold.id}"
+        )
+        mock_cache.release_lock.assert_called_once_with(
+            f"{settings.CACHE_PREFIX_ANALYTICS}user:{cold.id}", "token"
+        )
+        written = {}
+        for call in mock_cache.set_multi.call_args_list:
+            assert call.kwargs["jitter"] is True
+            written.update(call.args[0])
+        assert sorted(written) == sorted(
+            metric_key(name, cold.id) for name, _, _ in USER_METRICS
+        )
+
+    def test_locked_user_is_skipped(self, test_db: Session, eager_celery, mock_cache):
+        """Test a user another worker is computing is left to that worker"""
+        # Arrange
+        make_user(test_db)
+        mock_cache.acquire_lock.return_value = None
+
+        # Act
+        precompute_analytics.delay()
+
+        # Assert
+        mock_cache.set_multi.assert_not_called()
+        mock_cache.release_lock.assert_not_called()
+
+
+@pytest.mark.unit
+class TestTimeTrackingReport:
+    """Test caching time tracking reports"""
+
+    def test_equivalent_dates_share_a_key(
+        self, test_db: Session, test_user: User, eager_celery, mock_cache
+    ):
+        """Test "Z" and "+00:00" requests use one fixed-size key"""
+        # Act
+        first = generate_time_tracking_report.delay(
+            test_user.id, "2026-01-01T00:00:00Z", "2026-01-31T00:00:00Z"
+        ).result
+        second = generate_time_tracking_report.delay(
+            test_user.id, "2026-01-01T01:00:00+01:00", "2026-01-31T00:00:00+00:00"
+        ).result
+
+        # Assert
+        assert first["report_cache_key"] == second["report_cache_key"]
+        prefix = f"{settings.CACHE_PREFIX_ANALYTICS}time_report:{test_user.id}:"
+        assert first["report_cache_key"].startswith(prefix)
+        assert len(first["report_cache_key"]) == len(prefix) + 32
+        cached = mock_cache.set.call_args.args[1]
+        assert cached["params"]["start_date"] == "2026-01-01T00:00:00+00:00"
+
+
+@pytest.mark.unit
+class TestExportTasks:
+    """Test writing exports to files"""
+
+    def test_export_is_written_to_a_file(
+        self,
+        test_db: Session,
+        test_user: User,
+        test_task: Task,
+        eager_celery,
+        mock_cache,
+        tmp_path,
+    ):
+        """Test the rows go to a file and only its metadata is cached"""
+        # Act
+        with patch("app.tasks.analytics.EXPORT_DIR", str(tmp_path)):
+            first = export_tasks_async.delay(
+                test_user.id, [test_task.id, "other"], "csv"
+            ).result
+            second = export_tasks_async.delay(
+                test_user.id, ["other", test_task.id], "CSV"
+            ).result
+
+        # Assert
+        assert first["export_cache_key"] == second["export_cache_key"]
+        metadata = mock_cache.set.call_args.args[1]
+        assert "data" not in metadata
+        assert os.path.dirname(metadata["file_path"]) == str(tmp_path)
+        with open(metadata["file_path"], encoding="utf-8") as export:
+            assert test_task.id in export.read()
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".part")]
+
+    def test_expired_exports_are_removed(self, tmp_path):
+        """Test only export files older than the cache entry are removed"""
+        # Arrange
+        expired = tmp_path / "expired.csv"
+        recent = tmp_path / "recent.csv"
+        expired.write_text("old")
+        recent.write_text("new")
+        long_ago = time.time() - 2 * 3600
+        os.utime(expired, (long_ago, long_ago))
+
+        # Act
+        with patch("app.tasks.analytics.EXPORT_DIR", str(tmp_path)):
+            removed = _remove_expired_exports()
+
+        # Assert
+        assert removed == 1
+        assert os.listdir(tmp_path) == ["recent.csv"]